@@ -11,5 +11,6 @@ class Settings:
     Hf_Token: str = os.getenv("HF_TOKEN")
     QDRANT_API_KEY: str = os.getenv("QDRANT_API_KEY")
     QDRANT_URL: str = os.getenv("QDRANT_URL")
+    LLM_MODEL: str = os.getenv("LLM_MODEL", "gemini-2.5-flash-lite")
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""Background job subsystem for long-running pipelines."""
+
+from app.jobs.broker import (
+    Job,
+    JobBroker,
+    SQLiteJobBroker,
+    RedisJobBroker,
+    get_broker,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    FAILED,
+    TERMINAL_STATUSES,
+)
+
+__all__ = [
+    "Job",
+    "JobBroker",
+    "SQLiteJobBroker",
+    "RedisJobBroker",
+    "get_broker",
+    "QUEUED",
+    "RUNNING",
+    "SUCCEEDED",
+    "FAILED",
+    "TERMINAL_STATUSES",
+]
@@ -0,0 +1,416 @@
+"""Job brokers: durable storage + queue for background pipeline runs.
+
+Two interchangeable backends implement the same `JobBroker` interface:
+
+- `SQLiteJobBroker` (default, local): one SQLite file in WAL mode, safe to
+  share between the API process and separate worker processes on one host.
+- `RedisJobBroker` (production): any Redis-compatible server; requires the
+  optional `redis` package.
+
+Select with `JOB_BROKER_URL`, e.g. `sqlite:///./jobs.db` or
+`redis://localhost:6379/0`. Broker methods are blocking; async callers run
+them through `app.utils.workers.run_in_worker`.
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+JOB_BROKER_URL = os.getenv("JOB_BROKER_URL", "sqlite:///./jobs.db")
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TERMINAL_STATUSES = (SUCCEEDED, FAILED)
+
+
+class Job(BaseModel):
+    """A submitted pipeline run."""
+    id: str
+    kind: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    status: str = QUEUED
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    worker_id: Optional[str] = None
+    # Document uploaded for the job; set by the server only, deleted when it finishes
+    upload_path: Optional[str] = None
+    attempts: int = 0
+    event_count: int = 0
+    created_at: float
+    updated_at: float
+    heartbeat_at: Optional[float] = None
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
+
+
+class JobBroker(ABC):
+    """Interface shared by all broker backends."""
+
+    @abstractmethod
+    def submit(self, kind: str, params: Dict[str, Any], upload_path: Optional[str] = None) -> Job:
+        ...
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        ...
+
+    @abstractmethod
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """Atomically take the oldest queued job and mark it running."""
+
+    @abstractmethod
+    def heartbeat(self, job_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def append_event(self, job_id: str, event: str, data: Any) -> int:
+        """Store a progress event; returns its sequence number (0-based)."""
+
+    @abstractmethod
+    def events(self, job_id: str, after: int = -1) -> List[Tuple[int, str, Any]]:
+        """Return (seq, event, data) for events with seq > `after`."""
+
+    @abstractmethod
+    def finish(self, job_id: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        ...
+
+    @abstractmethod
+    def requeue_stale(self, stale_after: float) -> List[str]:
+        """Put running jobs whose worker stopped heart-beating back in the queue."""
+
+
+class SQLiteJobBroker(JobBroker):
+    """SQLite-backed broker; survives restarts and works across local processes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    worker_id TEXT,
+                    upload_path TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    heartbeat_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+                CREATE TABLE IF NOT EXISTS job_events (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    event TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (job_id, seq)
+                );
+                """
+            )
+            # Databases created before upload_path existed
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "upload_path" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN upload_path TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _row_to_job(self, row: sqlite3.Row, event_count: int = 0) -> Job:
+        return Job(
+            id=row["id"],
+            kind=row["kind"],
+            params=json.loads(row["params"]),
+            status=row["status"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            worker_id=row["worker_id"],
+            upload_path=row["upload_path"],
+            attempts=row["attempts"],
+            event_count=event_count,
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            heartbeat_at=row["heartbeat_at"],
+        )
+
+    def submit(self, kind: str, params: Dict[str, Any], upload_path: Optional[str] = None) -> Job:
+        now = time.time()
+        job_id = new_job_id()
+        self._connect().execute(
+            "INSERT INTO jobs (id, kind, params, status, upload_path, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(params), QUEUED, upload_path, now, now),
+        )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        count = conn.execute("SELECT COUNT(*) FROM job_events WHERE job_id = ?", (job_id,)).fetchone()[0]
+        return self._row_to_job(row, count)
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, attempts = attempts + 1, "
+                "updated_at = ?, heartbeat_at = ? WHERE id = ?",
+                (RUNNING, worker_id, now, now, row["id"]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row["id"])
+
+    def heartbeat(self, job_id: str) -> None:
+        self._connect().execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), job_id))
+
+    def append_event(self, job_id: str, event: str, data: Any) -> int:
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), -1) + 1 FROM job_events WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO job_events (job_id, seq, event, data, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, seq, event, json.dumps(data), now),
+            )
+            conn.execute("UPDATE jobs SET updated_at = ?, heartbeat_at = ? WHERE id = ?", (now, now, job_id))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return seq
+
+    def events(self, job_id: str, after: int = -1) -> List[Tuple[int, str, Any]]:
+        rows = self._connect().execute(
+            "SELECT seq, event, data FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+            (job_id, after),
+        ).fetchall()
+        return [(row["seq"], row["event"], json.loads(row["data"])) for row in rows]
+
+    def finish(self, job_id: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+            (FAILED if error else SUCCEEDED, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+        )
+
+    def requeue_stale(self, stale_after: float) -> List[str]:
+        conn = self._connect()
+        cutoff = time.time() - stale_after
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            ids = [
+                row["id"] for row in conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? AND COALESCE(heartbeat_at, updated_at) < ?",
+                    (RUNNING, cutoff),
+                ).fetchall()
+            ]
+            for job_id in ids:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker_id = NULL, updated_at = ? WHERE id = ?",
+                    (QUEUED, time.time(), job_id),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return ids
+
+
+# Pop the next queued id and mark its job running in one step, so a worker
+# dying in between cannot lose the job (KEYS: queue, running set;
+# ARGV: running status, worker id, timestamp)
+_CLAIM_SCRIPT = """
+local job_id = redis.call('RPOP', KEYS[1])
+if not job_id then
+    return false
+end
+local key = 'job:' .. job_id
+redis.call('HSET', key, 'status', ARGV[1], 'worker_id', ARGV[2], 'updated_at', ARGV[3], 'heartbeat_at', ARGV[3])
+redis.call('HINCRBY', key, 'attempts', 1)
+redis.call('SADD', KEYS[2], job_id)
+return job_id
+"""
+
+# Requeue one running job if it is still stale when the script runs, so a
+# heartbeat or finish racing with the reaper wins (KEYS: job hash, running
+# set, queue; ARGV: job id, running status, queued status, cutoff, timestamp)
+_REQUEUE_SCRIPT = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if status ~= ARGV[2] then
+    redis.call('SREM', KEYS[2], ARGV[1])
+    return 0
+end
+local last_seen = tonumber(redis.call('HGET', KEYS[1], 'heartbeat_at') or redis.call('HGET', KEYS[1], 'updated_at') or '0')
+if last_seen >= tonumber(ARGV[4]) then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', ARGV[3], 'worker_id', '', 'updated_at', ARGV[5])
+redis.call('SREM', KEYS[2], ARGV[1])
+redis.call('RPUSH', KEYS[3], ARGV[1])
+return 1
+"""
+
+
+class RedisJobBroker(JobBroker):
+    """Redis-compatible broker for multi-host deployments.
+
+    Layout: `job:<id>` hash with the job fields, `job:<id>:events` list of
+    JSON events, `jobs:queue` list of queued ids and `jobs:running` set.
+    Claiming and requeueing run as Lua scripts, so they are atomic on the
+    server (the job keys are derived in the script: single-node Redis only).
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("RedisJobBroker requires the 'redis' package (pip install redis)") from e
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self._claim = self.redis.register_script(_CLAIM_SCRIPT)
+        self._requeue = self.redis.register_script(_REQUEUE_SCRIPT)
+
+    def _key(self, job_id: str) -> str:
+        return f"job:{job_id}"
+
+    def submit(self, kind: str, params: Dict[str, Any], upload_path: Optional[str] = None) -> Job:
+        now = time.time()
+        job_id = new_job_id()
+        pipe = self.redis.pipeline()
+        pipe.hset(self._key(job_id), mapping={
+            "id": job_id,
+            "kind": kind,
+            "params": json.dumps(params),
+            "status": QUEUED,
+            "upload_path": upload_path or "",
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now,
+        })
+        pipe.lpush("jobs:queue", job_id)
+        pipe.execute()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        data = self.redis.hgetall(self._key(job_id))
+        if not data:
+            return None
+        return Job(
+            id=data["id"],
+            kind=data["kind"],
+            params=json.loads(data["params"]),
+            status=data["status"],
+            result=json.loads(data["result"]) if data.get("result") else None,
+            error=data.get("error") or None,
+            worker_id=data.get("worker_id") or None,
+            upload_path=data.get("upload_path") or None,
+            attempts=int(data.get("attempts", 0)),
+            event_count=self.redis.llen(f"{self._key(job_id)}:events"),
+            created_at=float(data["created_at"]),
+            updated_at=float(data["updated_at"]),
+            heartbeat_at=float(data["heartbeat_at"]) if data.get("heartbeat_at") else None,
+        )
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        job_id = self._claim(keys=["jobs:queue", "jobs:running"], args=[RUNNING, worker_id, time.time()])
+        if not job_id:
+            return None
+        return self.get(job_id)
+
+    def heartbeat(self, job_id: str) -> None:
+        self.redis.hset(self._key(job_id), "heartbeat_at", time.time())
+
+    def append_event(self, job_id: str, event: str, data: Any) -> int:
+        now = time.time()
+        length = self.redis.rpush(f"{self._key(job_id)}:events", json.dumps({"event": event, "data": data}))
+        self.redis.hset(self._key(job_id), mapping={"updated_at": now, "heartbeat_at": now})
+        return length - 1
+
+    def events(self, job_id: str, after: int = -1) -> List[Tuple[int, str, Any]]:
+        items = self.redis.lrange(f"{self._key(job_id)}:events", after + 1, -1)
+        out = []
+        for offset, raw in enumerate(items):
+            item = json.loads(raw)
+            out.append((after + 1 + offset, item["event"], item["data"]))
+        return out
+
+    def finish(self, job_id: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        mapping = {"status": FAILED if error else SUCCEEDED, "updated_at": time.time()}
+        if result is not None:
+            mapping["result"] = json.dumps(result)
+        if error:
+            mapping["error"] = error
+        pipe = self.redis.pipeline()
+        pipe.hset(self._key(job_id), mapping=mapping)
+        pipe.srem("jobs:running", job_id)
+        pipe.execute()
+
+    def requeue_stale(self, stale_after: float) -> List[str]:
+        cutoff = time.time() - stale_after
+        requeued = []
+        for job_id in self.redis.smembers("jobs:running"):
+            # claim() pops from the right: requeued jobs resume first
+            if self._requeue(
+                keys=[self._key(job_id), "jobs:running", "jobs:queue"],
+                args=[job_id, RUNNING, QUEUED, cutoff, time.time()],
+            ):
+                requeued.append(job_id)
+        return requeued
+
+
+_broker: Optional[JobBroker] = None
+_broker_lock = threading.Lock()
+
+
+def create_broker(url: str) -> JobBroker:
+    if url.startswith("sqlite:///"):
+        return SQLiteJobBroker(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisJobBroker(url)
+    raise ValueError(f"Unsupported JOB_BROKER_URL: {url}")
+
+
+def get_broker() -> JobBroker:
+    """Return the process-wide broker configured by JOB_BROKER_URL."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = create_broker(JOB_BROKER_URL)
+    return _broker
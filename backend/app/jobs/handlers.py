@@ -0,0 +1,131 @@
+"""Pipeline runs that can be submitted as background jobs.
+
+Each handler takes the job's params and is an async generator of SSE
+messages, exactly like the streaming routes; the worker stores every
+message as a job event and the `complete` payload as the job result.
+
+Clients only set the params a kind declares (`JOB_PARAMS`). Document jobs
+get their upload as `params["file_path"]` from the job's server-side
+`upload_path`, written by /jobs/upload under JOB_UPLOAD_DIR, which must be
+reachable by the worker (same host, or a shared volume).
+"""
+
+import os
+from typing import Any, AsyncGenerator, Callable, Dict, Iterable, Set
+
+from sqlalchemy.future import select
+
+from app.database import AsyncSessionLocal
+from app.models.chat import ChatSessionState
+from app.pipelines.builds.feasibility_structured_streaming import run_structured_feasibility_streaming
+from app.pipelines.builds.roadmap_pipeline_streaming import run_roadmap_pipeline_streaming
+from app.pipelines.builds.roadmap_pipeline_from_summary_streaming import run_roadmap_from_summary_streaming
+from app.services.result_store import ROADMAP, session_key, document_key, project_key, save_result
+from app.utils.feasibility_converter import convert_text_to_structured
+from app.utils.streaming import format_error
+
+JobHandler = Callable[[Dict[str, Any]], AsyncGenerator[str, None]]
+
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+# Params a client may submit for each kind
+JOB_PARAMS: Dict[str, Set[str]] = {}
+
+# Uploaded documents for document jobs; the only files a worker deletes
+JOB_UPLOAD_DIR = os.getenv("JOB_UPLOAD_DIR", "./job_uploads")
+
+# Kinds that need an uploaded document (submitted through /jobs/upload)
+DOCUMENT_JOB_KINDS = {"roadmap_from_document", "feasibility_from_document"}
+
+
+def job_handler(kind: str, params: Iterable[str] = ()):
+    """Register an async-generator pipeline under a job kind, with the params clients may set."""
+    def decorator(func: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = func
+        JOB_PARAMS[kind] = set(params)
+        return func
+    return decorator
+
+
+def is_job_upload(path: str) -> bool:
+    """Whether `path` resolves to a file inside JOB_UPLOAD_DIR."""
+    upload_dir = os.path.realpath(JOB_UPLOAD_DIR)
+    return os.path.commonpath([upload_dir, os.path.realpath(path)]) == upload_dir
+
+
+@job_handler("roadmap_from_summary", params=("summary", "project_id"))
+async def _roadmap_from_summary(params: Dict[str, Any]) -> AsyncGenerator[str, None]:
+    project_id = params.get("project_id")
+    # Set by the submit route from the caller's token; anonymous jobs reuse nothing
+    user_id = params.get("user_id")
+    owner_key = project_key(project_id, user_id) if project_id and user_id is not None else None
+    async for event in run_roadmap_from_summary_streaming(params["summary"], owner_key=owner_key):
+        yield event
+
+
+@job_handler("roadmap_from_document")
+async def _roadmap_from_document(params: Dict[str, Any]) -> AsyncGenerator[str, None]:
+    doc_hash = params["document_hash"]
+
+    async def _persist(final_result: dict):
+        final_result["document_hash"] = doc_hash
+        await save_result(ROADMAP, document_key(doc_hash), doc_hash, final_result)
+
+    async for event in run_roadmap_pipeline_streaming(params["file_path"], on_complete=_persist):
+        yield event
+
+
+@job_handler("feasibility_from_summary", params=("summary", "refresh"))
+async def _feasibility_from_summary(params: Dict[str, Any]) -> AsyncGenerator[str, None]:
+    structured_input = convert_text_to_structured(summary=params["summary"], project_id="summary_input")
+    async for event in run_structured_feasibility_streaming(structured_input, refresh=bool(params.get("refresh"))):
+        yield event
+
+
+@job_handler("feasibility_from_session", params=("session_id", "refresh", "show_risks"))
+async def _feasibility_from_session(params: Dict[str, Any]) -> AsyncGenerator[str, None]:
+    session_id = int(params["session_id"])
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(ChatSessionState).where(ChatSessionState.session_id == session_id)
+        )
+        session_state = result.scalar_one_or_none()
+
+    if not session_state:
+        yield format_error("Chat session not found")
+        return
+    refined_summary = session_state.refined_summary or session_state.initial_summary
+    if not refined_summary:
+        yield format_error("No refined summary available")
+        return
+
+    structured_input = convert_text_to_structured(
+        summary=refined_summary,
+        domain=session_state.domain,
+        goals=session_state.goals if hasattr(session_state, 'goals') else None,
+        project_id=f"chat_{session_id}"
+    )
+    async for event in run_structured_feasibility_streaming(
+        structured_input,
+        show_risks=bool(params.get("show_risks", True)),
+        refresh=bool(params.get("refresh")),
+        owner_key=session_key(session_id),
+    ):
+        yield event
+
+
+@job_handler("feasibility_from_document")
+async def _feasibility_from_document(params: Dict[str, Any]) -> AsyncGenerator[str, None]:
+    filename = params.get("filename") or "document"
+    doc_hash = params["document_hash"]
+    structured_input = convert_text_to_structured(
+        summary=f"Document: {filename}",
+        domain="Document-Based Project",
+        project_id=f"doc_{filename}"
+    )
+    async for event in run_structured_feasibility_streaming(
+        structured_input,
+        refresh=bool(params.get("refresh")),
+        owner_key=document_key(doc_hash),
+        extra={"document_hash": doc_hash},
+    ):
+        yield event
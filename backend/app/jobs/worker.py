@@ -0,0 +1,161 @@
+"""Job workers: claim queued jobs from the broker and run their pipelines.
+
+Run in-process (started with the API when JOB_WORKER_MODE=inprocess, the
+default) or as separate processes:
+
+    python -m app.scripts.run_job_worker
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import List, Optional
+
+from app.jobs.broker import JobBroker, Job, get_broker
+from app.jobs.handlers import JOB_HANDLERS, is_job_upload
+from app.utils.streaming import parse_sse
+from app.utils.workers import run_in_worker
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKER_MODE = os.getenv("JOB_WORKER_MODE", "inprocess")  # "inprocess" | "external"
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "15"))
+# A running job whose worker has not heart-beaten for this long is requeued
+JOB_STALE_AFTER = float(os.getenv("JOB_STALE_AFTER", "120"))
+
+
+class JobWorker:
+    """Pulls jobs from a broker and runs up to `concurrency` of them at once."""
+
+    def __init__(self, broker: Optional[JobBroker] = None, concurrency: int = JOB_WORKER_CONCURRENCY):
+        self.broker = broker or get_broker()
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stopping = asyncio.Event()
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_INTERVAL)
+            await run_in_worker(self.broker.heartbeat, job_id)
+
+    def _cleanup(self, job: Job) -> None:
+        """Delete the job's uploaded file once the job is finished for good."""
+        path = job.upload_path
+        if not path:
+            return
+        if not is_job_upload(path):
+            logger.warning(f"Job {job.id}: not deleting {path!r} outside JOB_UPLOAD_DIR")
+            return
+        if os.path.exists(path):
+            os.unlink(path)
+
+    async def run_job(self, job: Job) -> None:
+        """Run one claimed job to completion, recording its events and result."""
+        print(f"[JobWorker] >> {job.kind} {job.id} (attempt {job.attempts})")
+        handler = JOB_HANDLERS.get(job.kind)
+        if handler is None:
+            await run_in_worker(self.broker.finish, job.id, None, f"Unknown job kind '{job.kind}'")
+            self._cleanup(job)
+            return
+
+        if job.attempts > 1:
+            await run_in_worker(
+                self.broker.append_event, job.id, "status",
+                {"message": "Resuming after a worker restart...", "stage": "resumed"},
+            )
+
+        params = dict(job.params)
+        if job.upload_path:
+            params["file_path"] = job.upload_path
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        result = None
+        error = None
+        try:
+            async for message in handler(params):
+                event, data = parse_sse(message)
+                await run_in_worker(self.broker.append_event, job.id, event, data)
+                if event == "complete":
+                    result = data
+                elif event == "error":
+                    error = data.get("error") if isinstance(data, dict) else str(data)
+            if result is None and error is None:
+                error = "Pipeline finished without a result"
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}", exc_info=True)
+            error = str(e)
+            await run_in_worker(self.broker.append_event, job.id, "error", {"error": error})
+        finally:
+            # On cancellation (shutdown) the job stays running and is requeued
+            # once its heartbeat goes stale, so its upload must stay in place
+            heartbeat.cancel()
+
+        await run_in_worker(self.broker.finish, job.id, result, error)
+        self._cleanup(job)
+        print(f"[JobWorker] << {job.kind} {job.id}: {'failed - ' + error if error else 'succeeded'}")
+
+    async def _slot(self):
+        while not self._stopping.is_set():
+            try:
+                job = await run_in_worker(self.broker.claim, self.worker_id)
+            except Exception as e:
+                logger.error(f"Job claim failed: {e}", exc_info=True)
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.run_job(job)
+
+    async def _reaper(self):
+        """Periodically requeue jobs orphaned by a crashed or restarted worker."""
+        while not self._stopping.is_set():
+            try:
+                requeued = await run_in_worker(self.broker.requeue_stale, JOB_STALE_AFTER)
+                if requeued:
+                    print(f"[JobWorker] Requeued {len(requeued)} interrupted job(s)")
+            except Exception as e:
+                logger.error(f"Requeue of stale jobs failed: {e}", exc_info=True)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=JOB_STALE_AFTER / 2)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self):
+        """Process the queue until stopped, requeueing orphaned jobs along the way."""
+        print(f"[JobWorker] {self.worker_id} started with {self.concurrency} slot(s)")
+        await asyncio.gather(self._reaper(), *(self._slot() for _ in range(self.concurrency)))
+
+    def stop(self):
+        self._stopping.set()
+
+
+_in_process: List[asyncio.Task] = []
+_in_process_worker: Optional[JobWorker] = None
+
+
+def start_in_process_workers() -> None:
+    """Start a worker on the API's event loop (JOB_WORKER_MODE=inprocess)."""
+    global _in_process_worker
+    if JOB_WORKER_MODE != "inprocess" or _in_process_worker is not None:
+        return
+    _in_process_worker = JobWorker()
+    _in_process.append(asyncio.create_task(_in_process_worker.run()))
+
+
+async def stop_in_process_workers() -> None:
+    """Stop claiming new jobs; running jobs are requeued on the next start."""
+    global _in_process_worker
+    if _in_process_worker is None:
+        return
+    _in_process_worker.stop()
+    for task in _in_process:
+        task.cancel()
+    await asyncio.gather(*_in_process, return_exceptions=True)
+    _in_process.clear()
+    _in_process_worker = None
@@ -1,6 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import roadmap, auth, chat, feasibility, test, summarize
+from app.routes import roadmap, auth, chat, feasibility, test, summarize, jobs
+from app.pipelines.registry import compile_all_graphs
+from app.jobs.worker import start_in_process_workers, stop_in_process_workers
+from app.utils.http import close_http_client
+from app.utils.extract_pool import shutdown_extract_pool
+from app.utils.uploads import UploadLimitMiddleware
 
 app = FastAPI()
 app.include_router(roadmap.router)
@@ -9,6 +14,7 @@ app.include_router(chat.router)
 app.include_router(feasibility.router)
 app.include_router(test.router)
 app.include_router(summarize.router)
+app.include_router(jobs.router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,6 +24,32 @@ app.add_middleware(
     allow_headers=["*"],         # Allow all headers
 )
 
+# Rejects oversized uploads while they stream in, before they are spooled
+app.add_middleware(UploadLimitMiddleware)
+
+@app.on_event("startup")
+def warm_graphs():
+    # Compile every LangGraph pipeline once; requests reuse the compiled instances
+    compile_all_graphs()
+
+@app.on_event("startup")
+async def start_job_workers():
+    # Background jobs run on this event loop unless JOB_WORKER_MODE=external
+    start_in_process_workers()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await stop_in_process_workers()
+
+@app.on_event("shutdown")
+async def close_enrichment_client():
+    # Release the pooled keep-alive connections used by wiki/ddg enrichment
+    await close_http_client()
+
+@app.on_event("shutdown")
+def stop_extraction_workers():
+    shutdown_extract_pool()
+
 @app.get("/")
 def read_root():
     return {"Welcome": "to InnoScope Backend!"}
\ No newline at end of file
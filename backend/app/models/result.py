@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, TIMESTAMP, JSON, UniqueConstraint, func
+from app.database import Base
+
+
+class PipelineResult(Base):
+    """Last generated result of a pipeline (feasibility report, roadmap) for one owner.
+
+    `owner_key` is "session:<chat session id>", "document:<sha256 of upload>"
+    or "project:<client project id>".
+    """
+    __tablename__ = "pipeline_results"
+    __table_args__ = (
+        UniqueConstraint("kind", "owner_key", name="uq_pipeline_results_kind_owner"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)          # "feasibility" | "roadmap" | "roadmap_artifacts"
+    owner_key = Column(String(255), nullable=False, index=True)
+    inputs_hash = Column(String(64), nullable=False)
+    model_version = Column(String(100), nullable=False)
+    etag = Column(String(64), nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Optional, List
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel
@@ -8,6 +9,7 @@ from app.pipelines.nodes.chat_missing import chat_find_missing_node, chat_route_
 from app.pipelines.nodes.chat_question import chat_generate_question_node
 from app.pipelines.nodes.chat_compose_baseline import chat_compose_baseline_node
 from app.pipelines.nodes.chat_refine_research_style import chat_refine_research_style_node
+from app.pipelines.registry import get_graph
 
 
 class ChatState(IntermediateState):
@@ -49,13 +51,17 @@ def create_chat_graph():
     return graph.compile()
 
 
-def run_chat_turn(memory_text: str) -> ChatState:
-    graph = create_chat_graph()
+async def arun_chat_turn(memory_text: str) -> ChatState:
+    graph = get_graph("chat")
     initial = ChatState(memory_text=memory_text)
-    result = graph.invoke(initial)
+    result = await graph.ainvoke(initial)
     if isinstance(result, dict):
         result = ChatState(**result)
     return result
 
 
-__all__ = ["ChatState", "create_chat_graph", "run_chat_turn"]
+def run_chat_turn(memory_text: str) -> ChatState:
+    return asyncio.run(arun_chat_turn(memory_text))
+
+
+__all__ = ["ChatState", "create_chat_graph", "arun_chat_turn", "run_chat_turn"]
@@ -10,6 +10,7 @@ from app.pipelines.nodes.feasibility_assess import (
     assess_risk_feasibility_node,
 )
 from app.pipelines.nodes.feasibility_report import generate_feasibility_report_node
+from app.pipelines.registry import get_graph
 
 
 def create_feasibility_graph():
@@ -64,7 +65,7 @@ def run_feasibility_assessment(
     """
     print("\n[Feasibility Pipeline] Starting feasibility assessment...")
     
-    graph = create_feasibility_graph()
+    graph = get_graph("feasibility_legacy")
     
     initial_state = FeasibilityAssessmentState(
         refined_summary=refined_summary,
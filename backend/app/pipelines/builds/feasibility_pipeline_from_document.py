@@ -7,13 +7,14 @@ Flow:
 Returns a DocumentFeasibilityState with scoped fields and feasibility report.
 """
 
+import asyncio
 from typing import Optional
 from langgraph.graph import StateGraph, END
 
 from app.schemas.intermediate import IntermediateState
 from app.schemas.feasibility import FeasibilityAssessmentState
-from app.pipelines.builds.scoping import create_graph as create_scoping_graph
-from app.pipelines.builds.feasibility_pipeline import create_feasibility_graph
+from app.pipelines.registry import get_graph
+from app.pipelines.builds.scoping import ascope_document
 
 
 class DocumentFeasibilityState(IntermediateState, FeasibilityAssessmentState):
@@ -21,16 +22,12 @@ class DocumentFeasibilityState(IntermediateState, FeasibilityAssessmentState):
     pass
 
 
-def _scoping_node(state: DocumentFeasibilityState) -> DocumentFeasibilityState:
+async def _scoping_node(state: DocumentFeasibilityState) -> DocumentFeasibilityState:
     """Run scoping to extract summary and structured fields from document."""
     print("[Feasibility From Document] >> scoping: starting (file_path=", state.file_path, ")")
     
-    scoping_graph = create_scoping_graph()
-    start = IntermediateState(file_path=state.file_path, raw_text=state.raw_text)
-    result = scoping_graph.invoke(start)
-    
-    if isinstance(result, dict):
-        result = IntermediateState(**result)
+    # Documents scoped before (same bytes) are served from their stored artifacts
+    result = await ascope_document(state.file_path, state.raw_text)
     
     # Copy scoped fields back to state
     for field in [
@@ -53,14 +50,14 @@ def _scoping_node(state: DocumentFeasibilityState) -> DocumentFeasibilityState:
     return state
 
 
-def _feasibility_node(state: DocumentFeasibilityState) -> DocumentFeasibilityState:
+async def _feasibility_node(state: DocumentFeasibilityState) -> DocumentFeasibilityState:
     """Run feasibility assessment on scoped project information."""
     print("[Feasibility From Document] >> feasibility: starting assessment")
     
     # Prepare refined summary for feasibility (use scoped summary)
     state.refined_summary = state.summary
     
-    feasibility_graph = create_feasibility_graph()
+    feasibility_graph = get_graph("feasibility_legacy")
     
     # Create feasibility state from current state
     feasibility_state = FeasibilityAssessmentState(
@@ -72,7 +69,7 @@ def _feasibility_node(state: DocumentFeasibilityState) -> DocumentFeasibilitySta
         key_topics=state.key_topics,
     )
     
-    result = feasibility_graph.invoke(feasibility_state)
+    result = await feasibility_graph.ainvoke(feasibility_state)
     
     if isinstance(result, dict):
         result = FeasibilityAssessmentState(**result)
@@ -110,7 +107,7 @@ def create_feasibility_from_document_graph():
     return graph.compile()
 
 
-def run_feasibility_from_document(file_path: str) -> DocumentFeasibilityState:
+async def arun_feasibility_from_document(file_path: str) -> DocumentFeasibilityState:
     """
     Assess feasibility from uploaded document.
     
@@ -122,11 +119,11 @@ def run_feasibility_from_document(file_path: str) -> DocumentFeasibilityState:
     """
     print("[Feasibility From Document] START pipeline")
     
-    graph = create_feasibility_from_document_graph()
+    graph = get_graph("feasibility_from_document")
     
     initial = DocumentFeasibilityState(file_path=file_path)
     
-    result = graph.invoke(initial)
+    result = await graph.ainvoke(initial)
     
     if isinstance(result, dict):
         result = DocumentFeasibilityState(**result)
@@ -135,4 +132,14 @@ def run_feasibility_from_document(file_path: str) -> DocumentFeasibilityState:
     return result
 
 
-__all__ = ["create_feasibility_from_document_graph", "run_feasibility_from_document", "DocumentFeasibilityState"]
+def run_feasibility_from_document(file_path: str) -> DocumentFeasibilityState:
+    """Synchronous entry point for scripts; see `arun_feasibility_from_document`."""
+    return asyncio.run(arun_feasibility_from_document(file_path))
+
+
+__all__ = [
+    "create_feasibility_from_document_graph",
+    "arun_feasibility_from_document",
+    "run_feasibility_from_document",
+    "DocumentFeasibilityState",
+]
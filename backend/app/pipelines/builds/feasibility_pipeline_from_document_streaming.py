@@ -7,23 +7,27 @@ Flow:
 Yields SSE events with progress updates.
 """
 
-from typing import Generator, Optional
+from typing import AsyncGenerator, Optional
+import asyncio
 import json
-from app.schemas.intermediate import IntermediateState
 from app.schemas.feasibility import FeasibilityAssessmentState
-from app.pipelines.builds.scoping import create_graph as create_scoping_graph
-from app.pipelines.nodes.feasibility_assess import (
-    assess_technical_feasibility_node,
-    assess_resource_feasibility_node,
-    assess_skills_feasibility_node,
-    assess_scope_feasibility_node,
-    assess_risk_feasibility_node,
-)
+from app.pipelines.builds.scoping import ascope_document
+from app.pipelines.nodes.feasibility_assess import aassess_dimension
 from app.pipelines.nodes.feasibility_report import generate_feasibility_report_node
 from app.utils.streaming import format_status, format_complete, format_error
 
 
-def run_feasibility_from_document_streaming(file_path: str) -> Generator[str, None, None]:
+# dimension -> label used in progress messages
+DIMENSION_LABELS = {
+    "technical": "Technical",
+    "resource": "Resources",
+    "skills": "Skills",
+    "scope": "Scope",
+    "risk": "Risk",
+}
+
+
+async def run_feasibility_from_document_streaming(file_path: str) -> AsyncGenerator[str, None]:
     """
     Assess feasibility from document with real-time streaming progress.
     
@@ -42,13 +46,8 @@ def run_feasibility_from_document_streaming(file_path: str) -> Generator[str, No
         print("[Feasibility Stream] Yielding scoping start event...")
         yield format_status("Extracting and analyzing document...", progress=0, stage="scoping")
         
-        print("[Feasibility Stream] Creating scoping graph...")
-        scoping_graph = create_scoping_graph()
-        print("[Feasibility Stream] Invoking scoping graph...")
-        scoping_state = scoping_graph.invoke(IntermediateState(file_path=file_path))
-        
-        if isinstance(scoping_state, dict):
-            scoping_state = IntermediateState(**scoping_state)
+        print("[Feasibility Stream] Running scoping (stored artifacts are reused)...")
+        scoping_state = await ascope_document(file_path)
         
         print(f"[Feasibility Stream] Scoping complete. Summary: {scoping_state.summary[:100] if scoping_state.summary else 'NONE'}")
         
@@ -71,39 +70,26 @@ def run_feasibility_from_document_streaming(file_path: str) -> Generator[str, No
             key_topics=scoping_state.key_topics or [],
         )
         
-        # Stage 2: Technical Feasibility
-        print("[Feasibility Stream] Starting technical feasibility assessment...")
-        yield format_status("Assessing technical feasibility...", progress=25, stage="technical")
-        state = assess_technical_feasibility_node(state)
-        print(f"[Feasibility Stream] Technical feasibility done: {state.technical_feasibility}")
-        if state.technical_feasibility:
-            yield format_status(f"Technical: {state.technical_feasibility.score}/100", progress=35, stage="technical_complete")
-        
-        # Stage 3: Resource Feasibility
-        yield format_status("Assessing resource feasibility...", progress=40, stage="resource")
-        state = assess_resource_feasibility_node(state)
-        if state.resource_feasibility:
-            yield format_status(f"Resources: {state.resource_feasibility.score}/100", progress=50, stage="resource_complete")
-        
-        # Stage 4: Skills Feasibility
-        yield format_status("Assessing skills feasibility...", progress=55, stage="skills")
-        state = assess_skills_feasibility_node(state)
-        if state.skills_feasibility:
-            yield format_status(f"Skills: {state.skills_feasibility.score}/100", progress=65, stage="skills_complete")
-        
-        # Stage 5: Scope Feasibility
-        yield format_status("Assessing scope feasibility...", progress=70, stage="scope")
-        state = assess_scope_feasibility_node(state)
-        if state.scope_feasibility:
-            yield format_status(f"Scope: {state.scope_feasibility.score}/100", progress=80, stage="scope_complete")
-        
-        # Stage 6: Risk Feasibility
-        yield format_status("Assessing risk feasibility...", progress=85, stage="risk")
-        state = assess_risk_feasibility_node(state)
-        if state.risk_feasibility:
-            yield format_status(f"Risk: {state.risk_feasibility.score}/100", progress=90, stage="risk_complete")
-        
-        # Stage 7: Generate Report
+        # Stage 2: All five dimensions concurrently (independent LLM calls on
+        # the same summary, bounded by the shared LLM limiter)
+        print("[Feasibility Stream] Assessing 5 dimensions concurrently...")
+        yield format_status("Assessing technical, resource, skills, scope and risk feasibility...", progress=25, stage="dimensions")
+        
+        async def _assess(dimension: str):
+            return dimension, await aassess_dimension(dimension, state)
+        
+        progress = 25
+        for finished in asyncio.as_completed([_assess(d) for d in DIMENSION_LABELS]):
+            dimension, sub_score = await finished
+            progress += 13
+            if sub_score is None:
+                yield format_status(f"{DIMENSION_LABELS[dimension]}: unavailable", progress=progress, stage=f"{dimension}_complete")
+                continue
+            setattr(state, f"{dimension}_feasibility", sub_score)
+            print(f"[Feasibility Stream] {dimension} feasibility done: {sub_score.score}")
+            yield format_status(f"{DIMENSION_LABELS[dimension]}: {sub_score.score}/100", progress=progress, stage=f"{dimension}_complete")
+        
+        # Stage 3: Generate Report
         yield format_status("Generating final report...", progress=95, stage="report")
         state = generate_feasibility_report_node(state)
         
@@ -3,13 +3,14 @@ LangGraph-based feasibility assessment pipeline.
 Combines ML prediction, semantic search, and unified assessment.
 
 Pipeline:
-1. ML Prediction → get feasibility score from trained model
-2. Semantic Search → find relevant papers
-3. Unified Assessment → score 5 dimensions using ML + papers + LLM
-4. Report Generation → compile final report
+1. ML Prediction ┐ (parallel) → get feasibility score from trained model
+   Semantic Search ┘           → find relevant papers
+2. Unified Assessment → score 5 dimensions using ML + papers + LLM
+3. Report Generation → compile final report
 """
 
-from langgraph.graph import StateGraph, END
+import asyncio
+from langgraph.graph import StateGraph, START, END
 from app.schemas.feasibility_new import (
     StructuredFeasibilityInput,
     FeasibilityAssessmentState,
@@ -21,10 +22,21 @@ from app.pipelines.nodes.feasibility_assess_new import (
     unified_assessment_node
 )
 from app.pipelines.nodes.feasibility_report_new import generate_feasibility_report_node
+from app.pipelines.registry import get_graph
+from app.utils.streaming import GraphProgressStream
+from app.utils.cache import TTLCache, stable_hash
+from typing import Any, Dict, Optional
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+# Whole-report cache: identical structured inputs produce the same report, and
+# users re-open the Feasibility tab for the same chat session all the time.
+FEASIBILITY_CACHE_TTL = float(os.getenv("FEASIBILITY_CACHE_TTL", "3600"))
+FEASIBILITY_CACHE_SIZE = int(os.getenv("FEASIBILITY_CACHE_SIZE", "256"))
+_report_cache = TTLCache(maxsize=FEASIBILITY_CACHE_SIZE, ttl=FEASIBILITY_CACHE_TTL)
+
 
 def create_feasibility_graph():
     """Build the feasibility assessment pipeline as a LangGraph."""
@@ -36,23 +48,24 @@ def create_feasibility_graph():
     graph.add_node("unified_assessment", unified_assessment_node)
     graph.add_node("generate_report", generate_feasibility_report_node)
     
-    # Set entry point
-    graph.set_entry_point("ml_prediction")
+    # Fan out: ML prediction (CPU-bound) and semantic search (network-bound)
+    # are independent, so both start from the entry
+    graph.add_edge(START, "ml_prediction")
+    graph.add_edge(START, "semantic_search")
     
-    # Define edges (sequential flow)
-    graph.add_edge("ml_prediction", "semantic_search")
-    graph.add_edge("semantic_search", "unified_assessment")
+    # Join: unified assessment waits for both branches
+    graph.add_edge(["ml_prediction", "semantic_search"], "unified_assessment")
     graph.add_edge("unified_assessment", "generate_report")
     graph.add_edge("generate_report", END)
     
     return graph.compile()
 
 
-def run_feasibility_assessment(
+async def arun_feasibility_assessment(
     input_data: StructuredFeasibilityInput
 ) -> FeasibilityAssessmentState:
     """
-    Execute the feasibility assessment pipeline.
+    Execute the feasibility assessment pipeline without blocking the event loop.
     
     Args:
         input_data: Structured project fields
@@ -62,13 +75,13 @@ def run_feasibility_assessment(
     """
     logger.info(f"[Pipeline] Starting feasibility assessment for {input_data.project_id}")
     
-    graph = create_feasibility_graph()
+    graph = get_graph("feasibility")
     
     initial_state = FeasibilityAssessmentState(
         input_data=input_data
     )
     
-    result_dict = graph.invoke(initial_state)
+    result_dict = await graph.ainvoke(initial_state)
     
     # Convert dict result back to FeasibilityAssessmentState
     if isinstance(result_dict, dict):
@@ -77,10 +90,111 @@ def run_feasibility_assessment(
         result = result_dict
     
     logger.info(f"[Pipeline] Assessment complete. Final score: {result.final_score}")
+    logger.info(
+        "[Pipeline] Stage timings: "
+        + ", ".join(f"{stage}={secs:.2f}s" for stage, secs in result.stage_timings.items())
+    )
     
     return result
 
 
+def run_feasibility_assessment(
+    input_data: StructuredFeasibilityInput
+) -> FeasibilityAssessmentState:
+    """Synchronous entry point for scripts; runs the async pipeline to completion."""
+    return asyncio.run(arun_feasibility_assessment(input_data))
+
+
+# Node -> (status message, progress % on completion) for SSE progress
+FEASIBILITY_STAGES = {
+    "ml_prediction": ("Running ML prediction...", 30),
+    "semantic_search": ("Searching for relevant papers...", 40),
+    "unified_assessment": ("Assessing 5 dimensions...", 85),
+    "generate_report": ("Generating report...", 95),
+}
+
+
+def _field(obj: Any, name: str) -> Any:
+    """Read a field from a pydantic model or a plain dict."""
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+def feasibility_partial_state(node: str, update: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Extract the client-visible part of a node's update for progress events."""
+    if node == "ml_prediction" and update.get("ml_prediction") is not None:
+        prediction = update["ml_prediction"]
+        return {
+            "ml_score": _field(prediction, "ml_score"),
+            "ml_confidence": _field(prediction, "confidence"),
+        }
+    if node == "semantic_search":
+        papers = update.get("relevant_papers") or []
+        return {
+            "papers_found": len(papers),
+            "paper_titles": [_field(p, "title") for p in papers[:3]],
+        }
+    if node == "unified_assessment":
+        scores = {}
+        for dim in ["technical", "resource", "skills", "scope", "risk"]:
+            sub = update.get(f"{dim}_feasibility")
+            if sub is not None:
+                scores[f"{dim}_score"] = _field(sub, "score")
+        return scores or None
+    if node == "generate_report":
+        return {
+            "final_score": update.get("final_score"),
+            "viability_status": update.get("viability_status"),
+        }
+    return None
+
+
+def stream_feasibility_assessment(input_data: StructuredFeasibilityInput) -> GraphProgressStream:
+    """
+    Build a progress stream for the feasibility pipeline.
+    
+    Iterate it for SSE status events; afterwards read `final_state`.
+    """
+    logger.info(f"[Pipeline] Streaming feasibility assessment for {input_data.project_id}")
+    return GraphProgressStream(
+        get_graph("feasibility"),
+        FeasibilityAssessmentState(input_data=input_data),
+        stages=FEASIBILITY_STAGES,
+        partial=feasibility_partial_state,
+    )
+
+
+def feasibility_cache_key(input_data: StructuredFeasibilityInput) -> str:
+    """Canonical hash of every input field except the per-request `project_id`."""
+    return stable_hash(input_data.model_dump(exclude={"project_id"}))
+
+
+def get_cached_report(input_data: StructuredFeasibilityInput) -> Optional[FeasibilityReport]:
+    """Return a stored report for an identical input, re-labelled with this request's project_id."""
+    report = _report_cache.get(feasibility_cache_key(input_data))
+    if report is None:
+        return None
+    logger.info(f"[Pipeline] Feasibility cache hit for {input_data.project_id}")
+    return report.model_copy(update={"project_id": input_data.project_id})
+
+
+def cache_report(input_data: StructuredFeasibilityInput, report: FeasibilityReport) -> None:
+    """Store a finished report for later identical inputs."""
+    _report_cache.set(feasibility_cache_key(input_data), report)
+
+
+def is_cacheable(state: FeasibilityAssessmentState) -> bool:
+    """Whether an assessment may be cached and stored: no stage fell back to defaults."""
+    return (
+        not state.degraded_stages
+        and state.final_score is not None
+        and state.technical_feasibility is not None
+    )
+
+
+def feasibility_cache_stats() -> Dict[str, Any]:
+    return _report_cache.stats()
+
+
 def convert_state_to_report(state: FeasibilityAssessmentState) -> FeasibilityReport:
     """Convert assessment state to response report."""
     return FeasibilityReport(
@@ -99,5 +213,7 @@ def convert_state_to_report(state: FeasibilityAssessmentState) -> FeasibilityRep
         key_risks=state.key_risks,
         recommendations=state.recommendations,
         detailed_report=state.detailed_report or "Report generation in progress",
-        assessment_timestamp=state.final_score and __import__('datetime').datetime.now().isoformat()
+        assessment_timestamp=state.final_score and __import__('datetime').datetime.now().isoformat(),
+        stage_timings=state.stage_timings,
+        degraded_stages=state.degraded_stages,
     )
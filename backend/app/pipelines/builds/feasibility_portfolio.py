@@ -0,0 +1,249 @@
+"""Portfolio mode: assess many structured projects in one run.
+
+Work that can be shared across the portfolio is done once for all rows:
+- ML prediction is one vectorized model call over every project
+- search queries are de-duplicated, embedded in batches and sent to Qdrant
+  as batch queries
+The per-project LLM assessment then runs under a bounded pool, and each
+project's result is emitted as soon as it finishes (NDJSON in the API/CLI).
+"""
+
+import asyncio
+import csv
+import io
+import logging
+import os
+import time
+from typing import Any, AsyncGenerator, Dict, List, Tuple
+
+from pydantic import ValidationError
+
+from app.schemas.feasibility_new import (
+    StructuredFeasibilityInput,
+    FeasibilityAssessmentState,
+    FeasibilityPrediction,
+    RelevantPaper,
+)
+from app.pipelines.builds.feasibility_pipeline_new import (
+    convert_state_to_report,
+    get_cached_report,
+    cache_report,
+    is_cacheable,
+)
+from app.pipelines.builds.feasibility_structured_streaming import report_to_result
+from app.pipelines.nodes.feasibility_assess_new import unified_assessment_node
+from app.pipelines.nodes.feasibility_report_new import generate_feasibility_report_node
+from app.services.feasibility_predictor import get_predictor
+from app.services.semantic_search import get_search_service
+from app.utils.workers import run_in_worker
+
+logger = logging.getLogger(__name__)
+
+# Projects assessed by the LLM at once (acall_llm's global limiter still applies)
+PORTFOLIO_MAX_CONCURRENCY = int(os.getenv("PORTFOLIO_MAX_CONCURRENCY", "4"))
+PORTFOLIO_MAX_ROWS = int(os.getenv("PORTFOLIO_MAX_ROWS", "1000"))
+
+# CSV columns holding lists, written as "item one; item two"
+LIST_FIELDS = ("key_challenges", "key_opportunities")
+
+# (CSV row number, validated input)
+PortfolioRow = Tuple[int, StructuredFeasibilityInput]
+
+
+def parse_portfolio_csv(text: str) -> Tuple[List[PortfolioRow], List[Dict[str, Any]]]:
+    """
+    Parse a portfolio CSV whose columns are StructuredFeasibilityInput fields.
+    
+    Empty cells fall back to the field default, list fields are split on ';'
+    and rows without a project_id get "row_<n>".
+    
+    Returns:
+        (valid rows, error records for rows that failed validation)
+    """
+    rows: List[PortfolioRow] = []
+    errors: List[Dict[str, Any]] = []
+    
+    for row_number, record in enumerate(csv.DictReader(io.StringIO(text)), start=1):
+        values = {
+            key.strip(): value.strip()
+            for key, value in record.items()
+            if key and isinstance(value, str) and value.strip()
+        }
+        for field in LIST_FIELDS:
+            if field in values:
+                values[field] = [item.strip() for item in values[field].split(";") if item.strip()]
+        values.setdefault("project_id", f"row_{row_number}")
+        
+        try:
+            rows.append((row_number, StructuredFeasibilityInput(**values)))
+        except ValidationError as e:
+            fields = ", ".join(".".join(str(loc) for loc in err["loc"]) for err in e.errors())
+            errors.append({
+                "type": "error",
+                "row": row_number,
+                "project_id": values["project_id"],
+                "error": f"Invalid fields: {fields}",
+            })
+    
+    return rows, errors
+
+
+def _predict_all(inputs: List[StructuredFeasibilityInput]) -> List[FeasibilityPrediction]:
+    """Blocking vectorized ML inference for the whole portfolio."""
+    return get_predictor().predict_batch(inputs)
+
+
+def _search_all(inputs: List[StructuredFeasibilityInput]) -> List[List[RelevantPaper]]:
+    """Blocking batched embedding + Qdrant queries for the whole portfolio."""
+    return get_search_service().search_papers_batch(inputs, top_k=5)
+
+
+async def _shared_stages(inputs: List[StructuredFeasibilityInput]):
+    """
+    Run ML prediction and paper search once for every input, in parallel.
+    
+    Each stage returns (results, seconds, degraded stages): the stage's name
+    when it failed and every project got the fallback, or when the model
+    was unavailable and the scores are heuristic.
+    """
+    async def predict():
+        started = time.perf_counter()
+        degraded = []
+        try:
+            predictions = await run_in_worker(_predict_all, inputs)
+            if any(p.fallback for p in predictions):
+                # Heuristic scores: the model was unavailable or failed
+                degraded = ["ml_prediction"]
+            predictions = [
+                FeasibilityPrediction(
+                    ml_score=p.ml_score,
+                    confidence=p.confidence,
+                    risk_indicators=p.risk_indicators
+                )
+                for p in predictions
+            ]
+        except Exception as e:
+            logger.error(f"[Portfolio] ML prediction error: {e}")
+            # Fallback: use neutral score
+            predictions = [
+                FeasibilityPrediction(ml_score=50.0, confidence=0.5, risk_indicators=["ML prediction unavailable"])
+                for _ in inputs
+            ]
+            degraded = ["ml_prediction"]
+        return predictions, time.perf_counter() - started, degraded
+    
+    async def search():
+        started = time.perf_counter()
+        degraded = []
+        try:
+            papers = await run_in_worker(_search_all, inputs)
+        except Exception as e:
+            logger.error(f"[Portfolio] Semantic search error: {e}")
+            papers = [[] for _ in inputs]
+            degraded = ["semantic_search"]
+        return papers, time.perf_counter() - started, degraded
+    
+    return await asyncio.gather(predict(), search())
+
+
+async def run_feasibility_portfolio(
+    rows: List[PortfolioRow],
+    errors: List[Dict[str, Any]] = None,
+    concurrency: int = PORTFOLIO_MAX_CONCURRENCY,
+    refresh: bool = False,
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """
+    Assess every project and yield one record per project as it finishes.
+    
+    Records are {"type": "result", "row", "project_id", "cached", ...report}
+    or {"type": "error", "row", "project_id", "error"}, followed by a final
+    {"type": "summary", ...} record.
+    """
+    started = time.perf_counter()
+    errors = list(errors or [])
+    total = len(rows) + len(errors)
+    succeeded = 0
+    cached_count = 0
+    
+    print(f"\n[Portfolio] {len(rows)} projects ({len(errors)} invalid rows), concurrency {concurrency}")
+    for error in errors:
+        yield error
+    
+    # Identical projects assessed before are answered from the report cache
+    pending: List[PortfolioRow] = []
+    for row, input_data in rows:
+        cached = None if refresh else get_cached_report(input_data)
+        if cached is None:
+            pending.append((row, input_data))
+            continue
+        succeeded += 1
+        cached_count += 1
+        yield {"type": "result", "row": row, "project_id": input_data.project_id, "cached": True, **report_to_result(cached)}
+    
+    if pending:
+        inputs = [input_data for _, input_data in pending]
+        (predictions, predict_time, predict_degraded), (papers, search_time, search_degraded) = await _shared_stages(inputs)
+        print(f"[Portfolio] Shared stages: ML prediction {predict_time:.2f}s, semantic search {search_time:.2f}s")
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def assess(row: int, input_data: StructuredFeasibilityInput,
+                         prediction: FeasibilityPrediction, project_papers: List[RelevantPaper]):
+            async with semaphore:
+                try:
+                    state = FeasibilityAssessmentState(
+                        input_data=input_data,
+                        ml_prediction=prediction,
+                        relevant_papers=project_papers,
+                        stage_timings={"ml_prediction": predict_time, "semantic_search": search_time},
+                        degraded_stages=predict_degraded + search_degraded,
+                    )
+                    state = await unified_assessment_node(state)
+                    state = generate_feasibility_report_node(state)
+                    return row, input_data, state, None
+                except Exception as e:
+                    logger.error(f"[Portfolio] Row {row} failed: {e}", exc_info=True)
+                    return row, input_data, None, str(e)
+        
+        tasks = [
+            asyncio.create_task(assess(row, input_data, prediction, project_papers))
+            for (row, input_data), prediction, project_papers in zip(pending, predictions, papers)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                row, input_data, state, error = await next_done
+                if error is not None:
+                    errors.append({"type": "error", "row": row, "project_id": input_data.project_id, "error": error})
+                    yield errors[-1]
+                    continue
+                
+                report = convert_state_to_report(state)
+                # Don't pin fallback results (failed ML/search/LLM stage) in the cache
+                if is_cacheable(state):
+                    cache_report(input_data, report)
+                succeeded += 1
+                print(f"[Portfolio] ✓ Row {row} ({input_data.project_id}): {report.final_score}/100")
+                yield {"type": "result", "row": row, "project_id": input_data.project_id, "cached": False, **report_to_result(report)}
+        finally:
+            # Client went away or the consumer stopped early
+            for task in tasks:
+                task.cancel()
+    
+    elapsed = time.perf_counter() - started
+    print(f"[Portfolio] Done: {succeeded} assessed ({cached_count} cached), {len(errors)} failed in {elapsed:.2f}s")
+    yield {
+        "type": "summary",
+        "total": total,
+        "succeeded": succeeded,
+        "cached": cached_count,
+        "failed": len(errors),
+        "elapsed": round(elapsed, 3),
+    }
+
+
+__all__ = [
+    "PORTFOLIO_MAX_CONCURRENCY",
+    "PORTFOLIO_MAX_ROWS",
+    "parse_portfolio_csv",
+    "run_feasibility_portfolio",
+]
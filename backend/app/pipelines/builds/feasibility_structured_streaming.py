@@ -0,0 +1,152 @@
+"""Streaming runner for the structured (ML-based) feasibility pipeline.
+
+Shared by the feasibility SSE routes and the background job workers:
+answers from the persisted result store or the report cache when possible,
+otherwise streams real per-node progress and persists the new report.
+"""
+
+from typing import AsyncGenerator
+from app.schemas.feasibility_new import StructuredFeasibilityInput, FeasibilityAssessmentState
+from app.pipelines.builds.feasibility_pipeline_new import (
+    stream_feasibility_assessment,
+    convert_state_to_report,
+    get_cached_report,
+    cache_report,
+    feasibility_cache_key,
+    is_cacheable,
+)
+from app.services.result_store import FEASIBILITY, load_current_result, save_result
+from app.utils.streaming import format_status, format_complete
+
+
+def print_report(report, show_risks: bool = False) -> None:
+    """Print a feasibility report summary to the console."""
+    print("\n" + "-" * 80)
+    print("RESULTS")
+    print("-" * 80)
+    print(f"✓ Assessment Complete!")
+    print(f"  Final Score: {report.final_score}/100")
+    print(f"  Status: {report.viability_status}")
+    print(f"  ML Score: {report.ml_score:.1f}/100 (Confidence: {report.ml_confidence:.0%})")
+    
+    print("\nDimension Scores:")
+    print(f"  Technical:  {report.technical_score}/100")
+    print(f"  Resource:   {report.resource_score}/100")
+    print(f"  Skills:     {report.skills_score}/100")
+    print(f"  Scope:      {report.scope_score}/100")
+    print(f"  Risk:       {report.risk_score}/100")
+    
+    if report.relevant_papers:
+        print(f"\nRelevant Papers ({len(report.relevant_papers)} found):")
+        for i, paper in enumerate(report.relevant_papers[:3], 1):
+            print(f"  {i}. {paper.title[:60]}...")
+            print(f"     Relevance: {paper.relevance_score:.2f}")
+    
+    if show_risks and report.key_risks:
+        print("\nKey Risks:")
+        for i, risk in enumerate(report.key_risks, 1):
+            print(f"  {i}. {risk}")
+    
+    if show_risks and report.recommendations:
+        print("\nRecommendations:")
+        for i, rec in enumerate(report.recommendations, 1):
+            print(f"  {i}. {rec}")
+    
+    if report.stage_timings:
+        print("\nStage Timings:")
+        for stage, seconds in report.stage_timings.items():
+            print(f"  {stage}: {seconds:.2f}s")
+    
+    print("\n" + "=" * 80)
+    print("ASSESSMENT COMPLETE ✓")
+    print("=" * 80 + "\n")
+
+
+def report_to_result(report) -> dict:
+    """Build the `complete` event payload sent to the frontend."""
+    return {
+        "final_score": report.final_score,
+        "viability_status": report.viability_status,
+        "ml_score": report.ml_score,
+        "ml_confidence": report.ml_confidence,
+        "technical_score": report.technical_score,
+        "resource_score": report.resource_score,
+        "skills_score": report.skills_score,
+        "scope_score": report.scope_score,
+        "risk_score": report.risk_score,
+        "relevant_papers": [{
+            "title": p.title,
+            "summary": p.summary[:200] if len(p.summary) > 200 else p.summary,
+            "link": p.link,
+            "relevance_score": p.relevance_score
+        } for p in report.relevant_papers],
+        "explanation": report.explanation,
+        "key_risks": report.key_risks,
+        "recommendations": report.recommendations,
+        "detailed_report": report.detailed_report,
+        "assessment_timestamp": report.assessment_timestamp,
+        "stage_timings": report.stage_timings,
+        "degraded_stages": report.degraded_stages,
+    }
+
+
+async def run_structured_feasibility_streaming(
+    structured_input: StructuredFeasibilityInput,
+    show_risks: bool = False,
+    refresh: bool = False,
+    owner_key: str = None,
+    extra: dict = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Run the feasibility graph and yield SSE events as its nodes actually
+    start and finish, followed by the `complete` event with the report.
+    
+    Unless `refresh` is set, a result persisted for `owner_key` from the same
+    inputs, or an identical earlier input in the report cache, is returned
+    immediately. New results are persisted under `owner_key`.
+    """
+    inputs_hash = feasibility_cache_key(structured_input)
+    extra = extra or {}
+    
+    if not refresh:
+        stored = await load_current_result(FEASIBILITY, owner_key, inputs_hash) if owner_key else None
+        if stored is not None:
+            print("\n✓ Returning stored assessment")
+            yield format_status("Loaded saved assessment", progress=100, stage="stored")
+            yield format_complete({**stored, "cached": True})
+            return
+        
+        cached = get_cached_report(structured_input)
+        if cached is not None:
+            print("\n✓ Returning cached assessment")
+            print_report(cached, show_risks=show_risks)
+            result_data = {**report_to_result(cached), **extra}
+            if owner_key:
+                await save_result(FEASIBILITY, owner_key, inputs_hash, result_data)
+            yield format_status("Loaded previous assessment", progress=100, stage="cached")
+            yield format_complete({**result_data, "cached": True})
+            return
+    
+    print("\nStreaming stages:")
+    yield format_status("Starting feasibility assessment...", progress=0, stage="start")
+    
+    stream = stream_feasibility_assessment(structured_input)
+    async for event in stream:
+        yield event
+    
+    assessment_state = FeasibilityAssessmentState(**stream.final_state)
+    report = convert_state_to_report(assessment_state)
+    result_data = {**report_to_result(report), **extra}
+    # Don't pin fallback results (failed ML/search/LLM stage) in the cache or the store
+    if is_cacheable(assessment_state):
+        cache_report(structured_input, report)
+        if owner_key:
+            await save_result(FEASIBILITY, owner_key, inputs_hash, result_data)
+    else:
+        print(f"\n! Degraded assessment ({', '.join(assessment_state.degraded_stages) or 'incomplete'}): not cached")
+    print_report(report, show_risks=show_risks)
+    
+    yield format_complete({**result_data, "cached": False})
+
+
+__all__ = ["print_report", "report_to_result", "run_structured_feasibility_streaming"]
@@ -1,14 +1,21 @@
 from langgraph.graph import StateGraph, END
+import asyncio
 import sys
 from pathlib import Path
 
 from app.schemas.research_state import ResearchState
 from app.schemas.intermediate import IntermediateState
 from app.pipelines.nodes.llm import research_llm_router_node
-from app.pipelines.builds.scoping import create_graph as create_refined_graph
+from app.pipelines.registry import get_graph
+from app.pipelines.builds.scoping import ascope_document
 
 
-def _debug_router_node(state: ResearchState) -> ResearchState:
+async def _router_node(state: ResearchState) -> ResearchState:
+	"""Run the enrichment router; its HTTP fan-out is async on the shared client."""
+	return await research_llm_router_node(state)
+
+
+async def _debug_router_node(state: ResearchState) -> ResearchState:
 	"""Wrapper around the LLM router adding debug print statements.
 
 	Prints before/after snapshots so you can verify execution steps.
@@ -24,7 +31,7 @@ def _debug_router_node(state: ResearchState) -> ResearchState:
 			f"[ResearchGraph] Summary chars={len(interm.summary or '')}, consolidated_present={bool(state.consolidated_research)}"
 		)
 
-	state = research_llm_router_node(state)
+	state = await _router_node(state)
 
 	# After enrichment
 	print(
@@ -46,20 +53,20 @@ def create_research_graph(debug: bool = True):
 	Assumes `ResearchState.intermediate` already populated by previous pipeline.
 	"""
 	graph = StateGraph(ResearchState)
-	graph.add_node("route_and_arrange", _debug_router_node if debug else research_llm_router_node)
+	graph.add_node("route_and_arrange", _debug_router_node if debug else _router_node)
 	graph.set_entry_point("route_and_arrange")
 	graph.add_edge("route_and_arrange", END)
 	return graph.compile()
 
 
-def run_research_enrichment(state: ResearchState, debug: bool = True) -> ResearchState:
+async def arun_research_enrichment(state: ResearchState, debug: bool = True) -> ResearchState:
 	"""Run enrichment & synthesis on an already prepared ResearchState with optional debug prints.
 
 	Handles LangGraph returning a dict by rehydrating into `ResearchState`.
 	"""
 	print("[ResearchGraph] Starting enrichment run (debug=%s)" % debug)
-	graph = create_research_graph(debug=debug)
-	result = graph.invoke(state)
+	graph = get_graph("research_debug" if debug else "research")
+	result = await graph.ainvoke(state)
 	if isinstance(result, dict):
 		# LangGraph compiled graphs often return a plain dict; reconstruct model.
 		try:
@@ -74,14 +81,19 @@ def run_research_enrichment(state: ResearchState, debug: bool = True) -> Researc
 	return final_state
 
 
-def run_full_research(file_path: str, debug: bool = True) -> ResearchState:
+def run_research_enrichment(state: ResearchState, debug: bool = True) -> ResearchState:
+	"""Synchronous entry point for scripts; see `arun_research_enrichment`."""
+	return asyncio.run(arun_research_enrichment(state, debug=debug))
+
+
+async def arun_full_research(file_path: str, debug: bool = True) -> ResearchState:
 	"""Run refined summary pipeline then enrichment, handling dict returns.
 
 	Rehydrates dict output from refined graph into `IntermediateState`.
 	"""
 	print(f"[MainResearch] Starting full research pipeline for: {file_path}")
-	refined_graph = create_refined_graph()
-	refined_result = refined_graph.invoke(IntermediateState(file_path=file_path))
+	# Documents scoped before (same bytes) are served from their stored artifacts
+	refined_result = await ascope_document(file_path)
 	if isinstance(refined_result, dict):
 		try:
 			intermediate = IntermediateState(**refined_result)
@@ -102,14 +114,20 @@ def run_full_research(file_path: str, debug: bool = True) -> ResearchState:
 		intermediate = refined_result
 	print("[MainResearch] Refined pipeline complete. Summary chars=", len(intermediate.summary or ""))
 	state = ResearchState(intermediate=intermediate)
-	state = run_research_enrichment(state, debug=debug)
+	state = await arun_research_enrichment(state, debug=debug)
 	print("[MainResearch] Completed enrichment. Consolidated chars=", len(state.consolidated_research or ""))
 	return state
 
 
+def run_full_research(file_path: str, debug: bool = True) -> ResearchState:
+	"""Synchronous entry point for scripts; see `arun_full_research`."""
+	return asyncio.run(arun_full_research(file_path, debug=debug))
+
+
 def _print_final(state: ResearchState):
 	print("\n========== FINAL RESEARCH OUTPUT ==========")
-	print("Source Used: ", "wiki" if state.wiki_summary else ("ddg" if state.ddg_results else "unknown"))
+	sources = [name for name, used in (("wiki", state.wiki_summary), ("ddg", state.ddg_results)) if used]
+	print("Sources Used: ", ", ".join(sources) or "unknown")
 	print("Domain: ", state.intermediate.domain)
 	print("Problem: ", state.intermediate.problem_statement)
 	print("Goals: ", ", ".join(state.intermediate.goals or []))
@@ -144,6 +162,12 @@ def _print_final(state: ResearchState):
 # 	_print_final(final_state)
 
 
-__all__ = ["create_research_graph", "run_research_enrichment", "run_full_research"]
+__all__ = [
+	"create_research_graph",
+	"arun_research_enrichment",
+	"run_research_enrichment",
+	"arun_full_research",
+	"run_full_research",
+]
 
 
@@ -2,20 +2,24 @@
 
 Flow:
  1. scoping    -> runs existing refined summary graph to populate IntermediateState
+                  (reused from stored artifacts when the same document was scoped before)
  2. research   -> runs enrichment (wiki/ddg + synthesis) to produce ResearchState
  3. roadmap    -> generates final roadmap text using consolidated research
 
 Returns a CombinedState; helper converts to RoadmapPipelineOutput.
+Nodes are async and the graph is driven with `ainvoke`.
 """
 
+import asyncio
 from typing import Optional
 from langgraph.graph import StateGraph, END
 
 from app.schemas.intermediate import IntermediateState, RoadmapPipelineOutput
 from app.schemas.research_state import ResearchState
-from app.pipelines.builds.scoping import create_graph as create_scoping_graph
-from app.pipelines.builds.researcher import run_research_enrichment
-from app.services.roadmap_generator import generate_roadmap
+from app.pipelines.registry import get_graph
+from app.pipelines.builds.scoping import ascope_document
+from app.pipelines.builds.researcher import arun_research_enrichment
+from app.services.roadmap_generator import agenerate_roadmap, emit_roadmap_section
 
 
 class CombinedState(IntermediateState):
@@ -24,16 +28,11 @@ class CombinedState(IntermediateState):
     roadmap: Optional[str] = None
 
 
-def _scoping_node(state: CombinedState) -> CombinedState:
+async def _scoping_node(state: CombinedState) -> CombinedState:
     """Run the existing scoping graph starting from current state's file_path/raw_text."""
     print("[Roadmap] >> scoping: starting (file_path=", state.file_path, ")")
-    scoping = create_scoping_graph()
-    # Invoke with a fresh IntermediateState carrying file_path/raw_text (others ignored initially)
-    start = IntermediateState(file_path=state.file_path, raw_text=state.raw_text)
-    result = scoping.invoke(start)
-    # result may be dict if graph compiled; normalize
-    if isinstance(result, dict):
-        result = IntermediateState(**result)
+    # Documents scoped before (same bytes) are served from their stored artifacts
+    result = await ascope_document(state.file_path, state.raw_text)
     # Copy fields back onto combined state
     for field in [
         "raw_text",
@@ -57,7 +56,7 @@ def _scoping_node(state: CombinedState) -> CombinedState:
     return state
 
 
-def _research_node(state: CombinedState) -> CombinedState:
+async def _research_node(state: CombinedState) -> CombinedState:
     """Run enrichment + synthesis using ResearchState wrapping current intermediate."""
     print("[Roadmap] >> research: preparing enrichment (has_summary=", bool(state.summary), ")")
     if not state.summary:
@@ -72,7 +71,7 @@ def _research_node(state: CombinedState) -> CombinedState:
         key_topics=state.key_topics,
         summary=state.summary,
     ))
-    research_state = run_research_enrichment(research_state, debug=False)
+    research_state = await arun_research_enrichment(research_state, debug=False)
     state.research = research_state
     print(
         "[Roadmap] << research: wiki_present=", bool(getattr(research_state, "wiki_summary", None)),
@@ -83,7 +82,7 @@ def _research_node(state: CombinedState) -> CombinedState:
     return state
 
 
-def _roadmap_node(state: CombinedState) -> CombinedState:
+async def _roadmap_node(state: CombinedState) -> CombinedState:
     """Generate roadmap using all available research layers."""
     print("[Roadmap] >> roadmap: generating (has_research=", bool(state.research), ")")
     llm_report = None
@@ -96,7 +95,7 @@ def _roadmap_node(state: CombinedState) -> CombinedState:
     if not (llm_report or consolidated or summary):
         print("[Roadmap] !! roadmap: skipped (no inputs available)")
         return state
-    roadmap = generate_roadmap(llm_report, consolidated, summary)
+    roadmap = await agenerate_roadmap(llm_report, consolidated, summary, on_section=emit_roadmap_section)
     state.roadmap = roadmap.strip() if isinstance(roadmap, str) else roadmap
     print(
         "[Roadmap] << roadmap: output_len=", len(state.roadmap or ""),
@@ -126,11 +125,11 @@ def create_roadmap_graph():
     return graph.compile()
 
 
-def run_roadmap_pipeline(file_path: str) -> RoadmapPipelineOutput:
-    graph = create_roadmap_graph()
+async def arun_roadmap_pipeline(file_path: str) -> RoadmapPipelineOutput:
+    graph = get_graph("roadmap")
     initial = CombinedState(file_path=file_path)
     print("[Roadmap] START pipeline")
-    result = graph.invoke(initial)
+    result = await graph.ainvoke(initial)
     # If result is dict (compiled graph), reconstruct CombinedState
     if isinstance(result, dict):
         result = CombinedState(**result)
@@ -146,7 +145,12 @@ def run_roadmap_pipeline(file_path: str) -> RoadmapPipelineOutput:
     )
 
 
-__all__ = ["create_roadmap_graph", "run_roadmap_pipeline", "CombinedState"]
+def run_roadmap_pipeline(file_path: str) -> RoadmapPipelineOutput:
+    """Synchronous entry point for scripts; see `arun_roadmap_pipeline`."""
+    return asyncio.run(arun_roadmap_pipeline(file_path))
+
+
+__all__ = ["create_roadmap_graph", "arun_roadmap_pipeline", "run_roadmap_pipeline", "CombinedState"]
 
 
 if __name__ == "__main__":
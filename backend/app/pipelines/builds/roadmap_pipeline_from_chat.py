@@ -2,34 +2,69 @@
 
 Flow:
  1. chat agent   -> runs existing chat agent to gather/refine project info
+                    (skipped when the session's stored snapshot is current)
  2. research     -> runs enrichment (wiki/ddg + synthesis)
  3. roadmap      -> generates final roadmap text using consolidated research
 
 Returns a ChatRoadmapState with refined summary, research, and roadmap.
+
+With an `owner_key` the previous run's artifacts are loaded first and each
+stage whose inputs did not change is reused (see roadmap_artifacts).
 """
 
-from typing import Optional
+import asyncio
+from typing import Any, Dict, List, Optional
 from langgraph.graph import StateGraph, END
 
 from app.schemas.intermediate import IntermediateState
 from app.schemas.research_state import ResearchState
-from app.pipelines.builds.chat_agent import create_chat_graph, ChatState
-from app.pipelines.builds.researcher import run_research_enrichment
-from app.services.roadmap_generator import generate_roadmap
+from app.pipelines.builds.chat_agent import ChatState
+from app.pipelines.registry import get_graph
+from app.pipelines.builds.researcher import arun_research_enrichment
+from app.services.roadmap_generator import agenerate_roadmap, emit_roadmap_section
+from app.services.roadmap_artifacts import (
+    RoadmapArtifacts,
+    reusable_fields,
+    reusable_research,
+    build_artifacts,
+    load_artifacts,
+    save_artifacts,
+)
 
 
 class ChatRoadmapState(ChatState):
     """Extend ChatState with research and roadmap output."""
     research: Optional[ResearchState] = None
     roadmap: Optional[str] = None
+    # Fields came from a chat_session_states snapshot newer than every message
+    snapshot_current: bool = False
+    # Messages arrived after the snapshot: the chat agent must extract again
+    reextract: bool = False
+    # Incremental regeneration
+    previous: Optional[RoadmapArtifacts] = None
+    sections: Dict[str, Dict[str, str]] = {}
+    reused_stages: List[str] = []
 
 
-def _chat_agent_node(state: ChatRoadmapState) -> ChatRoadmapState:
+async def _chat_agent_node(state: ChatRoadmapState) -> ChatRoadmapState:
     """Run the chat agent to refine project information."""
     print("[Roadmap From Chat] >> chat_agent: starting conversation")
     
-    chat_graph = create_chat_graph()
-    chat_state = chat_graph.invoke(state)
+    if state.snapshot_current and state.summary:
+        state.reused_stages = state.reused_stages + ["chat_agent"]
+        print("[Roadmap From Chat] << chat_agent: using stored session snapshot")
+        return state
+    
+    fields = None if state.reextract else reusable_fields(state.previous, state.memory_text)
+    if fields:
+        for name, value in fields.items():
+            setattr(state, name, value)
+        state.reused_stages = state.reused_stages + ["chat_agent"]
+        print("[Roadmap From Chat] << chat_agent: reused (chat unchanged)")
+        return state
+    
+    chat_graph = get_graph("chat")
+    chat_state = await chat_graph.ainvoke(state)
     
     if isinstance(chat_state, dict):
         chat_state = ChatState(**chat_state)
@@ -55,13 +90,20 @@ def _chat_agent_node(state: ChatRoadmapState) -> ChatRoadmapState:
     return state
 
 
-def _research_node(state: ChatRoadmapState) -> ChatRoadmapState:
+async def _research_node(state: ChatRoadmapState) -> ChatRoadmapState:
     """Run enrichment + synthesis using refined summary from chat."""
     print("[Roadmap From Chat] >> research: preparing enrichment (has_summary=", bool(state.summary), ")")
     
     if not state.summary:
         return state  # cannot enrich without summary
     
+    research_state = reusable_research(state.previous, state)
+    if research_state is not None:
+        state.research = research_state
+        state.reused_stages = state.reused_stages + ["research"]
+        print("[Roadmap From Chat] << research: reused (research inputs unchanged)")
+        return state
+    
     research_state = ResearchState(intermediate=IntermediateState(
         raw_text=state.summary,
         problem_statement=state.problem_statement,
@@ -72,7 +114,7 @@ def _research_node(state: ChatRoadmapState) -> ChatRoadmapState:
         summary=state.summary,
     ))
     
-    research_state = run_research_enrichment(research_state, debug=False)
+    research_state = await arun_research_enrichment(research_state, debug=False)
     state.research = research_state
     
     print(
@@ -82,7 +124,7 @@ def _research_node(state: ChatRoadmapState) -> ChatRoadmapState:
     return state
 
 
-def _roadmap_node(state: ChatRoadmapState) -> ChatRoadmapState:
+async def _roadmap_node(state: ChatRoadmapState) -> ChatRoadmapState:
     """Generate roadmap using all available research layers."""
     print("[Roadmap From Chat] >> roadmap: generating (has_research=", bool(state.research), ")")
     
@@ -98,8 +140,14 @@ def _roadmap_node(state: ChatRoadmapState) -> ChatRoadmapState:
         print("[Roadmap From Chat] !! roadmap: skipped (no inputs available)")
         return state
     
-    roadmap = generate_roadmap(llm_report, consolidated, summary)
+    sections = dict(state.previous.sections) if state.previous else {}
+    roadmap = await agenerate_roadmap(
+        llm_report, consolidated, summary,
+        on_section=emit_roadmap_section,
+        sections_cache=sections,
+    )
     state.roadmap = roadmap.strip() if isinstance(roadmap, str) else roadmap
+    state.sections = sections
     
     print("[Roadmap From Chat] << roadmap: output_len=", len(state.roadmap or ""))
     return state
@@ -121,33 +169,58 @@ def create_roadmap_from_chat_graph():
     return graph.compile()
 
 
-def run_roadmap_from_chat(memory_text: str, message_pairs: int = 0) -> ChatRoadmapState:
+async def arun_roadmap_from_chat(
+    memory_text: str,
+    message_pairs: int = 0,
+    owner_key: Optional[str] = None,
+    snapshot: Optional[Dict[str, Any]] = None,
+    snapshot_current: bool = False,
+) -> ChatRoadmapState:
     """
     Generate roadmap from chat session context.
-    
+
     Args:
         memory_text: Chat context/memory from session
         message_pairs: Number of message pairs in conversation
-    
+        owner_key: Where the run's artifacts are kept; a later run for the
+            same owner only recomputes the stages whose inputs changed
+        snapshot: Stored session fields (problem_statement, domain, goals,
+            prerequisites, key_topics, initial_summary, summary); seeds the
+            chat agent
+        snapshot_current: The snapshot is newer than every message, so the
+            chat agent is skipped and the pipeline starts from it
+
     Returns:
         ChatRoadmapState with refined summary, research, and roadmap
     """
     print("[Roadmap From Chat] START pipeline")
     
-    graph = create_roadmap_from_chat_graph()
+    graph = get_graph("roadmap_from_chat")
     
     initial = ChatRoadmapState(
+        **(snapshot or {}),
         memory_text=memory_text,
         message_pairs=message_pairs,
+        snapshot_current=snapshot_current,
+        reextract=snapshot is not None and not snapshot_current,
+        previous=await load_artifacts(owner_key),
     )
     
-    result = graph.invoke(initial)
+    result = await graph.ainvoke(initial)
     
     if isinstance(result, dict):
         result = ChatRoadmapState(**result)
     
+    if result.roadmap:
+        await save_artifacts(owner_key, build_artifacts(memory_text, result, result.research, result.sections))
+    
     print(f"[Roadmap From Chat] END pipeline roadmap_len={len(result.roadmap or '')}")
     return result
 
 
-__all__ = ["create_roadmap_from_chat_graph", "run_roadmap_from_chat", "ChatRoadmapState"]
+def run_roadmap_from_chat(memory_text: str, message_pairs: int = 0) -> ChatRoadmapState:
+    """Synchronous entry point for scripts; see `arun_roadmap_from_chat`."""
+    return asyncio.run(arun_roadmap_from_chat(memory_text, message_pairs))
+
+
+__all__ = ["create_roadmap_from_chat_graph", "arun_roadmap_from_chat", "run_roadmap_from_chat", "ChatRoadmapState"]
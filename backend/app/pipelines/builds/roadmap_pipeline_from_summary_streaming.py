@@ -6,26 +6,51 @@ Flow:
  3. roadmap        -> generates final roadmap using consolidated research
 
 Uses a LangGraph for proper state management and streaming.
+
+With an `owner_key` the previous run's artifacts are loaded first and each
+stage whose inputs did not change is reused (see roadmap_artifacts).
 """
 
-from typing import Generator, Optional
+from typing import AsyncGenerator, Dict, List, Optional
 from langgraph.graph import StateGraph, END
 
 from app.schemas.intermediate import IntermediateState
 from app.schemas.research_state import ResearchState
-from app.pipelines.builds.researcher import run_research_enrichment
-from app.services.roadmap_generator import generate_roadmap
-from app.services.extract_fields import extract_fields_from_summary
-from app.utils.streaming import format_status, format_complete, format_error
+from app.pipelines.builds.researcher import arun_research_enrichment
+from app.services.roadmap_generator import agenerate_roadmap, emit_roadmap_section
+from app.services.roadmap_artifacts import (
+    RoadmapArtifacts,
+    reusable_fields,
+    reusable_research,
+    build_artifacts,
+    load_artifacts,
+    save_artifacts,
+)
+from app.services.extract_fields import aextract_fields_from_summary
+from app.pipelines.builds.roadmap_pipeline_streaming import roadmap_partial_state
+from app.pipelines.registry import get_graph
+from app.utils.streaming import GraphProgressStream, format_status, format_complete, format_error
+
+
+# Node -> (status message, progress % on completion)
+SUMMARY_ROADMAP_STAGES = {
+    "extract_fields": ("Extracting structured information from summary...", 35),
+    "research": ("Gathering additional research and context...", 75),
+    "roadmap": ("Generating implementation roadmap...", 95),
+}
 
 
 class SummaryCombinedState(IntermediateState):
     """Extended state for summary-based roadmap generation."""
     research: Optional[ResearchState] = None
     roadmap: Optional[str] = None
+    # Incremental regeneration
+    previous: Optional[RoadmapArtifacts] = None
+    sections: Dict[str, Dict[str, str]] = {}
+    reused_stages: List[str] = []
 
 
-def _extract_fields_node(state: SummaryCombinedState) -> SummaryCombinedState:
+async def _extract_fields_node(state: SummaryCombinedState) -> SummaryCombinedState:
     """Extract structured fields from the input summary text."""
     print("[Roadmap-Summary] >> extract_fields: starting")
     
@@ -33,9 +58,17 @@ def _extract_fields_node(state: SummaryCombinedState) -> SummaryCombinedState:
         print("[Roadmap-Summary] !! extract_fields: no summary provided")
         return state
     
+    fields = reusable_fields(state.previous, state.summary)
+    if fields:
+        for name in ("problem_statement", "domain", "goals", "prerequisites", "key_topics"):
+            setattr(state, name, fields.get(name))
+        state.reused_stages = state.reused_stages + ["extract_fields"]
+        print("[Roadmap-Summary] << extract_fields: reused (summary unchanged)")
+        return state
+    
     try:
         # Extract fields using the extract_fields service
-        extracted = extract_fields_from_summary(state.summary)
+        extracted = await aextract_fields_from_summary(state.summary)
         
         # Update state with extracted fields - with type validation
         if extracted.get("problem_statement"):
@@ -90,7 +123,7 @@ def _extract_fields_node(state: SummaryCombinedState) -> SummaryCombinedState:
     return state
 
 
-def _research_node(state: SummaryCombinedState) -> SummaryCombinedState:
+async def _research_node(state: SummaryCombinedState) -> SummaryCombinedState:
     """Run enrichment + synthesis using extracted fields."""
     print("[Roadmap-Summary] >> research: preparing enrichment")
     
@@ -98,6 +131,13 @@ def _research_node(state: SummaryCombinedState) -> SummaryCombinedState:
         print("[Roadmap-Summary] !! research: no summary to enrich")
         return state
     
+    research_state = reusable_research(state.previous, state)
+    if research_state is not None:
+        state.research = research_state
+        state.reused_stages = state.reused_stages + ["research"]
+        print("[Roadmap-Summary] << research: reused (research inputs unchanged)")
+        return state
+    
     try:
         # Create ResearchState wrapping the intermediate state
         research_state = ResearchState(intermediate=IntermediateState(
@@ -110,7 +150,7 @@ def _research_node(state: SummaryCombinedState) -> SummaryCombinedState:
         ))
         
         # Run enrichment with research
-        research_state = run_research_enrichment(research_state, debug=False)
+        research_state = await arun_research_enrichment(research_state, debug=False)
         state.research = research_state
         
         print(
@@ -127,7 +167,7 @@ def _research_node(state: SummaryCombinedState) -> SummaryCombinedState:
     return state
 
 
-def _roadmap_node(state: SummaryCombinedState) -> SummaryCombinedState:
+async def _roadmap_node(state: SummaryCombinedState) -> SummaryCombinedState:
     """Generate roadmap using research and summary."""
     print("[Roadmap-Summary] >> roadmap: generating")
     
@@ -145,8 +185,14 @@ def _roadmap_node(state: SummaryCombinedState) -> SummaryCombinedState:
             state.roadmap = "Error: Unable to generate roadmap (no summary provided)"
             return state
         
-        roadmap = generate_roadmap(llm_report, consolidated, summary)
+        sections = dict(state.previous.sections) if state.previous else {}
+        roadmap = await agenerate_roadmap(
+            llm_report, consolidated, summary,
+            on_section=emit_roadmap_section,
+            sections_cache=sections,
+        )
         state.roadmap = roadmap.strip() if isinstance(roadmap, str) else roadmap
+        state.sections = sections
         
         print(f"[Roadmap-Summary] << roadmap: generated ({len(state.roadmap or '')} chars)")
     except Exception as e:
@@ -173,17 +219,19 @@ def create_roadmap_from_summary_graph() -> StateGraph:
     return graph.compile()
 
 
-def run_roadmap_from_summary_streaming(summary: str) -> Generator[str, None, None]:
+async def run_roadmap_from_summary_streaming(
+    summary: str,
+    owner_key: Optional[str] = None,
+) -> AsyncGenerator[str, None]:
     """Run roadmap pipeline from text summary with streaming progress.
     
-    Emits coarse-grained stage progress so the frontend bar moves steadily:
-    - 0% start
-    - 15% extract_fields begin, 35% extract_fields done
-    - 55% research begin, 75% research done
-    - 90% roadmap begin, 100% complete
+    Progress advances as graph nodes finish: extract_fields 35%,
+    research 75%, roadmap 95%, then the completion payload.
     
     Args:
         summary: Text summary of the project
+        owner_key: Where the run's artifacts are kept; a later run for the
+            same owner only recomputes the stages whose inputs changed
     
     Yields:
         SSE-formatted event strings with progress updates
@@ -194,27 +242,20 @@ def run_roadmap_from_summary_streaming(summary: str) -> Generator[str, None, Non
         # Kickoff
         yield format_status("Starting roadmap generation pipeline...", progress=0, stage="init")
         
-        # Initialize state with the provided summary
-        state = SummaryCombinedState(summary=summary)
-        
-        # Extract fields
-        yield format_status("Extracting structured information from summary...", progress=15, stage="extract_fields")
-        state = _extract_fields_node(state)
-        yield format_status("Document analysis complete", progress=35, stage="extract_fields")
-        
-        # Research (only if we have a summary)
-        if state.summary:
-            yield format_status("Gathering additional research and context...", progress=55, stage="research")
-            state = _research_node(state)
-            yield format_status("Research gathering complete", progress=75, stage="research")
-        else:
-            yield format_status("Skipping research (no summary available)", progress=55, stage="research")
-        
-        # Roadmap generation
-        yield format_status("Generating implementation roadmap...", progress=90, stage="roadmap")
-        state = _roadmap_node(state)
+        previous = await load_artifacts(owner_key)
+        stream = GraphProgressStream(
+            get_graph("roadmap_from_summary"),
+            SummaryCombinedState(summary=summary, previous=previous),
+            stages=SUMMARY_ROADMAP_STAGES,
+            partial=roadmap_partial_state,
+        )
+        async for event in stream:
+            yield event
+        state = SummaryCombinedState(**stream.final_state)
         
         status = "success" if state.roadmap and "Error" not in state.roadmap else "warning"
+        if status == "success":
+            await save_artifacts(owner_key, build_artifacts(summary, state, state.research, state.sections))
         message = "Roadmap generated successfully!" if status == "success" else "Roadmap generation completed with warnings"
         
         result = {
@@ -226,6 +267,7 @@ def run_roadmap_from_summary_streaming(summary: str) -> Generator[str, None, Non
             "goals": state.goals or [],
             "prerequisites": state.prerequisites or [],
             "key_topics": state.key_topics or [],
+            "reused_stages": state.reused_stages,
         }
         
         print("[Roadmap-Summary Stream] Yielding complete event...")
@@ -1,56 +1,86 @@
 """Streaming version of roadmap pipeline that yields status updates.
 
-This module wraps the existing roadmap_pipeline and intercepts print statements
-to yield them as status updates for real-time frontend display.
+Runs the compiled roadmap graph in streaming mode so every node start and
+finish is forwarded to the frontend as it actually happens, with elapsed
+time and a small slice of the node's output.
 """
 
-from typing import Generator
-from app.pipelines.builds.roadmap_pipeline import (
-    CombinedState,
-    _scoping_node,
-    _research_node,
-    _roadmap_node,
-)
-from app.utils.streaming import format_status, format_complete, format_error
+from typing import Any, AsyncGenerator, Awaitable, Callable, Dict, Optional
+from app.pipelines.builds.roadmap_pipeline import CombinedState
+from app.pipelines.registry import get_graph
+from app.utils.streaming import GraphProgressStream, format_status, format_complete, format_error
 
 
-def run_roadmap_pipeline_streaming(file_path: str) -> Generator[str, None, None]:
+# Node -> (status message, progress % on completion)
+ROADMAP_STAGES = {
+    "scoping": ("Analyzing document and extracting key information...", 35),
+    "research": ("Gathering additional research and context...", 75),
+    "roadmap": ("Generating implementation roadmap...", 95),
+}
+
+
+def roadmap_partial_state(node: str, update: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Extract the client-visible part of a roadmap node's update."""
+    partial = _roadmap_node_partial(node, update)
+    if partial is not None and node in (update.get("reused_stages") or []):
+        # Stage skipped: its inputs did not change since the last run
+        partial["reused"] = True
+    return partial
+
+
+def _roadmap_node_partial(node: str, update: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if node in ("scoping", "extract_fields", "chat_agent"):
+        return {
+            "domain": update.get("domain"),
+            "problem_statement": update.get("problem_statement"),
+            "goals": update.get("goals") or [],
+            "key_topics": update.get("key_topics") or [],
+        }
+    if node == "research":
+        research = update.get("research")
+        if research is None:
+            return {"research_available": False}
+        return {
+            "research_available": True,
+            "wiki_present": bool(getattr(research, "wiki_summary", None)),
+            "ddg_results": len(getattr(research, "ddg_results", []) or []),
+        }
+    if node == "roadmap":
+        return {"roadmap_chars": len(update.get("roadmap") or "")}
+    return None
+
+
+async def run_roadmap_pipeline_streaming(
+    file_path: str,
+    on_complete: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+) -> AsyncGenerator[str, None]:
     """Run roadmap pipeline and yield status updates in SSE format.
 
-    Emits coarse-grained stage progress so the frontend bar moves steadily:
-    - 0% start
-    - 15% scoping begin, 35% scoping done
-    - 55% research begin, 75% research done
-    - 90% roadmap begin, 100% complete
+    Progress advances as graph nodes finish: scoping 35%, research 75%,
+    roadmap 95%, then 100% with the completion payload.
+
+    `on_complete` is awaited with the final payload of a successful run
+    before it is sent (used by the route to persist the roadmap).
     """
     try:
         # Kickoff
         yield format_status("Starting roadmap generation pipeline...", progress=0, stage="init")
 
-        state = CombinedState(file_path=file_path)
-
-        # Scoping
-        yield format_status("Analyzing document and extracting key information...", progress=15, stage="scoping")
-        state = _scoping_node(state)
-        yield format_status("Document analysis complete", progress=35, stage="scoping")
-
-        # Research (only if we have a summary)
-        if getattr(state, "summary", None):
-            yield format_status("Gathering additional research and context...", progress=55, stage="research")
-            state = _research_node(state)
-            yield format_status("Research gathering complete", progress=75, stage="research")
-        else:
-            yield format_status("Skipping research (no summary available)", progress=55, stage="research")
-
-        # Roadmap generation
-        yield format_status("Generating implementation roadmap...", progress=90, stage="roadmap")
-        state = _roadmap_node(state)
+        stream = GraphProgressStream(
+            get_graph("roadmap"),
+            CombinedState(file_path=file_path),
+            stages=ROADMAP_STAGES,
+            partial=roadmap_partial_state,
+        )
+        async for event in stream:
+            yield event
+        state = CombinedState(**stream.final_state)
 
         status = "success" if state.roadmap else "warning"
         message = "Roadmap generated successfully!" if state.roadmap else "Roadmap generation completed with warnings"
 
         # Final status and completion payload
-        yield format_status(message, progress=100, stage="complete")
+        yield format_status(message, progress=100, stage="complete", extra={"node_timings": stream.node_timings})
 
         final_result = {
             "status": status,
@@ -61,6 +91,9 @@ def run_roadmap_pipeline_streaming(file_path: str) -> Generator[str, None, None]
             "success": status == "success",
         }
 
+        if on_complete and final_result["success"]:
+            await on_complete(final_result)
+
         yield format_complete(final_result)
 
     except Exception as e:
@@ -69,4 +102,4 @@ def run_roadmap_pipeline_streaming(file_path: str) -> Generator[str, None, None]
         raise
 
 
-__all__ = ["run_roadmap_pipeline_streaming"]
+__all__ = ["ROADMAP_STAGES", "roadmap_partial_state", "run_roadmap_pipeline_streaming"]
@@ -1,21 +1,24 @@
+from typing import Optional
 from langgraph.graph import StateGraph, END
 from app.schemas.intermediate import IntermediateState
 from app.pipelines.nodes.extract_text import extract_text_node
 from app.pipelines.nodes.summarize_and_extract import summarize_and_extract_node
+from app.pipelines.registry import get_graph
+from app.services.document_artifacts import FIELD_NAMES, DocumentArtifacts, adocument_hash, aget_or_build
 
 
-def _extract_text_dbg(state: IntermediateState) -> IntermediateState:
+async def _extract_text_dbg(state: IntermediateState) -> IntermediateState:
     print("[Scoping] >> extract_text: starting (file_path=", state.file_path, ")")
     before_len = len(state.raw_text) if state.raw_text else 0
-    state = extract_text_node(state)
+    state = await extract_text_node(state)
     after_len = len(state.raw_text) if state.raw_text else 0
     print(f"[Scoping] << extract_text: raw_text_len {before_len} -> {after_len}")
     return state
 
 
-def _summarize_and_extract_dbg(state: IntermediateState) -> IntermediateState:
+async def _summarize_and_extract_dbg(state: IntermediateState) -> IntermediateState:
     print("[Scoping] >> summarize_and_extract: generating summary and extracting fields")
-    state = summarize_and_extract_node(state)
+    state = await summarize_and_extract_node(state)
     summary_len = len(state.summary) if state.summary else 0
     print(f"[Scoping] << summarize_and_extract: summary_len={summary_len}, domain={state.domain}, goals={len(state.goals or [])}")
     return state
@@ -29,4 +32,37 @@ def create_graph():
     graph.set_entry_point("extract_text")
     graph.add_edge("extract_text", "summarize_and_extract")
     graph.add_edge("summarize_and_extract", END)
-    return graph.compile()
\ No newline at end of file
+    return graph.compile()
+
+
+async def _run_scoping(start: IntermediateState) -> IntermediateState:
+    result = await get_graph("scoping").ainvoke(start)
+    # Compiled graphs return dicts; normalize
+    if isinstance(result, dict):
+        result = IntermediateState(**result)
+    return result
+
+
+async def ascope_document(file_path: Optional[str], raw_text: Optional[str] = None) -> IntermediateState:
+    """
+    Run scoping for a document, reusing the artifacts of earlier uploads of the same bytes.
+
+    Entry point for every pipeline that starts from a file: documents seen
+    before skip extraction and the summarize/extract LLM call, and concurrent
+    runs on the same document share one scoping run (see document_artifacts).
+    """
+    doc_hash = await adocument_hash(file_path)
+    if doc_hash is None:
+        return await _run_scoping(IntermediateState(file_path=file_path, raw_text=raw_text))
+
+    async def build(previous: Optional[DocumentArtifacts]) -> DocumentArtifacts:
+        # Text stored by a text-only request (e.g. /summarize/file) skips extraction
+        known_text = previous.text if previous and previous.text else raw_text
+        result = await _run_scoping(IntermediateState(file_path=file_path, raw_text=known_text))
+        return DocumentArtifacts(
+            text=result.raw_text,
+            fields={field: getattr(result, field) for field in FIELD_NAMES},
+        )
+
+    artifacts = await aget_or_build(doc_hash, build)
+    return IntermediateState(file_path=file_path, raw_text=artifacts.text, **artifacts.fields)
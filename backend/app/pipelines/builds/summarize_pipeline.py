@@ -4,6 +4,9 @@ import re
 from app.utils.extract import extract_text
 from app.services.summarize_research import summarize_research
 from app.schemas.intermediate import IntermediateState
+from app.services.long_document import LONG_DOC_MAX_CHARS, acondense_document, is_long_document
+from app.services.summarize_research import SUMMARY_INPUT_CHARS
+from app.utils.workers import run_in_worker
 
 
 def summarize_pipeline_from_file(file_path: str) -> str:
@@ -101,3 +104,20 @@ def summarize_pipeline_from_text(text: str) -> str:
     print("=" * 80 + "\n")
     
     return summary
+
+
+async def asummarize_pipeline_from_text(text: str) -> str:
+    """
+    Async variant of `summarize_pipeline_from_text` that covers long texts.
+    
+    Text beyond what the summary prompt reads is condensed with map-reduce
+    first when SUMMARY_MODE=auto (see app.services.long_document); text
+    beyond `LONG_DOC_MAX_CHARS` is dropped, as extraction does for files.
+    """
+    if len(text) > LONG_DOC_MAX_CHARS:
+        print(f"[Summarize] {len(text)} characters: truncating to {LONG_DOC_MAX_CHARS}")
+        text = text[:LONG_DOC_MAX_CHARS]
+    if is_long_document(text, SUMMARY_INPUT_CHARS):
+        print(f"[Summarize] {len(text)} characters: condensing with map-reduce first")
+        text = await acondense_document(text, SUMMARY_INPUT_CHARS)
+    return await run_in_worker(summarize_pipeline_from_text, text)
@@ -1,7 +1,7 @@
 import re
 import json
 from typing import Any, List
-from app.utils.llm import call_llm
+from app.utils.llm import acall_llm
 
 
 def _as_list(v: Any) -> List[str]:
@@ -15,7 +15,7 @@ def _as_list(v: Any) -> List[str]:
     return []
 
 
-def chat_extract_fields_node(state):
+async def chat_extract_fields_node(state):
     """Extract structured fields from conversational memory in `state.memory_text`."""
     memory_text = getattr(state, "memory_text", None) or ""
     prompt = f"""
@@ -33,7 +33,7 @@ Transcript:
 
 JSON only:
 """
-    raw = call_llm(prompt) or "{}"
+    raw = await acall_llm(prompt) or "{}"
     raw = re.sub(r"^```(?:json)?\s*|\s*```$", "", raw.strip(), flags=re.MULTILINE)
     m = re.search(r"\{[\s\S]*\}", raw)
     raw_json = m.group(0) if m else raw
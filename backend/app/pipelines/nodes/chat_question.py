@@ -1,8 +1,8 @@
 import re
-from app.utils.llm import call_llm
+from app.utils.llm import acall_llm
 
 
-def chat_generate_question_node(state):
+async def chat_generate_question_node(state):
     missing_fields = list(state.missing_fields or [])
     pairs = getattr(state, "message_pairs", 0) or 0
     attempt = max(1, min(3, pairs))
@@ -66,7 +66,7 @@ def chat_generate_question_node(state):
     f"{extra_template}"
 )
 
-    q = call_llm(prompt) or ""
+    q = await acall_llm(prompt) or ""
     q = re.sub(r"^```(?:.*)\n?|\n?```$", "", q.strip())
 
     if not q:
@@ -1,13 +1,19 @@
+from typing import Optional
+
 from app.schemas.research_state import ResearchState
-from app.utils.ddg import gather_ddg_supporting_text
+from app.utils.ddg import agather_ddg_supporting_text
+from app.utils.research_cache import agather_cached
+from app.utils.enrichment import flatten_contexts, project_query, rank_snippets
+
+DDG_MAX_RESULTS = 40
 
 
-def ddg_node(state: ResearchState) -> ResearchState:
+async def ddg_node(state: ResearchState) -> ResearchState:
 	"""Populate `ddg_results` with aggregated DuckDuckGo snippets.
 
 	Strategy:
-	  - Query DDG for each relevant field via the utility.
-	  - Flatten categorized contexts into a single ordered list (limited size).
+	  - Query DDG for each relevant field via the utility (concurrently).
+	  - Flatten categorized contexts into a single list ranked by relevance (limited size).
 	  - Initialize or extend `consolidated_research` with a short synthesized block.
 	"""
 	if not state.intermediate:
@@ -15,30 +21,30 @@ def ddg_node(state: ResearchState) -> ResearchState:
 
 	interm = state.intermediate
 
-	contexts = gather_ddg_supporting_text(
+	contexts = await agather_cached(
+		"ddg",
+		agather_ddg_supporting_text,
 		problem_statement=interm.problem_statement,
 		domain=interm.domain,
 		goals=interm.goals,
 		prerequisites=interm.prerequisites,
 		key_topics=interm.key_topics,
 	)
+	return apply_ddg_contexts(state, contexts)
+
+
+def apply_ddg_contexts(state: ResearchState, contexts: Optional[dict]) -> ResearchState:
+	"""Set `ddg_results` and append a DDG block to `consolidated_research`."""
 	if not contexts:
 		return state
 
-	ordered_keys = [
-		"domain_context",
-		"problem_context",
-		"goals_context",
-		"prerequisites_context",
-		"key_topics_context",
-	]
-
-	flat_snippets = []
-	for k in ordered_keys:
-		vals = contexts.get(k) or []
-		flat_snippets.extend(vals)
-		if len(flat_snippets) > 120:  # safety cap
-			break
+	# Most relevant first, duplicates and near-duplicates removed
+	ranked = rank_snippets(
+		flatten_contexts(contexts, "ddg"),
+		project_query(state.intermediate),
+		limit=DDG_MAX_RESULTS,
+	)
+	flat_snippets = [snippet.text for snippet in ranked]
 
 	state.ddg_results = flat_snippets
 
@@ -1,21 +1,26 @@
-from app.utils.extract import extract_text
+from app.utils.extract_pool import aextract_text
+from app.services.long_document import document_char_budget
 
 
 from app.schemas.intermediate import IntermediateState
 
 
-def extract_text_node(state: IntermediateState):
+async def extract_text_node(state: IntermediateState):
 
 
     # expects state.file_path to be set
+    # PDF/DOCX parsing runs in the extraction process pool (timeout, memory cap)
+    # text that is already known (stored document artifacts) is not extracted again
 
 
-    text = extract_text(state.file_path)
+    if state.raw_text:
+        return state
 
 
-    state.raw_text = text
+    text = await aextract_text(state.file_path, document_char_budget())
 
 
-    return state
+    state.raw_text = text
 
 
+    return state
@@ -1,198 +1,99 @@
 import re
-from app.utils.llm import call_llm
+import json
+from typing import Optional
+from app.utils.llm import call_llm, acall_llm
 from app.schemas.feasibility import FeasibilitySubScore
 
 
-def assess_technical_feasibility_node(state):
-    """Assess technical feasibility of the project."""
-    print("[Feasibility] Assessing technical feasibility...")
-    
-    prompt = f"""You are a technical expert. Quickly assess technical feasibility (0-100).
-
-Project: {state.refined_summary[:300]}
-Topics: {', '.join(state.key_topics) if state.key_topics else 'N/A'}
-
-Rate: Tech stack maturity, integration complexity, data needs.
+# dimension -> (expert role, context label, what to rate)
+DIMENSIONS = {
+    "technical": ("technical expert", "Topics", "Tech stack maturity, integration complexity, data needs."),
+    "resource": ("resource planner", "Domain", "Budget needs, infrastructure, licenses, tools availability."),
+    "skills": ("talent manager", "Topics", "Required expertise, learning curve, team gaps."),
+    "scope": ("project manager", "Problem", "Scope clarity, complexity, timeline realism, scope creep risk."),
+    "risk": ("risk analyst", "Topics", "Identified risks, dependencies, external volatility, mitigation strategies."),
+}
 
-JSON:
-{{"score": <0-100>, "explanation": "<1-2 sentences>", "recommendation": "<1 sentence>"}}"""
-    
-    raw = call_llm(prompt)
-    if not raw:
-        print("[Feasibility] LLM failed for technical assessment - skipping")
-        return state
-    
-    raw = re.sub(r"^```(?:json)?\s*|\s*```$", "", raw.strip(), flags=re.MULTILINE)
-    
-    try:
-        import json
-        # # Extract only the first JSON object if multiple exist
-        # json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', raw)
-        # if json_match:
-        #     raw = json_match.group(0)
-        data = json.loads(raw)
-        state.technical_feasibility = FeasibilitySubScore(
-            score=int(data.get("score", 0)),
-            explanation=str(data.get("explanation", "Unable to assess")),
-            recommendation=str(data.get("recommendation", ""))
-        )
-    except Exception as e:
-        print(f"[Feasibility] Error parsing technical assessment: {e}")
-    
-    return state
 
+def _dimension_prompt(dimension: str, state) -> str:
+    role, label, rate = DIMENSIONS[dimension]
+    if label == "Domain":
+        context = state.domain
+    elif label == "Problem":
+        context = state.problem_statement
+    else:
+        context = ', '.join(state.key_topics) if state.key_topics else 'N/A'
 
-def assess_resource_feasibility_node(state):
-    """Assess resource feasibility (budget, infrastructure, tools)."""
-    print("[Feasibility] Assessing resource feasibility...")
-    
-    prompt = f"""You are a resource planner. Quickly assess resource feasibility (0-100).
+    return f"""You are a {role}. Quickly assess {dimension} feasibility (0-100).
 
 Project: {state.refined_summary[:300]}
-Domain: {state.domain}
+{label}: {context}
 
-Rate: Budget needs, infrastructure, licenses, tools availability.
+Rate: {rate}
 
 JSON:
 {{"score": <0-100>, "explanation": "<1-2 sentences>", "recommendation": "<1 sentence>"}}"""
-    
-    raw = call_llm(prompt)
+
+
+def _parse_sub_score(dimension: str, raw: str) -> Optional[FeasibilitySubScore]:
     if not raw:
-        print("[Feasibility] LLM failed for resource assessment - skipping")
-        return state
-    
+        print(f"[Feasibility] LLM failed for {dimension} assessment - skipping")
+        return None
+
     raw = re.sub(r"^```(?:json)?\s*|\s*```$", "", raw.strip(), flags=re.MULTILINE)
-    
+
     try:
-        import json
-        # # Extract only the first JSON object if multiple exist
-        # json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', raw)
-        # if json_match:
-        #     raw = json_match.group(0)
         data = json.loads(raw)
-        state.resource_feasibility = FeasibilitySubScore(
+        return FeasibilitySubScore(
             score=int(data.get("score", 0)),
             explanation=str(data.get("explanation", "Unable to assess")),
             recommendation=str(data.get("recommendation", ""))
         )
     except Exception as e:
-        print(f"[Feasibility] Error parsing resource assessment: {e}")
-    
-    return state
+        print(f"[Feasibility] Error parsing {dimension} assessment: {e}")
+        return None
 
 
-def assess_skills_feasibility_node(state):
-    """Assess skills and team capability feasibility."""
-    print("[Feasibility] Assessing skills feasibility...")
-    
-    prompt = f"""You are a talent manager. Quickly assess skills feasibility (0-100).
+def _assess_dimension(dimension: str, state):
+    print(f"[Feasibility] Assessing {dimension} feasibility...")
+    sub_score = _parse_sub_score(dimension, call_llm(_dimension_prompt(dimension, state)))
+    if sub_score is not None:
+        setattr(state, f"{dimension}_feasibility", sub_score)
+    return state
 
-Project: {state.refined_summary[:300]}
-Topics: {', '.join(state.key_topics) if state.key_topics else 'N/A'}
 
-Rate: Required expertise, learning curve, team gaps.
+async def aassess_dimension(dimension: str, state) -> Optional[FeasibilitySubScore]:
+    """
+    Async variant used to score dimensions concurrently.
 
-JSON:
-{{"score": <0-100>, "explanation": "<1-2 sentences>", "recommendation": "<1 sentence>"}}"""
-    
-    raw = call_llm(prompt)
-    if not raw:
-        print("[Feasibility] LLM failed for skills assessment - skipping")
-        return state
-    
-    raw = re.sub(r"^```(?:json)?\s*|\s*```$", "", raw.strip(), flags=re.MULTILINE)
-    
-    try:
-        import json
-        # # Extract only the first JSON object if multiple exist
-        # json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', raw)
-        # if json_match:
-        #     raw = json_match.group(0)
-        data = json.loads(raw)
-        state.skills_feasibility = FeasibilitySubScore(
-            score=int(data.get("score", 0)),
-            explanation=str(data.get("explanation", "Unable to assess")),
-            recommendation=str(data.get("recommendation", ""))
-        )
-    except Exception as e:
-        print(f"[Feasibility] Error parsing skills assessment: {e}")
-    
-    return state
+    Returns the sub-score instead of mutating `state`, so several dimensions
+    can be assessed from the same state at once (each call goes through the
+    shared LLM limiter).
+    """
+    print(f"[Feasibility] Assessing {dimension} feasibility...")
+    return _parse_sub_score(dimension, await acall_llm(_dimension_prompt(dimension, state)))
 
 
-def assess_scope_feasibility_node(state):
-    """Assess scope and timeline feasibility."""
-    print("[Feasibility] Assessing scope feasibility...")
-    
-    prompt = f"""You are a project manager. Quickly assess scope feasibility (0-100).
+def assess_technical_feasibility_node(state):
+    """Assess technical feasibility of the project."""
+    return _assess_dimension("technical", state)
 
-Project: {state.refined_summary[:300]}
-Problem: {state.problem_statement}
 
-Rate: Scope clarity, complexity, timeline realism, scope creep risk.
+def assess_resource_feasibility_node(state):
+    """Assess resource feasibility (budget, infrastructure, tools)."""
+    return _assess_dimension("resource", state)
 
-JSON:
-{{"score": <0-100>, "explanation": "<1-2 sentences>", "recommendation": "<1 sentence>"}}"""
-    
-    raw = call_llm(prompt)
-    if not raw:
-        print("[Feasibility] LLM failed for scope assessment - skipping")
-        return state
-    
-    raw = re.sub(r"^```(?:json)?\s*|\s*```$", "", raw.strip(), flags=re.MULTILINE)
-    
-    try:
-        import json
-        # # Extract only the first JSON object if multiple exist
-        # json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', raw)
-        # if json_match:
-        #     raw = json_match.group(0)
-        data = json.loads(raw)
-        state.scope_feasibility = FeasibilitySubScore(
-            score=int(data.get("score", 0)),
-            explanation=str(data.get("explanation", "Unable to assess")),
-            recommendation=str(data.get("recommendation", ""))
-        )
-    except Exception as e:
-        print(f"[Feasibility] Error parsing scope assessment: {e}")
-    
-    return state
 
+def assess_skills_feasibility_node(state):
+    """Assess skills and team capability feasibility."""
+    return _assess_dimension("skills", state)
 
-def assess_risk_feasibility_node(state):
-    """Assess risk and mitigation feasibility."""
-    print("[Feasibility] Assessing risk feasibility...")
-    
-    prompt = f"""You are a risk analyst. Quickly assess risk feasibility (0-100).
 
-Project: {state.refined_summary[:300]}
-Topics: {', '.join(state.key_topics) if state.key_topics else 'N/A'}
+def assess_scope_feasibility_node(state):
+    """Assess scope and timeline feasibility."""
+    return _assess_dimension("scope", state)
 
-Rate: Identified risks, dependencies, external volatility, mitigation strategies.
 
-JSON:
-{{"score": <0-100>, "explanation": "<1-2 sentences>", "recommendation": "<1 sentence>"}}"""
-    
-    raw = call_llm(prompt)
-    if not raw:
-        print("[Feasibility] LLM failed for risk assessment - skipping")
-        return state
-    
-    raw = re.sub(r"^```(?:json)?\s*|\s*```$", "", raw.strip(), flags=re.MULTILINE)
-    
-    try:
-        import json
-        # # Extract only the first JSON object if multiple exist
-        # json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', raw)
-        # if json_match:
-        #     raw = json_match.group(0)
-        data = json.loads(raw)
-        state.risk_feasibility = FeasibilitySubScore(
-            score=int(data.get("score", 0)),
-            explanation=str(data.get("explanation", "Unable to assess")),
-            recommendation=str(data.get("recommendation", ""))
-        )
-    except Exception as e:
-        print(f"[Feasibility] Error parsing risk assessment: {e}")
-    
-    return state
+def assess_risk_feasibility_node(state):
+    """Assess risk and mitigation feasibility."""
+    return _assess_dimension("risk", state)
@@ -3,12 +3,21 @@ Feasibility assessment nodes for LangGraph pipeline.
 - ML Prediction: Generate ML-based feasibility score
 - Semantic Search: Find relevant papers
 - Unified Assessment: Generate all 5 dimension scores using ML + papers + LLM
+
+ML prediction and semantic search are independent and run as parallel
+branches, so they return partial updates instead of the whole state.
+
+Nodes are async: blocking work (model inference, Qdrant client) runs in the
+shared worker pool and the LLM call is awaited natively.
 """
 
 import logging
 import json
 import re
-from app.utils.llm import call_llm
+import time
+from typing import Any, Dict, List
+from app.utils.llm import acall_llm
+from app.utils.workers import run_in_worker
 from app.schemas.feasibility_new import (
     FeasibilityAssessmentState,
     FeasibilitySubScore,
@@ -21,18 +30,29 @@ from app.services.semantic_search import get_search_service
 logger = logging.getLogger(__name__)
 
 
-def ml_prediction_node(state: FeasibilityAssessmentState) -> FeasibilityAssessmentState:
+def _predict(input_data) -> FeasibilityPrediction:
+    """Blocking ML inference (loads the model on first use)."""
+    return get_predictor().predict(input_data)
+
+
+def _search(input_data) -> List[RelevantPaper]:
+    """Blocking embedding + Qdrant query."""
+    return get_search_service().search_papers(input_data, top_k=5)
+
+
+async def ml_prediction_node(state: FeasibilityAssessmentState) -> Dict[str, Any]:
     """
-    Stage 1: ML Prediction
+    Stage 1a: ML Prediction (parallel with semantic search)
     Predict feasibility score from structured fields using trained model.
     """
     logger.info("[ML Prediction] Starting ML prediction...")
+    started = time.perf_counter()
     
+    degraded = []
     try:
-        predictor = get_predictor()
-        prediction = predictor.predict(state.input_data)
+        prediction = await run_in_worker(_predict, state.input_data)
         
-        state.ml_prediction = FeasibilityPrediction(
+        ml_prediction = FeasibilityPrediction(
             ml_score=prediction.ml_score,
             confidence=prediction.confidence,
             risk_indicators=prediction.risk_indicators
@@ -41,46 +61,64 @@ def ml_prediction_node(state: FeasibilityAssessmentState) -> FeasibilityAssessme
         logger.info(f"[ML Prediction] Score: {prediction.ml_score:.1f}/100, "
                    f"Confidence: {prediction.confidence:.2f}")
         
+        if prediction.fallback:
+            # Heuristic score: the model was unavailable or failed
+            degraded = ["ml_prediction"]
+        
     except Exception as e:
         logger.error(f"[ML Prediction] Error: {e}")
         # Fallback: use neutral score
-        state.ml_prediction = FeasibilityPrediction(
+        ml_prediction = FeasibilityPrediction(
             ml_score=50.0,
             confidence=0.5,
             risk_indicators=["ML prediction unavailable"]
         )
+        degraded = ["ml_prediction"]
     
-    return state
+    elapsed = time.perf_counter() - started
+    logger.info(f"[ML Prediction] Completed in {elapsed:.2f}s")
+    return {
+        "ml_prediction": ml_prediction,
+        "stage_timings": {"ml_prediction": elapsed},
+        "degraded_stages": degraded,
+    }
 
 
-def semantic_search_node(state: FeasibilityAssessmentState) -> FeasibilityAssessmentState:
+async def semantic_search_node(state: FeasibilityAssessmentState) -> Dict[str, Any]:
     """
-    Stage 2: Semantic Search
+    Stage 1b: Semantic Search (parallel with ML prediction)
     Find relevant research papers based on project details.
     """
     logger.info("[Semantic Search] Starting paper search...")
+    started = time.perf_counter()
     
+    degraded = []
     try:
-        search_service = get_search_service()
-        papers = search_service.search_papers(state.input_data, top_k=5)
-        
-        state.relevant_papers = papers
+        papers = await run_in_worker(_search, state.input_data)
         logger.info(f"[Semantic Search] Found {len(papers)} relevant papers")
         
     except Exception as e:
         logger.error(f"[Semantic Search] Error: {e}")
-        state.relevant_papers = []
+        papers = []
+        degraded = ["semantic_search"]
     
-    return state
+    elapsed = time.perf_counter() - started
+    logger.info(f"[Semantic Search] Completed in {elapsed:.2f}s")
+    return {
+        "relevant_papers": papers,
+        "stage_timings": {"semantic_search": elapsed},
+        "degraded_stages": degraded,
+    }
 
 
-def unified_assessment_node(state: FeasibilityAssessmentState) -> FeasibilityAssessmentState:
+async def unified_assessment_node(state: FeasibilityAssessmentState) -> FeasibilityAssessmentState:
     """
-    Stage 3: Unified Assessment
+    Stage 2: Unified Assessment
     Generate all 5 feasibility dimension scores using ML prediction, papers, and LLM.
     Single LLM call to score all dimensions together for efficiency.
     """
     logger.info("[Unified Assessment] Starting 5-dimension assessment...")
+    started = time.perf_counter()
     
     # Build papers context
     papers_text = ""
@@ -158,7 +196,7 @@ Return JSON:
 """
 
     try:
-        raw_response = call_llm(prompt)
+        raw_response = await acall_llm(prompt)
         
         # Parse JSON response
         json_match = re.search(r'\{.*\}', raw_response, re.DOTALL)
@@ -207,6 +245,9 @@ Return JSON:
                 )
             
             logger.info("[Unified Assessment] Scores assigned successfully")
+        else:
+            # acall_llm reports failures as "Error: ..." text
+            raise ValueError(f"no JSON in assessment response: {raw_response[:80]!r}")
         
     except Exception as e:
         logger.error(f"[Unified Assessment] Error: {e}")
@@ -219,5 +260,11 @@ Return JSON:
                 explanation="Assessment based on ML prediction",
                 recommendation="Further analysis recommended"
             ))
+        state.degraded_stages = state.degraded_stages + ["unified_assessment"]
+    
+    if any(getattr(state, f"{dim}_feasibility") is None for dim in ['technical', 'resource', 'skills', 'scope', 'risk']):
+        # Dimensions left out of the response are reported with default scores
+        state.degraded_stages = state.degraded_stages + ["unified_assessment"]
     
+    state.stage_timings["unified_assessment"] = time.perf_counter() - started
     return state
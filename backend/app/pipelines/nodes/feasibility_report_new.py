@@ -4,6 +4,7 @@ Generates final report combining ML prediction, papers, and dimension scores.
 """
 
 import logging
+import time
 from datetime import datetime
 from app.schemas.feasibility_new import FeasibilityAssessmentState
 
@@ -12,10 +13,11 @@ logger = logging.getLogger(__name__)
 
 def generate_feasibility_report_node(state: FeasibilityAssessmentState) -> FeasibilityAssessmentState:
     """
-    Stage 4: Generate Final Report
+    Stage 3: Generate Final Report
     Compile all assessment results into polished report with recommendations.
     """
     logger.info("[Report Generation] Generating final feasibility report...")
+    started = time.perf_counter()
     
     # Collect scores
     scores = []
@@ -91,6 +93,7 @@ def generate_feasibility_report_node(state: FeasibilityAssessmentState) -> Feasi
     
     logger.info(f"[Report Generation] Final score: {final_score}/100 ({state.viability_status})")
     
+    state.stage_timings["generate_report"] = time.perf_counter() - started
     return state
 
 
@@ -2,21 +2,41 @@
 
 Workflow (optimized for token efficiency):
  1. Inspect `ResearchState.intermediate` fields + existing summary.
- 2. Use heuristic routing (no LLM) to decide wiki vs ddg.
- 3. Invoke the chosen enrichment node (`wiki_node` or `ddg_node`).
- 4. Use raw enrichment directly (no LLM synthesis to llm_research_report).
- 5. Update `consolidated_research` with raw enrichment data.
+ 2. Hedged mode (default, ENRICHMENT_MODE=hedged): query Wikipedia and
+    DuckDuckGo concurrently under ENRICHMENT_BUDGET, then merge, de-duplicate
+    and relevance-rank whatever arrived.
+    Routed mode: use heuristic routing (no LLM) to decide wiki vs ddg and
+    invoke the chosen enrichment node (`wiki_node` or `ddg_node`).
+ 3. Use raw enrichment directly (no LLM synthesis to llm_research_report).
+ 4. Update `consolidated_research` with raw enrichment data.
 
 Token optimization: Skips expensive LLM arrangement/synthesis step.
 """
 
 import json
+import time
 from typing import Literal
 
 from app.schemas.research_state import ResearchState
 from app.utils.llm import call_llm
-from app.pipelines.nodes.wiki import wiki_node
-from app.pipelines.nodes.ddg import ddg_node
+from app.utils.http import gather_partial
+from app.utils.research_cache import agather_cached
+from app.utils.ddg import agather_ddg_supporting_text
+from app.utils.enrichment import (
+	ENRICHMENT_MODE,
+	ENRICHMENT_BUDGET,
+	ENRICHMENT_REPORT_CHARS,
+	Snippet,
+	project_query,
+	flatten_contexts,
+	rank_snippets,
+	format_report,
+)
+from app.pipelines.nodes.wiki import wiki_node, apply_wiki_contexts, agather_wiki_contexts
+from app.pipelines.nodes.ddg import ddg_node, apply_ddg_contexts
+
+# Ranked snippets kept for the hedged enrichment report
+HEDGED_MAX_SNIPPETS = 25
 
 
 DECISION_INSTRUCTIONS = """
@@ -82,11 +102,50 @@ def _decide_source(state: ResearchState) -> tuple[Literal["wiki", "ddg"], str]:
 # Removed: _arrange_report - using raw enrichment data directly to save tokens
 
 
-def research_llm_router_node(state: ResearchState) -> ResearchState:
+async def _hedged_enrichment(state: ResearchState, budget: float = ENRICHMENT_BUDGET) -> tuple[ResearchState, str]:
+	"""Fetch both sources at once; returns the enriched state and the merged, ranked snippet report.
+
+	Each source returns its partial results when `budget` runs out, so the
+	stage takes at most about `budget` seconds whichever source is slow.
+	"""
+	interm = state.intermediate
+	fields = dict(
+		problem_statement=interm.problem_statement,
+		domain=interm.domain,
+		goals=interm.goals,
+		prerequisites=interm.prerequisites,
+		key_topics=interm.key_topics,
+	)
+	calls = {}
+	if not state.wiki_summary:
+		calls["wiki"] = agather_wiki_contexts(**fields, timeout=budget)
+	if not state.ddg_results:
+		calls["ddg"] = agather_cached("ddg", agather_ddg_supporting_text, **fields, timeout=budget)
+
+	started = time.perf_counter()
+	# Small grace period: the sources stop themselves at `budget`
+	contexts = await gather_partial(calls, timeout=budget + 1)
+	state = apply_wiki_contexts(state, contexts.get("wiki"))
+	state = apply_ddg_contexts(state, contexts.get("ddg"))
+
+	snippets = flatten_contexts(contexts.get("wiki"), "wiki") + flatten_contexts(contexts.get("ddg"), "ddg")
+	if "ddg" not in calls:
+		snippets += [Snippet(text, "ddg", "ddg_results") for text in state.ddg_results or []]
+	ranked = rank_snippets(snippets, project_query(state.intermediate), max_chars=ENRICHMENT_REPORT_CHARS, limit=HEDGED_MAX_SNIPPETS)
+	print(
+		f"[Research] hedged enrichment: {', '.join(f'{k}=ok' for k in contexts) or 'no source'} "
+		f"({len(snippets)} snippets -> {len(ranked)} ranked) in {time.perf_counter() - started:.1f}s"
+	)
+	return state, format_report(ranked)
+
+
+async def research_llm_router_node(state: ResearchState) -> ResearchState:
 	"""Master router node performing source selection and enrichment.
 
-	- Decides between wiki or ddg using heuristics (no LLM call).
-	- Invokes the chosen enrichment node if not yet populated.
+	- Hedged mode: queries wiki and ddg concurrently under a latency budget
+	  and ranks the merged snippets.
+	- Routed mode: decides between wiki or ddg using heuristics (no LLM call)
+	  and invokes the chosen enrichment node if not yet populated.
 	- Sets llm_research_report to raw enrichment (no LLM synthesis).
 	- Updates consolidated_research with enrichment data.
 
@@ -95,13 +154,17 @@ def research_llm_router_node(state: ResearchState) -> ResearchState:
 	if not state.intermediate:
 		return state
 
+	if ENRICHMENT_MODE == "hedged":
+		state, report = await _hedged_enrichment(state)
+		return _record_report(state, report)
+
 	source, reason = _decide_source(state)
 
 	# Enrich accordingly only if not already enriched for that source
 	if source == "wiki" and not state.wiki_summary:
-		state = wiki_node(state)
+		state = await wiki_node(state)
 	elif source == "ddg" and not state.ddg_results:
-		state = ddg_node(state)
+		state = await ddg_node(state)
 
 	# Use raw enrichment directly - no LLM arrangement call
 	# This saves significant tokens by skipping synthesis step
@@ -109,11 +172,16 @@ def research_llm_router_node(state: ResearchState) -> ResearchState:
 		# Use wiki summary directly as the report (truncate to 3000 chars)
 		report = state.wiki_summary[:3000]
 	elif source == "ddg" and state.ddg_results:
-		# Format DDG results as bullet list (use top 15 results)
-		report = "\n".join([f"- {result}" for result in state.ddg_results[:15]])
+		# Most relevant DDG results as a bullet list, within the report budget
+		snippets = [Snippet(text, "ddg", "ddg_results") for text in state.ddg_results]
+		report = format_report(rank_snippets(snippets, project_query(state.intermediate), max_chars=ENRICHMENT_REPORT_CHARS))
 	else:
 		report = ""
 
+	return _record_report(state, report)
+
+
+def _record_report(state: ResearchState, report: str) -> ResearchState:
 	state.llm_research_report = report
 
 	if state.consolidated_research:
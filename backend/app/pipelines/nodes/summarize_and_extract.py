@@ -1,21 +1,22 @@
 """Combined node for summarization and field extraction in a single LLM call."""
 
 import re
-from app.services.summarize_research import summarize_and_extract_fields
+from app.services.long_document import asummarize_and_extract_document
 from app.schemas.intermediate import IntermediateState
 
 
-def summarize_and_extract_node(state: IntermediateState):
+async def summarize_and_extract_node(state: IntermediateState):
     """Generate summary and extract fields in a single LLM call.
     
     This combines the work of summarize_node and fill_state_node into one call,
-    saving tokens and reducing LLM overhead.
+    saving tokens and reducing LLM overhead. Documents longer than the prompt
+    window are condensed with map-reduce first (see long_document).
     """
     if not state.raw_text or not isinstance(state.raw_text, str):
         return state
     
     # Call combined function
-    summary, fields = summarize_and_extract_fields(state.raw_text)
+    summary, fields = await asummarize_and_extract_document(state.raw_text)
     
     # Set summary
     if summary:
@@ -1,10 +1,24 @@
-from typing import Optional
+import os
+from typing import Dict, List, Optional
 
 from app.schemas.research_state import ResearchState
-from app.utils.wiki import gather_wiki_supporting_text
+from app.utils.wiki import agather_wiki_supporting_text
+from app.utils.local_knowledge import agather_local_supporting_text
+from app.utils.research_cache import agather_cached
 
+# "live": Wikipedia API (through the research cache); "local": offline knowledge store
+WIKI_BACKEND = os.getenv("WIKI_BACKEND", "live")
 
-def wiki_node(state: ResearchState) -> ResearchState:
+
+async def agather_wiki_contexts(**fields) -> Dict[str, List[str]]:
+	"""Wiki contexts for the research fields from the configured backend."""
+	if WIKI_BACKEND == "local":
+		# Milliseconds and offline; nothing to gain from the research cache
+		return await agather_local_supporting_text(**fields)
+	return await agather_cached("wiki", agather_wiki_supporting_text, **fields)
+
+
+async def wiki_node(state: ResearchState) -> ResearchState:
 	"""Enrich the research state with Wikipedia-derived context.
 
 	Steps:
@@ -23,14 +37,18 @@ def wiki_node(state: ResearchState) -> ResearchState:
 
 	interm = state.intermediate
 
-	contexts = gather_wiki_supporting_text(
+	contexts = await agather_wiki_contexts(
 		problem_statement=interm.problem_statement,
 		domain=interm.domain,
 		goals=interm.goals,
 		prerequisites=interm.prerequisites,
 		key_topics=interm.key_topics,
 	)
+	return apply_wiki_contexts(state, contexts)
+
 
+def apply_wiki_contexts(state: ResearchState, contexts: Optional[dict]) -> ResearchState:
+	"""Build `wiki_summary` (and seed `consolidated_research`) from fetched contexts."""
 	if not contexts:
 		return state
 
@@ -20,7 +20,8 @@ from app.schemas.intermediate import IntermediateState
 
 
 
-from app.pipelines.builds.scoping import create_graph
+from app.pipelines.registry import get_graph
+import asyncio
 import os
 
 
@@ -54,14 +55,14 @@ def run_pipeline(file_path: str, user_input: str | None = None):
 
     }
 
-    graph = create_graph()
+    graph = get_graph("scoping")
 
 
 
     # First pass
 
 
-    state = graph.invoke(state)
+    state = asyncio.run(graph.ainvoke(state))
 
 
 
@@ -86,7 +87,7 @@ def run_pipeline(file_path: str, user_input: str | None = None):
         state["user_input"] = user_answer if user_answer else None
 
 
-        state = graph.invoke(state)
+        state = asyncio.run(graph.ainvoke(state))
 
 
 
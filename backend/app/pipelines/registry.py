@@ -0,0 +1,94 @@
+"""Compile-once registry for the LangGraph pipelines.
+
+Building a StateGraph and calling `.compile()` validates the topology and
+wires up channels every time, and several request paths used to do it more
+than once per request (e.g. the scoping graph inside `_scoping_node`, the chat
+graph inside `_chat_agent_node`). A compiled graph holds no per-run state, so
+one instance can be shared by every request and thread.
+
+Usage:
+    from app.pipelines.registry import get_graph
+    result = await get_graph("feasibility").ainvoke(state)
+
+`compile_all_graphs()` is called at application startup so the first request
+does not pay the compile cost either.
+"""
+
+import importlib
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+# name -> (module, factory function, factory kwargs)
+GRAPH_FACTORIES: Dict[str, Tuple[str, str, Dict[str, Any]]] = {
+    "scoping": ("app.pipelines.builds.scoping", "create_graph", {}),
+    "research": ("app.pipelines.builds.researcher", "create_research_graph", {"debug": False}),
+    "research_debug": ("app.pipelines.builds.researcher", "create_research_graph", {"debug": True}),
+    "chat": ("app.pipelines.builds.chat_agent", "create_chat_graph", {}),
+    "feasibility": ("app.pipelines.builds.feasibility_pipeline_new", "create_feasibility_graph", {}),
+    "feasibility_legacy": ("app.pipelines.builds.feasibility_pipeline", "create_feasibility_graph", {}),
+    "feasibility_from_document": (
+        "app.pipelines.builds.feasibility_pipeline_from_document",
+        "create_feasibility_from_document_graph",
+        {},
+    ),
+    "roadmap": ("app.pipelines.builds.roadmap_pipeline", "create_roadmap_graph", {}),
+    "roadmap_from_chat": ("app.pipelines.builds.roadmap_pipeline_from_chat", "create_roadmap_from_chat_graph", {}),
+    "roadmap_from_summary": (
+        "app.pipelines.builds.roadmap_pipeline_from_summary_streaming",
+        "create_roadmap_from_summary_graph",
+        {},
+    ),
+}
+
+_compiled: Dict[str, Any] = {}
+_lock = threading.RLock()
+
+
+def build_graph(name: str):
+    """Build and compile a fresh instance of a registered graph (bypasses the cache)."""
+    if name not in GRAPH_FACTORIES:
+        raise KeyError(f"Unknown graph '{name}'. Registered: {sorted(GRAPH_FACTORIES)}")
+    module_name, factory_name, kwargs = GRAPH_FACTORIES[name]
+    # Imported lazily: the builder modules themselves fetch sub-graphs from here
+    factory = getattr(importlib.import_module(module_name), factory_name)
+    return factory(**kwargs)
+
+
+def get_graph(name: str):
+    """Return the shared compiled graph for `name`, compiling it on first use."""
+    graph = _compiled.get(name)
+    if graph is not None:
+        return graph
+    with _lock:
+        graph = _compiled.get(name)
+        if graph is None:
+            graph = build_graph(name)
+            _compiled[name] = graph
+    return graph
+
+
+def compile_all_graphs() -> Dict[str, float]:
+    """Compile every registered graph up front; returns seconds spent per graph."""
+    timings: Dict[str, float] = {}
+    for name in GRAPH_FACTORIES:
+        start = time.perf_counter()
+        try:
+            get_graph(name)
+        except Exception as e:
+            # A broken optional pipeline must not stop the app from starting;
+            # get_graph() will raise again when a request actually needs it.
+            print(f"[GraphRegistry] !! failed to compile '{name}': {e}")
+            continue
+        timings[name] = time.perf_counter() - start
+    print(f"[GraphRegistry] compiled {len(timings)}/{len(GRAPH_FACTORIES)} graphs in {sum(timings.values()):.3f}s")
+    return timings
+
+
+def clear_graphs() -> None:
+    """Drop all cached compiled graphs (used by benchmarks and reloads)."""
+    with _lock:
+        _compiled.clear()
+
+
+__all__ = ["GRAPH_FACTORIES", "build_graph", "get_graph", "compile_all_graphs", "clear_graphs"]
@@ -1,15 +1,29 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Depends, Body
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Depends, Body, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.schemas.feasibility import FeasibilityRequest, FeasibilityReport
 from app.schemas.feasibility_new import StructuredFeasibilityInput
-from app.pipelines.builds.feasibility_pipeline_new import run_feasibility_assessment as run_new_assessment, convert_state_to_report
+from app.pipelines.builds.feasibility_structured_streaming import run_structured_feasibility_streaming
+from app.pipelines.builds.feasibility_portfolio import (
+    PORTFOLIO_MAX_CONCURRENCY,
+    PORTFOLIO_MAX_ROWS,
+    parse_portfolio_csv,
+    run_feasibility_portfolio,
+)
+from app.services.result_store import (
+    FEASIBILITY,
+    session_key,
+    document_key,
+    load_result,
+    result_response,
+)
+from app.utils.streaming import format_status, format_ndjson
+from app.utils.uploads import receive_document
 from app.utils.feasibility_converter import convert_legacy_request_to_structured, convert_text_to_structured
-from app.models.chat import ChatSessionState
+from app.models.chat import ChatSession, ChatSessionState
 from app.database import get_db
 import logging
-import tempfile
 import os
 
 logger = logging.getLogger(__name__)
@@ -20,6 +34,43 @@ router = APIRouter(
 )
 
 
+@router.get("/results")
+async def get_feasibility_result(
+    request: Request,
+    session_id: int = Query(None, description="Chat session the assessment was run for"),
+    document_hash: str = Query(None, description="SHA-256 of the uploaded document"),
+    user_id: str = Query(None, description="Owner of the chat session (required with session_id)"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Return the last stored feasibility report for a chat session or document.
+    
+    A session's feasibility report is only returned to the user who owns the session.
+    Supports conditional requests: send the returned ETag in `If-None-Match`
+    to get `304 Not Modified` when nothing changed.
+    """
+    if session_id is None and not document_hash:
+        raise HTTPException(status_code=400, detail="Provide session_id or document_hash")
+    if session_id is not None:
+        if not user_id or not user_id.strip():
+            raise HTTPException(status_code=400, detail="user_id is required with session_id")
+        # Verify session belongs to user
+        result = await db.execute(
+            select(ChatSession.id).where(
+                ChatSession.id == session_id,
+                ChatSession.user_id == user_id
+            )
+        )
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+    owner_key = session_key(session_id) if session_id is not None else document_key(document_hash)
+    
+    record = await load_result(FEASIBILITY, owner_key)
+    if record is None:
+        raise HTTPException(status_code=404, detail="No stored feasibility report")
+    return result_response(record, request)
+
+
 # @router.post("/assess", response_model=dict)
 # async def assess_structured_feasibility(
 #     request: StructuredFeasibilityInput,
@@ -193,6 +244,7 @@ router = APIRouter(
 @router.post("/from-chat/{session_id}/stream")
 async def assess_feasibility_from_chat_stream(
     session_id: int,
+    refresh: bool = Query(False, description="Ignore stored and cached reports and re-run the assessment"),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -201,6 +253,7 @@ async def assess_feasibility_from_chat_stream(
     
     Args:
         session_id: The chat session ID
+        refresh: Ignore stored and cached reports and regenerate
         db: Database session
         
     Returns:
@@ -251,89 +304,14 @@ async def assess_feasibility_from_chat_stream(
                 )
                 print(f"✓ Structured input created (Project ID: {structured_input.project_id})")
                 
-                # Stream stages
-                print("\nStreaming stages:")
-                yield f"event: status\ndata: {{\"message\": \"Starting feasibility assessment...\"}}\n\n"
-                print("  • Starting feasibility assessment...")
-                
-                yield f"event: status\ndata: {{\"message\": \"Running ML prediction...\"}}\n\n"
-                print("  • Running ML prediction...")
-                
-                yield f"event: status\ndata: {{\"message\": \"Searching for relevant papers...\"}}\n\n"
-                print("  • Searching for relevant papers...")
-                
-                yield f"event: status\ndata: {{\"message\": \"Assessing 5 dimensions...\"}}\n\n"
-                print("  • Assessing 5 dimensions...")
-                
-                # Run assessment
-                print("\nRunning assessment pipeline...")
-                assessment_state = run_new_assessment(structured_input)
-                report = convert_state_to_report(assessment_state)
-                
-                yield f"event: status\ndata: {{\"message\": \"Generating report...\"}}\n\n"
-                print("  • Generating report...")
-                
-                # Print detailed results
-                print("\n" + "-" * 80)
-                print("RESULTS")
-                print("-" * 80)
-                print(f"✓ Assessment Complete!")
-                print(f"  Final Score: {report.final_score}/100")
-                print(f"  Status: {report.viability_status}")
-                print(f"  ML Score: {report.ml_score:.1f}/100 (Confidence: {report.ml_confidence:.0%})")
-                
-                print("\nDimension Scores:")
-                print(f"  Technical:  {report.technical_score}/100")
-                print(f"  Resource:   {report.resource_score}/100")
-                print(f"  Skills:     {report.skills_score}/100")
-                print(f"  Scope:      {report.scope_score}/100")
-                print(f"  Risk:       {report.risk_score}/100")
-                
-                if report.relevant_papers:
-                    print(f"\nRelevant Papers ({len(report.relevant_papers)} found):")
-                    for i, paper in enumerate(report.relevant_papers[:3], 1):
-                        print(f"  {i}. {paper.title[:60]}...")
-                        print(f"     Relevance: {paper.relevance_score:.2f}")
-                
-                if report.key_risks:
-                    print("\nKey Risks:")
-                    for i, risk in enumerate(report.key_risks, 1):
-                        print(f"  {i}. {risk}")
-                
-                if report.recommendations:
-                    print("\nRecommendations:")
-                    for i, rec in enumerate(report.recommendations, 1):
-                        print(f"  {i}. {rec}")
-                
-                print("\n" + "=" * 80)
-                print("ASSESSMENT COMPLETE ✓")
-                print("=" * 80 + "\n")
-                
-                # Send final result
-                import json
-                result_data = {
-                    "final_score": report.final_score,
-                    "viability_status": report.viability_status,
-                    "ml_score": report.ml_score,
-                    "ml_confidence": report.ml_confidence,
-                    "technical_score": report.technical_score,
-                    "resource_score": report.resource_score,
-                    "skills_score": report.skills_score,
-                    "scope_score": report.scope_score,
-                    "risk_score": report.risk_score,
-                    "relevant_papers": [{
-                        "title": p.title,
-                        "summary": p.summary[:200] if len(p.summary) > 200 else p.summary,
-                        "link": p.link,
-                        "relevance_score": p.relevance_score
-                    } for p in report.relevant_papers],
-                    "explanation": report.explanation,
-                    "key_risks": report.key_risks,
-                    "recommendations": report.recommendations,
-                    "detailed_report": report.detailed_report,
-                    "assessment_timestamp": report.assessment_timestamp,
-                }
-                yield f"event: complete\ndata: {json.dumps(result_data)}\n\n"
+                # Stream real node progress, then the final report
+                async for event in run_structured_feasibility_streaming(
+                    structured_input,
+                    show_risks=True,
+                    refresh=refresh,
+                    owner_key=session_key(session_id),
+                ):
+                    yield event
                     
             except Exception as e:
                 logger.error(f"Stream error: {str(e)}", exc_info=True)
@@ -451,6 +429,7 @@ async def assess_feasibility_from_chat_stream(
 @router.post("/generate-stream")
 async def generate_feasibility_stream(
     file: UploadFile = File(...),
+    refresh: bool = Query(False, description="Ignore stored and cached reports and re-run the assessment"),
 ):
     """
     Upload a document and assess feasibility with real-time streaming.
@@ -458,6 +437,7 @@ async def generate_feasibility_stream(
     
     Args:
         file: Uploaded document file (PDF or DOCX)
+        refresh: Ignore stored and cached reports and regenerate
         
     Returns:
         Server-sent events stream with assessment progress
@@ -467,33 +447,18 @@ async def generate_feasibility_stream(
     print("=" * 80)
     print(f"File: {file.filename}")
     
-    allowed_extensions = [".pdf", ".docx"]
-    file_extension = os.path.splitext(file.filename)[1].lower()
-    
-    if file_extension not in allowed_extensions:
-        print(f"✗ Unsupported file type: {file_extension}")
-        raise HTTPException(status_code=400, detail="Unsupported file type")
+    # The assessment only needs the document's hash, so the buffer is released right away
+    with await receive_document(file) as upload:
+        doc_hash = upload.sha256
 
-    temp_file_path = None
     try:
-        # Save file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-
         async def event_generator():
             try:
                 print("\n" + "-" * 80)
                 print("Running assessment pipeline...")
                 print("-" * 80)
                 
-                print("\nStreaming stages:")
-                yield f"event: status\ndata: {{\"message\": \"Parsing document...\"}}\n\n"
-                print("  • Parsing document...")
-                
-                yield f"event: status\ndata: {{\"message\": \"Analyzing content...\"}}\n\n"
-                print("  • Analyzing content...")
+                yield format_status("Parsing document...", progress=0, stage="parse")
                 
                 # Convert document to structured format
                 print("\nConverting to structured format...")
@@ -504,74 +469,17 @@ async def generate_feasibility_stream(
                 )
                 print(f"✓ Structured input created (Project ID: {structured_input.project_id})")
                 
-                yield f"event: status\ndata: {{\"message\": \"Running ML prediction...\"}}\n\n"
-                print("  • Running ML prediction...")
-                
-                yield f"event: status\ndata: {{\"message\": \"Searching for papers...\"}}\n\n"
-                print("  • Searching for papers...")
-                
-                yield f"event: status\ndata: {{\"message\": \"Assessing feasibility...\"}}\n\n"
-                print("  • Assessing feasibility...")
-                
-                # Run assessment
-                print("\nRunning assessment pipeline...")
-                assessment_state = run_new_assessment(structured_input)
-                report = convert_state_to_report(assessment_state)
-                
-                # Print detailed results
-                print("\n" + "-" * 80)
-                print("RESULTS")
-                print("-" * 80)
-                print(f"✓ Assessment Complete!")
-                print(f"  Final Score: {report.final_score}/100")
-                print(f"  Status: {report.viability_status}")
-                print(f"  ML Score: {report.ml_score:.1f}/100 (Confidence: {report.ml_confidence:.0%})")
-                
-                print("\nDimension Scores:")
-                print(f"  Technical:  {report.technical_score}/100")
-                print(f"  Resource:   {report.resource_score}/100")
-                print(f"  Skills:     {report.skills_score}/100")
-                print(f"  Scope:      {report.scope_score}/100")
-                print(f"  Risk:       {report.risk_score}/100")
-                
-                if report.relevant_papers:
-                    print(f"\nRelevant Papers ({len(report.relevant_papers)} found):")
-                    for i, paper in enumerate(report.relevant_papers[:3], 1):
-                        print(f"  {i}. {paper.title[:60]}...")
-                        print(f"     Relevance: {paper.relevance_score:.2f}")
-                
-                print("\n" + "=" * 80)
-                print("ASSESSMENT COMPLETE ✓")
-                print("=" * 80 + "\n")
-                
-                # Send final result
-                import json
-                result_data = {
-                    "final_score": report.final_score,
-                    "viability_status": report.viability_status,
-                    "ml_score": report.ml_score,
-                    "ml_confidence": report.ml_confidence,
-                    "technical_score": report.technical_score,
-                    "resource_score": report.resource_score,
-                    "skills_score": report.skills_score,
-                    "scope_score": report.scope_score,
-                    "risk_score": report.risk_score,
-                    "relevant_papers": [{
-                        "title": p.title,
-                        "summary": p.summary[:200] if len(p.summary) > 200 else p.summary,
-                        "link": p.link,
-                        "relevance_score": p.relevance_score
-                    } for p in report.relevant_papers],
-                    "explanation": report.explanation,
-                    "key_risks": report.key_risks,
-                    "recommendations": report.recommendations,
-                    "detailed_report": report.detailed_report,
-                    "assessment_timestamp": report.assessment_timestamp,
-                }
-                yield f"event: complete\ndata: {json.dumps(result_data)}\n\n"
-            finally:
-                if temp_file_path and os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
+                # Stream real node progress, then the final report
+                async for event in run_structured_feasibility_streaming(
+                    structured_input,
+                    refresh=refresh,
+                    owner_key=document_key(doc_hash),
+                    extra={"document_hash": doc_hash},
+                ):
+                    yield event
+            except Exception as e:
+                logger.error(f"Feasibility stream error: {str(e)}", exc_info=True)
+                raise
 
         return StreamingResponse(
             event_generator(),
@@ -581,8 +489,6 @@ async def generate_feasibility_stream(
         
     except Exception as e:
         logger.error(f"Feasibility stream error: {str(e)}", exc_info=True)
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 
@@ -593,7 +499,7 @@ async def assess_feasibility_from_summary_stream(body: dict = Body(...)):
     Now uses new ML-based structured pipeline.
     
     Args:
-        body: {"summary": "text summary of project"}
+        body: {"summary": "text summary of project", "refresh": false}
         
     Returns:
         Server-sent events stream with feasibility assessment progress
@@ -621,19 +527,6 @@ async def assess_feasibility_from_summary_stream(body: dict = Body(...)):
         
         async def event_generator():
             try:
-                print("\nStreaming stages:")
-                yield f"event: status\ndata: {{\"message\": \"Starting assessment...\"}}\n\n"
-                print("  • Starting assessment...")
-                
-                yield f"event: status\ndata: {{\"message\": \"Running ML prediction...\"}}\n\n"
-                print("  • Running ML prediction...")
-                
-                yield f"event: status\ndata: {{\"message\": \"Searching for papers...\"}}\n\n"
-                print("  • Searching for papers...")
-                
-                yield f"event: status\ndata: {{\"message\": \"Assessing feasibility...\"}}\n\n"
-                print("  • Assessing feasibility...")
-                
                 # Convert to structured format
                 print("\nConverting text to structured format...")
                 structured_input = convert_text_to_structured(
@@ -642,62 +535,9 @@ async def assess_feasibility_from_summary_stream(body: dict = Body(...)):
                 )
                 print(f"✓ Structured input created (Project ID: {structured_input.project_id})")
                 
-                # Run assessment
-                print("\nRunning assessment pipeline...")
-                assessment_state = run_new_assessment(structured_input)
-                report = convert_state_to_report(assessment_state)
-                
-                # Print detailed results
-                print("\n" + "-" * 80)
-                print("RESULTS")
-                print("-" * 80)
-                print(f"✓ Assessment Complete!")
-                print(f"  Final Score: {report.final_score}/100")
-                print(f"  Status: {report.viability_status}")
-                print(f"  ML Score: {report.ml_score:.1f}/100 (Confidence: {report.ml_confidence:.0%})")
-                
-                print("\nDimension Scores:")
-                print(f"  Technical:  {report.technical_score}/100")
-                print(f"  Resource:   {report.resource_score}/100")
-                print(f"  Skills:     {report.skills_score}/100")
-                print(f"  Scope:      {report.scope_score}/100")
-                print(f"  Risk:       {report.risk_score}/100")
-                
-                if report.relevant_papers:
-                    print(f"\nRelevant Papers ({len(report.relevant_papers)} found):")
-                    for i, paper in enumerate(report.relevant_papers[:3], 1):
-                        print(f"  {i}. {paper.title[:60]}...")
-                        print(f"     Relevance: {paper.relevance_score:.2f}")
-                
-                print("\n" + "=" * 80)
-                print("ASSESSMENT COMPLETE ✓")
-                print("=" * 80 + "\n")
-                
-                # Send final result
-                import json
-                result_data = {
-                    "final_score": report.final_score,
-                    "viability_status": report.viability_status,
-                    "ml_score": report.ml_score,
-                    "ml_confidence": report.ml_confidence,
-                    "technical_score": report.technical_score,
-                    "resource_score": report.resource_score,
-                    "skills_score": report.skills_score,
-                    "scope_score": report.scope_score,
-                    "risk_score": report.risk_score,
-                    "relevant_papers": [{
-                        "title": p.title,
-                        "summary": p.summary[:200] if len(p.summary) > 200 else p.summary,
-                        "link": p.link,
-                        "relevance_score": p.relevance_score
-                    } for p in report.relevant_papers],
-                    "explanation": report.explanation,
-                    "key_risks": report.key_risks,
-                    "recommendations": report.recommendations,
-                    "detailed_report": report.detailed_report,
-                    "assessment_timestamp": report.assessment_timestamp,
-                }
-                yield f"event: complete\ndata: {json.dumps(result_data)}\n\n"
+                # Stream real node progress, then the final report
+                async for event in run_structured_feasibility_streaming(structured_input, refresh=bool(body.get("refresh"))):
+                    yield event
             except Exception as e:
                 logger.error(f"Stream error: {str(e)}", exc_info=True)
                 yield f"event: error\ndata: {{\"message\": \"Error: {str(e)}\"}}\n\n"
@@ -712,3 +552,50 @@ async def assess_feasibility_from_summary_stream(body: dict = Body(...)):
     except Exception as e:
         logger.error(f"Feasibility from summary stream error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+
+
+@router.post("/portfolio")
+async def assess_feasibility_portfolio(
+    file: UploadFile = File(...),
+    concurrency: int = Query(PORTFOLIO_MAX_CONCURRENCY, ge=1, le=32, description="Projects assessed by the LLM at once"),
+    refresh: bool = Query(False, description="Ignore cached reports and re-run every assessment"),
+):
+    """
+    Assess a whole portfolio of projects from a CSV upload.
+    
+    Columns are StructuredFeasibilityInput fields (list fields separated by
+    ';'). ML prediction and paper search are batched across all rows; the
+    per-project LLM assessments run under a bounded pool.
+    
+    Returns:
+        NDJSON stream: one `result` or `error` line per project as it
+        finishes, then a `summary` line
+    """
+    print("\n" + "=" * 80)
+    print("FEASIBILITY PORTFOLIO ASSESSMENT")
+    print("=" * 80)
+    print(f"File: {file.filename}")
+    
+    if os.path.splitext(file.filename or "")[1].lower() != ".csv":
+        raise HTTPException(status_code=400, detail="Portfolio must be a .csv file")
+    
+    try:
+        text = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Portfolio CSV must be UTF-8 encoded")
+    
+    rows, errors = parse_portfolio_csv(text)
+    if not rows and not errors:
+        raise HTTPException(status_code=400, detail="Portfolio CSV has no rows")
+    if len(rows) + len(errors) > PORTFOLIO_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"Portfolio exceeds {PORTFOLIO_MAX_ROWS} rows")
+    
+    async def line_generator():
+        async for record in run_feasibility_portfolio(rows, errors, concurrency=concurrency, refresh=refresh):
+            yield format_ndjson(record)
+    
+    return StreamingResponse(
+        line_generator(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache"},
+    )
@@ -0,0 +1,161 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Body, Request, Depends
+from fastapi.responses import StreamingResponse, JSONResponse
+from app.jobs.broker import get_broker, TERMINAL_STATUSES, FAILED
+from app.jobs.handlers import JOB_HANDLERS, JOB_PARAMS, JOB_UPLOAD_DIR, DOCUMENT_JOB_KINDS
+from app.models.user import User
+from app.schemas.jobs import JobSubmitRequest, JobOut
+from app.security.deps import get_optional_user
+from app.utils.streaming import format_sse
+from app.utils.uploads import receive_document
+from app.utils.workers import run_in_worker
+import asyncio
+import logging
+import os
+import uuid
+
+logger = logging.getLogger(__name__)
+
+JOB_EVENTS_POLL_INTERVAL = float(os.getenv("JOB_EVENTS_POLL_INTERVAL", "0.5"))
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Background Jobs"]
+)
+
+
+async def _get_job_or_404(job_id: str):
+    job = await run_in_worker(get_broker().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@router.post("", status_code=202, response_model=JobOut)
+async def submit_job(
+    request: JobSubmitRequest = Body(...),
+    current_user: Optional[User] = Depends(get_optional_user),
+):
+    """
+    Submit a pipeline run and return its job id immediately.
+    
+    Kinds: roadmap_from_summary {"summary", "project_id"?}, feasibility_from_summary
+    {"summary", "refresh"?}, feasibility_from_session {"session_id", "refresh"?,
+    "show_risks"? (default true, as in /feasibility/from-chat/{id}/stream)}.
+    Other params are rejected. Document kinds are submitted through
+    /jobs/upload. A `project_id` is scoped to the authenticated user and
+    ignored for anonymous requests.
+    """
+    if request.kind not in JOB_HANDLERS:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind. Available: {sorted(JOB_HANDLERS)}")
+    if request.kind in DOCUMENT_JOB_KINDS:
+        raise HTTPException(status_code=400, detail="Document jobs must be submitted via /jobs/upload")
+    
+    unknown = set(request.params) - JOB_PARAMS[request.kind]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported params for {request.kind}: {sorted(unknown)}. Allowed: {sorted(JOB_PARAMS[request.kind])}",
+        )
+    
+    # The owner comes from the token, never from the submitted params
+    params = dict(request.params)
+    if current_user is not None:
+        params["user_id"] = current_user.id
+    job = await run_in_worker(get_broker().submit, request.kind, params)
+    logger.info(f"Submitted job {job.id} ({job.kind})")
+    return job
+
+
+@router.post("/upload", status_code=202, response_model=JobOut)
+async def submit_document_job(
+    kind: str = Query(..., description="roadmap_from_document or feasibility_from_document"),
+    refresh: bool = Query(False, description="Ignore stored results and regenerate"),
+    file: UploadFile = File(...),
+):
+    """
+    Upload a document (PDF or DOCX) and run a document pipeline on it as a job.
+    
+    The upload is streamed from its spooled buffer into JOB_UPLOAD_DIR: the
+    job may run in another process or after a restart, so it needs a file.
+    """
+    if kind not in DOCUMENT_JOB_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {sorted(DOCUMENT_JOB_KINDS)}")
+    
+    upload = await receive_document(file)
+    try:
+        os.makedirs(JOB_UPLOAD_DIR, exist_ok=True)
+        file_path = os.path.abspath(os.path.join(JOB_UPLOAD_DIR, f"{uuid.uuid4().hex}.{upload.kind}"))
+        await run_in_worker(upload.save, file_path)
+    finally:
+        upload.close()
+    
+    params = {
+        "filename": upload.filename,
+        "document_hash": upload.sha256,
+        "refresh": refresh,
+    }
+    job = await run_in_worker(get_broker().submit, kind, params, file_path)
+    logger.info(f"Submitted job {job.id} ({job.kind}) for {upload.filename}")
+    return job
+
+
+@router.get("/{job_id}", response_model=JobOut)
+async def get_job(job_id: str):
+    """Poll a job's status (and result once it has finished)."""
+    return await _get_job_or_404(job_id)
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str):
+    """
+    Fetch a job's final result.
+    
+    Returns 202 with the current status while the job is still queued or
+    running, and 500 with the error if it failed.
+    """
+    job = await _get_job_or_404(job_id)
+    if job.status not in TERMINAL_STATUSES:
+        return JSONResponse(status_code=202, content={"id": job.id, "status": job.status})
+    if job.status == FAILED:
+        raise HTTPException(status_code=500, detail=job.error or "Job failed")
+    return job.result
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    request: Request,
+    after: int = Query(-1, description="Only send events with a sequence number greater than this"),
+):
+    """
+    Subscribe to a job's progress as Server-Sent Events.
+    
+    Replays stored events, then follows new ones until the job finishes.
+    Each event carries an `id:` so a reconnecting client (e.g. after a
+    dropped mobile connection) resumes via `Last-Event-ID` or `?after=`.
+    """
+    await _get_job_or_404(job_id)
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id is not None and last_event_id.isdigit():
+        after = max(after, int(last_event_id))
+    broker = get_broker()
+    
+    async def event_generator():
+        cursor = after
+        while True:
+            job = await run_in_worker(broker.get, job_id)
+            for seq, event, data in await run_in_worker(broker.events, job_id, cursor):
+                cursor = seq
+                yield f"id: {seq}\n" + format_sse(data, event=event)
+            if job is None or job.status in TERMINAL_STATUSES:
+                break
+            if await request.is_disconnected():
+                break
+            await asyncio.sleep(JOB_EVENTS_POLL_INTERVAL)
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
+    )
@@ -1,17 +1,33 @@
-from fastapi import APIRouter, HTTPException, Depends, Query, Body
-from app.pipelines.builds.roadmap_pipeline import run_roadmap_pipeline
-from app.pipelines.builds.roadmap_pipeline_from_chat import run_roadmap_from_chat
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Body, Request
+from app.pipelines.builds.roadmap_pipeline import arun_roadmap_pipeline
+from app.pipelines.builds.roadmap_pipeline_from_chat import arun_roadmap_from_chat
 from app.pipelines.builds.roadmap_pipeline_streaming import run_roadmap_pipeline_streaming
 from app.pipelines.builds.roadmap_pipeline_from_summary_streaming import run_roadmap_from_summary_streaming
 from app.schemas.roadmap import RoadmapFromSummaryRequest
 from fastapi import UploadFile, File
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func
 from sqlalchemy.future import select
-from app.models.chat import ChatSessionState
+from app.models.chat import ChatSession, ChatMessage, SenderType, ChatSessionState
 from app.database import get_db
-import tempfile
-import os
+from app.models.user import User
+from app.security.deps import get_optional_user
+from app.services.result_store import (
+    ROADMAP,
+    session_key,
+    document_key,
+    project_key,
+    load_result,
+    load_current_result,
+    save_result,
+    result_response,
+)
+from app.utils.cache import stable_hash
+from app.utils.streaming import format_status, format_complete
+from app.utils.uploads import receive_document
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,50 +38,142 @@ router = APIRouter(
 )
 
 
+def _session_inputs_hash(session_state: ChatSessionState) -> str:
+    """Hash of the chat-session fields a roadmap is generated from."""
+    return stable_hash({
+        "problem_statement": session_state.problem_statement,
+        "domain": session_state.domain,
+        "goals": session_state.goals,
+        "prerequisites": session_state.prerequisites,
+        "key_topics": session_state.key_topics,
+        "initial_summary": session_state.initial_summary,
+        "refined_summary": session_state.refined_summary,
+    })
+
+
+def _session_snapshot(session_state: ChatSessionState) -> dict:
+    """Stored chat-session fields in ChatState form."""
+    return {
+        "problem_statement": session_state.problem_statement,
+        "domain": session_state.domain,
+        "goals": session_state.goals,
+        "prerequisites": session_state.prerequisites,
+        "key_topics": session_state.key_topics,
+        "initial_summary": session_state.initial_summary,
+        "summary": session_state.refined_summary or session_state.initial_summary,
+    }
+
+
+async def _snapshot_is_current(db: AsyncSession, session_state: ChatSessionState) -> bool:
+    """True when no message was posted after the snapshot was last written."""
+    if not (session_state.refined_summary or session_state.initial_summary):
+        return False
+    last_message_at = (await db.execute(
+        select(func.max(ChatMessage.created_at)).where(ChatMessage.session_id == session_state.session_id)
+    )).scalar()
+    if last_message_at is None:
+        return True
+    return session_state.updated_at is not None and last_message_at <= session_state.updated_at
+
+
+async def _chat_context(db: AsyncSession, session_id: int) -> tuple[str, int]:
+    """Long-term memory (or the recent transcript) and message-pair count, as a chat turn builds them."""
+    session = (await db.execute(select(ChatSession).where(ChatSession.id == session_id))).scalar_one_or_none()
+    recent = (await db.execute(
+        select(ChatMessage)
+        .where(ChatMessage.session_id == session_id)
+        .order_by(ChatMessage.id.desc())
+        .limit(6)
+    )).scalars().all()
+    total = (await db.execute(
+        select(func.count(ChatMessage.id)).where(ChatMessage.session_id == session_id)
+    )).scalar() or 0
+    transcript = "\n".join(
+        f"{'User' if m.sender == SenderType.user else 'Assistant'}: {m.message}"
+        for m in reversed(recent)
+    )
+    memory = (session.memory if session else None) or transcript
+    return memory, int(total) // 2
+
+
+@router.get("/results")
+async def get_roadmap_result(
+    request: Request,
+    session_id: int = Query(None, description="Chat session the roadmap was generated for"),
+    document_hash: str = Query(None, description="SHA-256 of the uploaded document"),
+    user_id: str = Query(None, description="Owner of the chat session (required with session_id)"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Return the last stored roadmap for a chat session or document.
+    
+    A session's roadmap is only returned to the user who owns the session.
+    Supports conditional requests: send the returned ETag in `If-None-Match`
+    to get `304 Not Modified` when nothing changed.
+    """
+    if session_id is None and not document_hash:
+        raise HTTPException(status_code=400, detail="Provide session_id or document_hash")
+    if session_id is not None:
+        if not user_id or not user_id.strip():
+            raise HTTPException(status_code=400, detail="user_id is required with session_id")
+        # Verify session belongs to user
+        result = await db.execute(
+            select(ChatSession.id).where(
+                ChatSession.id == session_id,
+                ChatSession.user_id == user_id
+            )
+        )
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+    owner_key = session_key(session_id) if session_id is not None else document_key(document_hash)
+    
+    record = await load_result(ROADMAP, owner_key)
+    if record is None:
+        raise HTTPException(status_code=404, detail="No stored roadmap")
+    return result_response(record, request)
+
+
 @router.post("/generate")
-async def generate_roadmap(file: UploadFile = File(...)):
+async def generate_roadmap(
+    file: UploadFile = File(...),
+    refresh: bool = Query(False, description="Ignore a stored roadmap for this document and regenerate"),
+):
     """
     Upload a document and generate a roadmap from it.
     
+    The roadmap is stored under the document's SHA-256; uploading the same
+    document again returns the stored roadmap unless `refresh` is set.
+    
     Args:
         file: Uploaded document file (PDF or DOCX)
+        refresh: Ignore a stored roadmap and regenerate
         
     Returns:
         dict: Contains status, message, initial_summary, refined_summary, and roadmap
     """
-    # Check file type
-    allowed_extensions = ['.pdf', '.docx']
-    file_extension = os.path.splitext(file.filename)[1].lower()
-    
-    if file_extension not in allowed_extensions:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Unsupported file type. Please upload PDF or DOCX files only."
-        )
-    
-    # Create temporary file
+    upload = await receive_document(file)
+    doc_hash = upload.sha256
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-            # Write uploaded file content to temporary file
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        if not refresh:
+            stored = await load_current_result(ROADMAP, document_key(doc_hash), doc_hash)
+            if stored is not None:
+                return {**stored, "cached": True}
         
         # Run the unified roadmap pipeline (scoping + research + roadmap)
-        output = run_roadmap_pipeline(temp_file_path)
-        
-        # Clean up temporary file
-        os.unlink(temp_file_path)
+        output = await arun_roadmap_pipeline(upload.ref)
         
         # Return the result
         if output.status == "success":
-            return {
+            result = {
                 "success": True,
                 "message": output.message,
                 "initial_summary": output.initial_summary,
                 "refined_summary": output.refined_summary,
                 "roadmap": output.roadmap,
+                "document_hash": doc_hash,
             }
+            await save_result(ROADMAP, document_key(doc_hash), doc_hash, result)
+            return result
         elif output.status == "warning":
             return {
                 "success": False,
@@ -77,17 +185,18 @@ async def generate_roadmap(file: UploadFile = File(...)):
         else:
             raise HTTPException(status_code=500, detail=output.message)
             
+    except HTTPException:
+        raise
     except Exception as e:
-        # Clean up temp file if it exists
-        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
-        
         raise HTTPException(status_code=500, detail=f"Error processing document: {str(e)}")
+    finally:
+        upload.close()
 
 
 @router.post("/from-chat/{session_id}")
 async def generate_roadmap_from_chat(
     session_id: int,
+    refresh: bool = Query(False, description="Ignore a stored roadmap for this session and regenerate"),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -95,8 +204,16 @@ async def generate_roadmap_from_chat(
     
     Flow: chat_agent -> research -> roadmap
     
+    The pipeline starts from the session's stored snapshot (problem
+    statement, goals, key topics, refined summary); the chat agent only
+    re-extracts when messages were posted after the snapshot was updated.
+    
+    The roadmap is stored per session and reused until the session's
+    extracted fields change or `refresh` is set.
+    
     Args:
         session_id: The chat session ID
+        refresh: Ignore a stored roadmap and regenerate
         db: Database session
         
     Returns:
@@ -117,18 +234,38 @@ async def generate_roadmap_from_chat(
                 detail=f"Chat session {session_id} not found"
             )
         
-        # Get chat memory/context
-        memory_text = session_state.memory or ""
+        owner_key = session_key(session_id)
+        inputs_hash = _session_inputs_hash(session_state)
+        if not refresh:
+            stored = await load_current_result(ROADMAP, owner_key, inputs_hash)
+            if stored is not None:
+                return {**stored, "cached": True}
+        
+        # Start from the stored snapshot; the chat agent only re-extracts
+        # when messages arrived after the snapshot was written
+        snapshot_current = await _snapshot_is_current(db, session_state)
+        memory_text, message_pairs = await _chat_context(db, session_id)
         
         # Run roadmap pipeline from chat
-        result = run_roadmap_from_chat(memory_text=memory_text)
+        # Stages whose inputs did not change since the last run are reused
+        result = await arun_roadmap_from_chat(
+            memory_text=memory_text,
+            message_pairs=message_pairs,
+            owner_key=owner_key,
+            snapshot=_session_snapshot(session_state),
+            snapshot_current=snapshot_current,
+        )
         
-        return {
+        response = {
             "success": True,
             "message": "Roadmap generated from chat",
             "refined_summary": result.summary,
             "roadmap": result.roadmap,
+            "reused_stages": result.reused_stages,
         }
+        if result.roadmap:
+            await save_result(ROADMAP, owner_key, inputs_hash, response)
+        return response
         
     except HTTPException:
         raise
@@ -141,43 +278,61 @@ async def generate_roadmap_from_chat(
 
 
 @router.post('/generate-stream')
-async def generate_roadmap_stream(file: UploadFile = File(...)):
-    """Upload a document and generate a roadmap with real-time status streaming."""
-    allowed_extensions = [".pdf", ".docx"]
-    file_extension = os.path.splitext(file.filename)[1].lower()
-    if file_extension not in allowed_extensions:
-        raise HTTPException(status_code=400, detail="Unsupported file type")
-    temp_file_path = None
+async def generate_roadmap_stream(
+    file: UploadFile = File(...),
+    refresh: bool = Query(False, description="Ignore a stored roadmap for this document and regenerate"),
+):
+    """Upload a document and generate a roadmap with real-time status streaming.
+
+    A roadmap stored for the same document (by SHA-256) is replayed
+    immediately unless `refresh` is set.
+    """
+    upload = await receive_document(file)
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        doc_hash = upload.sha256
+        owner_key = document_key(doc_hash)
+
+        async def _persist(final_result: dict):
+            final_result["document_hash"] = doc_hash
+            await save_result(ROADMAP, owner_key, doc_hash, final_result)
 
         async def event_generator():
             try:
-                for event in run_roadmap_pipeline_streaming(temp_file_path):
+                stored = None if refresh else await load_current_result(ROADMAP, owner_key, doc_hash)
+                if stored is not None:
+                    yield format_status("Loaded saved roadmap", progress=100, stage="stored")
+                    yield format_complete({**stored, "cached": True})
+                    return
+                async for event in run_roadmap_pipeline_streaming(upload.ref, on_complete=_persist):
                     yield event
             finally:
-                if temp_file_path and os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
+                upload.close()
 
         return StreamingResponse(
             event_generator(),
             media_type="text/event-stream",
             headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
+            # Also when the client disconnects before the stream starts
+            background=BackgroundTask(upload.close),
         )
     except Exception as e:
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.unlink(temp_file_path)
+        upload.close()
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 
 @router.post("/generate-from-summary-stream")
-async def generate_roadmap_from_summary_stream(request: RoadmapFromSummaryRequest = Body(...)):
+async def generate_roadmap_from_summary_stream(
+    request: RoadmapFromSummaryRequest = Body(...),
+    current_user: Optional[User] = Depends(get_optional_user),
+):
     """
     Generate roadmap from a text summary with real-time status streaming.
     
+    With a `project_id` and a bearer token, regenerating after a small edit
+    reuses the previous run's extracted fields, research and roadmap sections
+    where their inputs did not change. Project ids are scoped to the user;
+    anonymous requests always run every stage.
+    
     Args:
         request: RoadmapFromSummaryRequest containing the project summary
         
@@ -193,9 +348,16 @@ async def generate_roadmap_from_summary_stream(request: RoadmapFromSummaryReques
         if not summary:
             raise HTTPException(status_code=400, detail="Summary text cannot be empty")
         
+        owner_key = None
+        if request.project_id:
+            if current_user is None:
+                logger.info("project_id ignored for an anonymous request; stages are not reused")
+            else:
+                owner_key = project_key(request.project_id, current_user.id)
+        
         async def event_generator():
             try:
-                for event in run_roadmap_from_summary_streaming(summary):
+                async for event in run_roadmap_from_summary_streaming(summary, owner_key=owner_key):
                     yield event
             finally:
                 pass  # No file cleanup needed for summary input
@@ -3,13 +3,10 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File
 from pydantic import BaseModel
 import traceback
-import tempfile
-import os
 
-from app.pipelines.builds.summarize_pipeline import (
-    summarize_pipeline_from_file,
-    summarize_pipeline_from_text
-)
+from app.pipelines.builds.summarize_pipeline import asummarize_pipeline_from_text
+from app.services.document_artifacts import adocument_text
+from app.utils.uploads import receive_document
 
 router = APIRouter(prefix="/summarize", tags=["summarize"])
 
@@ -35,7 +32,7 @@ async def summarize_text(request: SummarizeRequest):
         print(f"Received text: {len(request.text)} characters")
         print(f"Preview: {request.text[:100]}...")
         
-        summary = summarize_pipeline_from_text(request.text)
+        summary = await asummarize_pipeline_from_text(request.text)
         
         return SummarizeResponse(success=True, summary=summary)
     
@@ -58,31 +55,23 @@ async def summarize_file(file: UploadFile = File(...)):
         print(f"File: {file.filename}")
         print(f"Content-Type: {file.content_type}")
         
-        # Validate file type
-        allowed_types = {"application/pdf", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"}
-        if file.content_type not in allowed_types:
-            raise ValueError(f"Unsupported file type: {file.content_type}. Supported: PDF, DOCX")
-        
-        # Save file temporarily
-        with tempfile.NamedTemporaryFile(suffix=os.path.splitext(file.filename)[1], delete=False) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
-        print(f"Saved to temp: {tmp_path}")
-        print(f"File size: {len(content)} bytes")
+        # Validates the type from the content and keeps the upload in memory
+        upload = await receive_document(file)
+        print(f"File size: {upload.size} bytes")
         
         try:
-            # Run summarize pipeline with text extraction
-            summary = summarize_pipeline_from_file(tmp_path)
+            # Text of a document uploaded before is reused, otherwise extracted in the pool
+            text = await adocument_text(upload.ref)
+            if not text:
+                raise ValueError("Could not extract text from file")
+            summary = await asummarize_pipeline_from_text(text)
             return SummarizeResponse(success=True, summary=summary)
         
         finally:
-            # Clean up temp file
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-                print(f"Cleaned up temp file: {tmp_path}")
+            upload.close()
     
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"\n❌ ERROR in summarize_file: {str(e)}")
         print(traceback.format_exc())
@@ -3,6 +3,12 @@ from fastapi.responses import StreamingResponse
 import json
 import asyncio
 
+from app.utils.http_cache import get_response_cache
+from app.utils.research_cache import research_cache_stats
+from app.utils.extract_pool import extract_pool_stats
+from app.services.document_artifacts import document_artifacts_stats
+from app.utils.workers import run_in_worker
+
 router = APIRouter(
     prefix="/test",
     tags=["Test"]
@@ -43,3 +49,19 @@ async def test_stream():
         media_type="text/event-stream",
         headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
     )
+
+
+@router.get("/cache-stats")
+async def cache_stats():
+    """Hit rates and size of the upstream HTTP response cache, the research cache and document artifacts."""
+    cache = get_response_cache()
+    extra = {"research": research_cache_stats(), "documents": document_artifacts_stats()}
+    if cache is None:
+        return {"enabled": False, **extra}
+    return {"enabled": True, **await run_in_worker(cache.stats), **extra}
+
+
+@router.get("/extract-stats")
+async def extract_stats():
+    """Queue depth, outcomes and latency of the document extraction pool."""
+    return extract_pool_stats()
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Annotated
 import uuid
 
 
@@ -79,12 +79,24 @@ class FeasibilityPrediction(BaseModel):
     ml_score: float = Field(..., ge=0, le=100)
     confidence: float = Field(..., ge=0, le=1)
     risk_indicators: List[str] = Field(default_factory=list)
+    # Heuristic score used because the model was unavailable or failed
+    fallback: bool = False
 
 
 # ============================================================================
 # LANGGRAPH STATE
 # ============================================================================
 
+def merge_stage_timings(left: Dict[str, float], right: Dict[str, float]) -> Dict[str, float]:
+    """Reducer so parallel branches can each record their own stage timing."""
+    return {**(left or {}), **(right or {})}
+
+
+def merge_degraded_stages(left: List[str], right: List[str]) -> List[str]:
+    """Reducer collecting the stages that fell back to defaults, each once."""
+    return list(dict.fromkeys([*(left or []), *(right or [])]))
+
+
 class FeasibilityAssessmentState(BaseModel):
     """LangGraph state for feasibility assessment pipeline."""
     
@@ -111,6 +123,13 @@ class FeasibilityAssessmentState(BaseModel):
     key_risks: List[str] = Field(default_factory=list)
     recommendations: List[str] = Field(default_factory=list)
     detailed_report: Optional[str] = None
+    
+    # Wall-clock seconds per stage (merged across parallel branches)
+    stage_timings: Annotated[Dict[str, float], merge_stage_timings] = Field(default_factory=dict)
+    
+    # Stages that failed and used fallback values (ML model, search, LLM);
+    # such results are returned but never cached or stored
+    degraded_stages: Annotated[List[str], merge_degraded_stages] = Field(default_factory=list)
 
 
 # ============================================================================
@@ -146,3 +165,5 @@ class FeasibilityReport(BaseModel):
     # Metadata
     assessment_timestamp: Optional[str] = None
     assessment_model_version: str = "2.0"
+    stage_timings: Dict[str, float] = Field(default_factory=dict)
+    degraded_stages: List[str] = Field(default_factory=list)
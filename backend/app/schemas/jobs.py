@@ -0,0 +1,35 @@
+"""Background job request and response schemas."""
+
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+
+
+class JobSubmitRequest(BaseModel):
+    """Request model for submitting a pipeline run as a background job."""
+    kind: str
+    params: Dict[str, Any] = Field(default_factory=dict)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "kind": "roadmap_from_summary",
+                "params": {"summary": "We want to build a mobile app for fitness tracking..."}
+            }
+        }
+
+
+class JobOut(BaseModel):
+    """Public view of a job; params, upload path and owner stay server-side."""
+    id: str
+    kind: str
+    status: str
+    attempts: int
+    created_at: float
+    updated_at: float
+    heartbeat_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    model_config = {
+        "from_attributes": True
+    }
@@ -1,11 +1,16 @@
 """Roadmap request schemas."""
 
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class RoadmapFromSummaryRequest(BaseModel):
     """Request model for generating roadmap from text summary."""
     summary: str
+    # Client-chosen id, scoped to the authenticated user; regenerations with
+    # the same id reuse unchanged stages (ignored for anonymous requests)
+    project_id: Optional[str] = None
     
     class Config:
         json_schema_extra = {
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark keyword feature extraction: per-keyword scans vs. the compiled extractor.
+Run from backend directory: python -m app.scripts.benchmark_feature_extractor [iterations]
+
+The legacy path runs one `keyword in text` scan per keyword per rule (what the
+old `_estimate_*` helpers did); the extractor scans the text once with the
+compiled automaton. Also times the batch API on many summary-sized texts.
+"""
+
+import random
+import sys
+import timeit
+
+from app.utils.feature_extractor import FeatureExtractor, SCORE_RULES, FLAG_RULES, DEFAULT_FIELDS
+
+SAMPLE_SENTENCES = [
+    "The platform helps small clinics schedule appointments and track patient follow-ups.",
+    "We plan to build a mobile app backed by a cloud server and a shared database.",
+    "Existing datasets from partner hospitals are available for training the model.",
+    "The main challenge is integrating with legacy record systems used by each clinic.",
+    "A pilot with three clinics will be run before the public launch.",
+    "Results will be compared against a baseline of manual scheduling.",
+    "Privacy regulations and data sharing agreements need careful review.",
+    "The team has experience with web development but limited machine learning background.",
+    "Our objective is to reduce missed appointments by a clearly defined margin.",
+    "Deployment should be lightweight so clinics can run it on existing hardware.",
+]
+
+
+def _legacy_fields(text: str) -> dict:
+    """Field estimation as the old per-keyword `_estimate_*` helpers did it."""
+    text = text.lower()
+    fields = {}
+    for field, (positive, negative, divisor) in SCORE_RULES.items():
+        positive_hits = sum(1 for keyword in positive if keyword in text)
+        negative_hits = sum(1 for keyword in negative if keyword in text)
+        fields[field] = max(1, min(5, 3 + (positive_hits - negative_hits) // divisor))
+    for field, keywords in FLAG_RULES.items():
+        fields[field] = 1 if any(keyword in text for keyword in keywords) else 0
+    fields.update(DEFAULT_FIELDS)
+    return fields
+
+
+def _document(n_chars: int, rng: random.Random) -> str:
+    parts = []
+    size = 0
+    while size < n_chars:
+        sentence = rng.choice(SAMPLE_SENTENCES)
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(parts)
+
+
+def _best(fn, iterations: int) -> float:
+    """Best per-call time (seconds) over 5 repeats."""
+    return min(timeit.repeat(fn, number=iterations, repeat=5)) / iterations
+
+
+def benchmark(iterations: int = 50):
+    """Print per-document extraction cost across document sizes."""
+    rng = random.Random(0)
+    extractor = FeatureExtractor()
+    
+    print("=" * 80)
+    print(f"FEATURE EXTRACTION BENCHMARK ({iterations} iterations, best of 5)")
+    print(f"{len(extractor.keywords)} unique keywords compiled into one pattern")
+    print("=" * 80)
+    print(f"{'document size':<20}{'per-keyword (ms)':>18}{'compiled (ms)':>16}{'speedup':>12}")
+    print("-" * 80)
+    
+    for n_chars in (500, 2_000, 10_000, 100_000, 1_000_000):
+        text = _document(n_chars, rng)
+        assert extractor.extract(text) == _legacy_fields(text)
+        runs = max(1, iterations * 2_000 // n_chars)
+        legacy = _best(lambda: _legacy_fields(text), runs)
+        compiled = _best(lambda: extractor.extract(text), runs)
+        print(f"{n_chars:>10,} chars{'':<4}{legacy * 1000:>18.3f}{compiled * 1000:>16.3f}{legacy / compiled:>11.1f}x")
+    
+    texts = [_document(rng.randint(300, 3_000), rng) for _ in range(500)]
+    assert extractor.extract_batch(texts) == [_legacy_fields(text) for text in texts]
+    legacy = _best(lambda: [_legacy_fields(text) for text in texts], 1)
+    single = _best(lambda: [extractor.extract(text) for text in texts], 1)
+    batch = _best(lambda: extractor.extract_batch(texts), 1)
+    
+    print("-" * 80)
+    print(f"Batch of {len(texts)} summaries:")
+    print(f"  per-keyword scans: {legacy * 1000:.2f} ms")
+    print(f"  extract() each:    {single * 1000:.2f} ms")
+    print(f"  extract_batch():   {batch * 1000:.2f} ms ({legacy / batch:.1f}x)")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
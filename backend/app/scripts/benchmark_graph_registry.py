@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request graph construction vs. the compile-once registry.
+Run from backend directory: python -m app.scripts.benchmark_graph_registry [iterations]
+
+For each registered graph, times building + compiling a fresh instance (what
+every request used to do) against fetching the shared instance from the
+registry (what requests do now).
+"""
+
+import sys
+import time
+
+from app.pipelines.registry import GRAPH_FACTORIES, build_graph, get_graph, clear_graphs
+
+
+def _time_per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def benchmark(iterations: int = 50):
+    """Print per-call cost of rebuilding each graph vs. the registry lookup."""
+    clear_graphs()
+    
+    print("=" * 80)
+    print(f"GRAPH REGISTRY BENCHMARK ({iterations} iterations per graph)")
+    print("=" * 80)
+    print(f"{'graph':<28}{'rebuild (ms)':>15}{'registry (ms)':>16}{'speedup':>12}")
+    print("-" * 80)
+    
+    total_rebuild = 0.0
+    total_registry = 0.0
+    for name in GRAPH_FACTORIES:
+        try:
+            get_graph(name)  # first compile, also imports the module
+        except Exception as e:
+            print(f"{name:<28} skipped ({e})")
+            continue
+        rebuild = _time_per_call(lambda: build_graph(name), iterations)
+        cached = _time_per_call(lambda: get_graph(name), iterations * 100)
+        total_rebuild += rebuild
+        total_registry += cached
+        print(f"{name:<28}{rebuild * 1000:>15.3f}{cached * 1000:>16.5f}{rebuild / cached:>11.0f}x")
+    
+    print("-" * 80)
+    print(f"{'total':<28}{total_rebuild * 1000:>15.3f}{total_registry * 1000:>16.5f}")
+    print("\nNote: a roadmap request previously compiled roadmap + scoping + research,")
+    print("and a chat-roadmap request compiled roadmap_from_chat + chat + research.")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Build the offline knowledge store used with WIKI_BACKEND=local.
+Run from backend directory: python -m app.scripts.build_knowledge_store <source> [<source> ...]
+
+Sources may be:
+  - .jsonl files with one {"title": ..., "text": ...} object per line
+    (e.g. WikiExtractor --json output for a dump subset)
+  - .txt / .md files, one article each, titled after the file name
+  - directories, scanned recursively for the above
+
+Writes to LOCAL_KNOWLEDGE_PATH (default ./knowledge.db); articles whose
+title is already stored are replaced.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, Tuple
+
+from app.utils.local_knowledge import LOCAL_KNOWLEDGE_PATH, LocalKnowledgeStore
+
+TEXT_SUFFIXES = {".txt", ".md"}
+BATCH_SIZE = 500
+
+
+def iter_articles(path: Path) -> Iterator[Tuple[str, str]]:
+    if path.is_dir():
+        for child in sorted(path.rglob("*")):
+            if child.is_file() and (child.suffix in TEXT_SUFFIXES or child.suffix == ".jsonl"):
+                yield from iter_articles(child)
+    elif path.suffix == ".jsonl":
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("title") and record.get("text"):
+                    yield record["title"], record["text"]
+    elif path.suffix in TEXT_SUFFIXES:
+        yield path.stem.replace("_", " "), path.read_text(encoding="utf-8")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(2)
+
+    store = LocalKnowledgeStore(LOCAL_KNOWLEDGE_PATH)
+    started = time.perf_counter()
+    total = 0
+    batch = []
+    for source in sys.argv[1:]:
+        for article in iter_articles(Path(source)):
+            batch.append(article)
+            if len(batch) >= BATCH_SIZE:
+                total += store.add_articles(batch)
+                batch = []
+                print(f"[KnowledgeStore] {total} articles...")
+    total += store.add_articles(batch)
+    store.optimize()
+
+    stats = store.stats()
+    print(
+        f"[KnowledgeStore] Added {total} articles in {time.perf_counter() - started:.1f}s; "
+        f"{LOCAL_KNOWLEDGE_PATH} holds {stats['articles']} articles, {stats['sentences']} sentences"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import google.generativeai as genai
 import uuid
 import xml.etree.ElementTree as ET
 from app.config import settings
+from app.utils.http_cache import get_response_cache, normalize_key
 
 # --------------------------
 # CONFIG
@@ -83,24 +84,45 @@ def fetch_arxiv(category, max_results=50):
         f"search_query=cat:{category}&start=0&max_results={max_results}"
     )
 
+    cache = get_response_cache()
+    key = normalize_key("arxiv", url)
+    cached = cache.lookup("arxiv", key) if cache else None
+    if cached is not None and cached.fresh:
+        print(f"  Using cached feed for {category}")
+        cache.record("arxiv", "hit")
+        return cached.body.decode("utf-8")
+
+    headers = {"User-Agent": "Mozilla/5.0 (compatible; FeasibilityBot/1.0)"}
+    if cache:
+        headers.update(cache.conditional_headers(cached))
+
     for attempt in range(3):
         try:
             print(f"  Attempting to fetch from: {url}")
             r = requests.get(
                 url,
                 timeout=15,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (compatible; FeasibilityBot/1.0)"
-                }
+                headers=headers
             )
 
             print(f"  Status code: {r.status_code}")
+
+            if r.status_code == 304 and cached is not None:
+                cache.refresh(key)
+                cache.record("arxiv", "revalidated")
+                return cached.body.decode("utf-8")
             
             if r.status_code == 200:
                 if len(r.text) == 0:
                     print(f"  Empty response received. Retrying...")
                     time.sleep(3)
                     continue
+                if cache:
+                    cache.record("arxiv", "miss")
+                    cache.store(
+                        "arxiv", key, url, r.content,
+                        r.headers.get("ETag"), r.headers.get("Last-Modified"),
+                    )
                 return r.text
 
             if r.status_code == 429:
@@ -115,6 +137,10 @@ def fetch_arxiv(category, max_results=50):
             print(f"  Request error on attempt {attempt+1}: {e}")
             time.sleep(2)
 
+    if cached is not None:
+        print(f"  arXiv unavailable; using stale cached feed for {category}")
+        cache.record("arxiv", "stale")
+        return cached.body.decode("utf-8")
     raise Exception(f"arXiv fetch failed after 3 attempts for category {category}")
 
 
@@ -221,4 +247,8 @@ if __name__ == "__main__":
     else:
         print("No papers found. Skipping storage.")
 
+    cache = get_response_cache()
+    if cache:
+        print(f"arXiv cache: {cache.stats()['sources'].get('arxiv', {})}")
+
     print("Done.")
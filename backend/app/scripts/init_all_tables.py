@@ -4,6 +4,7 @@ from app.database import engine, Base
 # Import all model modules to register tables with Base.metadata
 from app.models import user  # noqa: F401
 from app.models import chat  # noqa: F401
+from app.models import result  # noqa: F401
 
 
 async def create_all_tables():
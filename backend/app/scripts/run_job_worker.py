@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Run a standalone background job worker.
+Run from backend directory: python -m app.scripts.run_job_worker [concurrency]
+
+Uses the same JOB_BROKER_URL as the API. Start the API with
+JOB_WORKER_MODE=external to leave all job execution to these processes.
+"""
+
+import asyncio
+import sys
+
+from app.jobs.worker import JobWorker, JOB_WORKER_CONCURRENCY
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else JOB_WORKER_CONCURRENCY
+    worker = JobWorker(concurrency=concurrency)
+    try:
+        asyncio.run(worker.run())
+    except KeyboardInterrupt:
+        print("\n[JobWorker] Stopped")
+
+
+if __name__ == "__main__":
+    main()
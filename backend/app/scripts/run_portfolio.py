@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Assess a portfolio of projects from a CSV file.
+Run from backend directory: python -m app.scripts.run_portfolio portfolio.csv [--out results.ndjson]
+
+Columns are StructuredFeasibilityInput fields (list fields separated by ';').
+Results are written as NDJSON, one line per project as it finishes, followed
+by a summary line.
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.pipelines.builds.feasibility_portfolio import (
+    PORTFOLIO_MAX_CONCURRENCY,
+    parse_portfolio_csv,
+    run_feasibility_portfolio,
+)
+from app.utils.streaming import format_ndjson
+
+
+async def run(csv_path: str, out, concurrency: int, refresh: bool) -> int:
+    with open(csv_path, encoding="utf-8-sig") as f:
+        rows, errors = parse_portfolio_csv(f.read())
+
+    failed = 0
+    async for record in run_feasibility_portfolio(rows, errors, concurrency=concurrency, refresh=refresh):
+        out.write(format_ndjson(record))
+        out.flush()
+        if record["type"] == "summary":
+            failed = record["failed"]
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch feasibility assessment from a CSV portfolio")
+    parser.add_argument("csv_path", help="Portfolio CSV file")
+    parser.add_argument("--out", help="Write NDJSON here instead of stdout")
+    parser.add_argument("--concurrency", type=int, default=PORTFOLIO_MAX_CONCURRENCY,
+                        help="Projects assessed by the LLM at once")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached reports")
+    args = parser.parse_args()
+
+    # Keep stdout clean for NDJSON; pipeline progress goes to stderr
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    if out is sys.stdout:
+        sys.stdout = sys.stderr
+    try:
+        failed = asyncio.run(run(args.csv_path, out, args.concurrency, args.refresh))
+    finally:
+        if out is not sys.__stdout__:
+            out.close()
+        sys.stdout = sys.__stdout__
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
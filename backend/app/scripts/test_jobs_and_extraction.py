@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Checks for the background job broker/worker, the extraction process pool
+and the document artifacts coalescing.
+Run from backend directory: python -m app.scripts.test_jobs_and_extraction
+
+Uses a throwaway SQLite broker and temporary files; needs no running API,
+database or LLM. Exits with status 1 if any check fails.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import traceback
+import uuid
+
+from app.jobs.broker import QUEUED, RUNNING, SUCCEEDED, FAILED, SQLiteJobBroker
+from app.services import document_artifacts
+from app.services.document_artifacts import DocumentArtifacts, aget_or_build
+from app.utils.extract_pool import ExtractionError, ExtractionPool
+
+
+def _temp_broker(tmp_dir: str) -> SQLiteJobBroker:
+    return SQLiteJobBroker(os.path.join(tmp_dir, f"jobs-{uuid.uuid4().hex[:6]}.db"))
+
+
+def _make_pdf(path: str, pages: int) -> str:
+    import fitz
+
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        for line in range(40):
+            page.insert_text((40, 40 + line * 18), f"Page {i + 1} line {line + 1}: feasibility roadmap extraction check")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def test_broker_claim_and_requeue():
+    """Jobs are claimed once in submit order, and stale running jobs go back to the queue."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        broker = _temp_broker(tmp_dir)
+        first = broker.submit("feasibility_from_summary", {"summary": "first"})
+        second = broker.submit("feasibility_from_summary", {"summary": "second"})
+        assert first.status == QUEUED and first.attempts == 0
+
+        claimed = broker.claim("worker-a")
+        assert claimed.id == first.id and claimed.status == RUNNING
+        assert claimed.worker_id == "worker-a" and claimed.attempts == 1
+        assert broker.claim("worker-b").id == second.id
+        assert broker.claim("worker-c") is None, "queue should be empty"
+
+        assert broker.append_event(first.id, "status", {"stage": "start"}) == 0
+        assert broker.append_event(first.id, "complete", {"score": 1}) == 1
+        assert [seq for seq, _, _ in broker.events(first.id, after=0)] == [1]
+        broker.finish(first.id, {"score": 1})
+        assert broker.get(first.id).status == SUCCEEDED
+
+        # Fresh heartbeat: not stale yet
+        broker.heartbeat(second.id)
+        assert broker.requeue_stale(60) == []
+        # worker-b went away: its job is requeued and claimed again (finished jobs are left alone)
+        assert broker.requeue_stale(0) == [second.id]
+        assert broker.get(second.id).status == QUEUED
+        reclaimed = broker.claim("worker-c")
+        assert reclaimed.id == second.id and reclaimed.attempts == 2
+        broker.finish(second.id, None, "boom")
+        assert broker.get(second.id).status == FAILED
+        assert broker.requeue_stale(0) == []
+
+
+def test_worker_upload_cleanup():
+    """A finished job's upload is deleted; a cancelled one keeps it; nothing outside JOB_UPLOAD_DIR is deleted."""
+    from app.jobs import handlers
+    from app.jobs.worker import JobWorker
+
+    seen_paths = []
+
+    async def finishes(params):
+        seen_paths.append(params.get("file_path"))
+        yield 'event: complete\ndata: {"ok": true}\n\n'
+
+    async def hangs(params):
+        yield 'event: status\ndata: {"stage": "start"}\n\n'
+        await asyncio.Event().wait()
+
+    async def run(tmp_dir: str):
+        broker = _temp_broker(tmp_dir)
+        worker = JobWorker(broker=broker, concurrency=1)
+
+        done_file = os.path.join(handlers.JOB_UPLOAD_DIR, "done.pdf")
+        open(done_file, "wb").close()
+        broker.submit("_check_finishes", {"file_path": "/ignored"}, done_file)
+        await worker.run_job(broker.claim(worker.worker_id))
+        assert seen_paths == [done_file], "handlers get the server-side upload path"
+        assert not os.path.exists(done_file), "upload of a finished job should be deleted"
+
+        outside = os.path.join(tmp_dir, "outside.txt")
+        open(outside, "wb").close()
+        broker.submit("_check_finishes", {}, os.path.join(handlers.JOB_UPLOAD_DIR, "..", "outside.txt"))
+        await worker.run_job(broker.claim(worker.worker_id))
+        assert os.path.exists(outside), "files outside JOB_UPLOAD_DIR must never be deleted"
+
+        kept_file = os.path.join(handlers.JOB_UPLOAD_DIR, "kept.pdf")
+        open(kept_file, "wb").close()
+        job = broker.submit("_check_hangs", {}, kept_file)
+        task = asyncio.create_task(worker.run_job(broker.claim(worker.worker_id)))
+        while not broker.events(job.id):
+            await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+            raise AssertionError("run_job should re-raise the cancellation")
+        except asyncio.CancelledError:
+            pass
+        assert os.path.exists(kept_file), "upload of a cancelled job should be kept"
+        assert broker.get(job.id).status == RUNNING
+        assert broker.requeue_stale(0) == [job.id]
+
+    upload_dir = handlers.JOB_UPLOAD_DIR
+    handlers.JOB_HANDLERS["_check_finishes"] = finishes
+    handlers.JOB_HANDLERS["_check_hangs"] = hangs
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            handlers.JOB_UPLOAD_DIR = os.path.join(tmp_dir, "uploads")
+            os.makedirs(handlers.JOB_UPLOAD_DIR)
+            asyncio.run(run(tmp_dir))
+    finally:
+        handlers.JOB_UPLOAD_DIR = upload_dir
+        handlers.JOB_HANDLERS.pop("_check_finishes", None)
+        handlers.JOB_HANDLERS.pop("_check_hangs", None)
+
+
+def test_extraction_pool_failures():
+    """Timeouts, parse errors and crashed workers fail only their own document."""
+
+    async def reason(pool: ExtractionPool, path: str):
+        try:
+            await pool.extract(path, None)
+            return "completed"
+        except ExtractionError as e:
+            return e.reason
+
+    async def run(tmp_dir: str):
+        small = _make_pdf(os.path.join(tmp_dir, "small.pdf"), 1)
+        large = _make_pdf(os.path.join(tmp_dir, "large.pdf"), 400)
+        broken = os.path.join(tmp_dir, "broken.pdf")
+        with open(broken, "wb") as f:
+            f.write(b"%PDF-1.4 not really a pdf")
+
+        pool = ExtractionPool(size=1, timeout=30)
+        try:
+            result = await pool.extract(small, None)
+            assert "Page 1 line 1" in result.text
+            assert await reason(pool, broken) == "error"
+            # A parse error keeps the worker
+            assert pool.stats()["restarts"] == 0
+
+            # Kill the worker mid-document: that document fails, the next one gets a new worker
+            task = asyncio.create_task(reason(pool, large))
+            while pool.stats()["running"] == 0 or not multiprocessing.active_children():
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+            for child in multiprocessing.active_children():
+                if child.name == "extract-worker":
+                    child.kill()
+            assert await task == "crashed"
+            assert await reason(pool, small) == "completed"
+            assert pool.stats()["outcomes"]["crashed"] == 1
+        finally:
+            pool.shutdown()
+
+        slow = ExtractionPool(size=1, timeout=0.001)
+        try:
+            assert await reason(slow, large) == "timeout"
+            assert slow.stats()["restarts"] == 1
+        finally:
+            slow.shutdown()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        asyncio.run(run(tmp_dir))
+
+
+def test_document_artifacts_coalescing():
+    """Concurrent requests for the same document hash share one build."""
+    stored = {}
+
+    async def load_current_result(kind, owner_key, inputs_hash):
+        return stored.get((owner_key, inputs_hash))
+
+    async def save_result(kind, owner_key, inputs_hash, payload):
+        stored[(owner_key, inputs_hash)] = payload
+
+    async def run():
+        builds = []
+
+        async def build(previous):
+            builds.append(previous)
+            await asyncio.sleep(0.1)
+            return DocumentArtifacts(text="document text", fields={"summary": "a summary"})
+
+        doc_hash = uuid.uuid4().hex
+        results = await asyncio.gather(*(aget_or_build(doc_hash, build) for _ in range(5)))
+        assert len(builds) == 1, f"expected one build, got {len(builds)}"
+        assert all(result.fields["summary"] == "a summary" for result in results)
+
+        # Served from the store once the in-memory entry is gone
+        document_artifacts.clear_document_artifacts_cache()
+        assert (await aget_or_build(doc_hash, build)).text == "document text"
+        assert len(builds) == 1
+
+        # A failed build is reported to every waiter and not stored
+        async def failing(previous):
+            await asyncio.sleep(0.05)
+            raise RuntimeError("extraction failed")
+
+        other = uuid.uuid4().hex
+        outcomes = await asyncio.gather(*(aget_or_build(other, failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+        assert await document_artifacts.load_artifacts(other) is None
+
+    originals = (document_artifacts.load_current_result, document_artifacts.save_result)
+    document_artifacts.load_current_result, document_artifacts.save_result = load_current_result, save_result
+    try:
+        asyncio.run(run())
+    finally:
+        document_artifacts.load_current_result, document_artifacts.save_result = originals
+        document_artifacts.clear_document_artifacts_cache()
+
+
+CHECKS = [
+    test_broker_claim_and_requeue,
+    test_worker_upload_cleanup,
+    test_extraction_pool_failures,
+    test_document_artifacts_coalescing,
+]
+
+
+def main() -> int:
+    print("=" * 80)
+    print("JOBS AND EXTRACTION CHECKS")
+    print("=" * 80)
+    failed = 0
+    for check in CHECKS:
+        try:
+            check()
+            print(f"✓ {check.__name__}")
+        except Exception as e:
+            failed += 1
+            print(f"✗ {check.__name__}: {e}")
+            traceback.print_exc()
+    print("=" * 80)
+    print(f"{len(CHECKS) - failed}/{len(CHECKS)} checks passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,8 +6,9 @@ from sqlalchemy import update, func
 # sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 from app.models.chat import ChatSession, ChatMessage, SenderType, ChatSessionState
 from app.schemas.chat import ChatRequest, ChatResponse
-from app.utils.llm import call_llm
-from app.pipelines.builds.chat_agent import run_chat_turn, create_chat_graph, ChatState
+from app.utils.llm import acall_llm
+from app.pipelines.builds.chat_agent import run_chat_turn, ChatState
+from app.pipelines.registry import get_graph
 from fastapi import BackgroundTasks
 
 async def handle_chat(
@@ -141,16 +142,16 @@ async def handle_chat(
         seeded_state = None
 
     if seeded_state is not None:
-        graph = create_chat_graph()
+        graph = get_graph("chat")
         seeded_state.message_pairs = message_pairs
-        chat_state = graph.invoke(seeded_state)
+        chat_state = await graph.ainvoke(seeded_state)
         if isinstance(chat_state, dict):
             chat_state = ChatState(**chat_state)
     else:
         # pass pairs via initial state by calling graph directly
-        graph = create_chat_graph()
+        graph = get_graph("chat")
         start = ChatState(memory_text=combined_context, message_pairs=message_pairs)
-        chat_state = graph.invoke(start)
+        chat_state = await graph.ainvoke(start)
         if isinstance(chat_state, dict):
             chat_state = ChatState(**chat_state)
     reply_text = chat_state.reply_text or "Could you share more details?"
@@ -252,7 +253,7 @@ async def update_session_memory(session_id: str, db: AsyncSession):
     {joined_memory}
 
     Concise Summary:"""
-        new_memory = call_llm(summary_prompt)
+        new_memory = await acall_llm(summary_prompt)
 
     # Save new memory to session
     await db.execute(
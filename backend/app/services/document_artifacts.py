@@ -0,0 +1,213 @@
+"""Scoping artifacts of uploaded documents, keyed by the SHA-256 of their bytes.
+
+The same document is often uploaded to several endpoints in a row (summary,
+then roadmap, then feasibility). Its extracted text, summary and structured
+fields depend only on its content, so they are kept per content hash and
+every pipeline that starts from a file looks them up first:
+
+- an in-process LRU (`DOCUMENT_CACHE_SIZE` entries, `DOCUMENT_CACHE_TTL`
+  seconds) in front of the pipeline results table (kind
+  `document_artifacts`), so artifacts survive restarts and are shared with
+  external job workers
+- concurrent requests for the same hash share one run: the first one
+  extracts and summarizes, the others wait for its artifacts
+- stored artifacts are reused until the model version (see
+  `result_store.PIPELINE_VERSIONS`) or the extraction budget
+  (`long_document.document_char_budget`) changes
+
+Text-only artifacts (the summary endpoint only needs the text) are completed
+with the summary and fields by the first scoping run that follows.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+from app.services.long_document import document_char_budget
+from app.services.result_store import (
+    DOCUMENT_ARTIFACTS,
+    document_key,
+    load_current_result,
+    save_result,
+)
+from app.utils.cache import TTLCache, stable_hash
+from app.utils.extract_pool import aextract_text
+from app.utils.uploads import CHUNK_SIZE, is_upload_ref, resolve_upload
+from app.utils.workers import run_in_worker
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_CACHE_TTL = float(os.getenv("DOCUMENT_CACHE_TTL", "86400"))
+DOCUMENT_CACHE_SIZE = int(os.getenv("DOCUMENT_CACHE_SIZE", "256"))
+
+# IntermediateState fields produced by scoping besides the raw text
+FIELD_NAMES = ["summary", "initial_summary", "problem_statement", "domain", "goals", "prerequisites", "key_topics"]
+
+
+class DocumentArtifacts(BaseModel):
+    """Extracted text plus, once scoped, the summary and structured fields."""
+    text: Optional[str] = None
+    fields: Dict[str, Any] = Field(default_factory=dict)
+
+    @property
+    def scoped(self) -> bool:
+        return bool(self.fields.get("summary"))
+
+
+_cache = TTLCache(maxsize=DOCUMENT_CACHE_SIZE, ttl=DOCUMENT_CACHE_TTL)
+_lookups = {"memory": 0, "stored": 0, "coalesced": 0, "built": 0}
+# loop -> {document hash: future resolved when the running build finishes}
+_inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = weakref.WeakKeyDictionary()
+
+
+def _inputs_hash() -> str:
+    # Artifacts extracted under another character budget hold different text
+    return stable_hash({"extract_char_budget": document_char_budget()})
+
+
+def _file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def adocument_hash(file_path: Optional[str]) -> Optional[str]:
+    """SHA-256 of a document given as a path or `upload://` reference (None if unavailable)."""
+    if is_upload_ref(file_path):
+        upload = resolve_upload(file_path)
+        return upload.sha256 if upload else None
+    if not file_path or not os.path.isfile(file_path):
+        return None
+    return await run_in_worker(_file_sha256, file_path)
+
+
+async def load_artifacts(doc_hash: str) -> Optional[DocumentArtifacts]:
+    """Artifacts of a document from memory, else from the results table."""
+    artifacts = _cache.get(doc_hash)
+    if artifacts is not None:
+        return artifacts
+    payload = await load_current_result(DOCUMENT_ARTIFACTS, document_key(doc_hash), _inputs_hash())
+    if not payload:
+        return None
+    try:
+        artifacts = DocumentArtifacts(**payload)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable document artifacts for {doc_hash[:12]}: {e}")
+        return None
+    _cache.set(doc_hash, artifacts)
+    return artifacts
+
+
+async def save_artifacts(doc_hash: str, artifacts: DocumentArtifacts) -> None:
+    _cache.set(doc_hash, artifacts)
+    await save_result(DOCUMENT_ARTIFACTS, document_key(doc_hash), _inputs_hash(), artifacts.model_dump())
+
+
+def _pending() -> Dict[str, asyncio.Future]:
+    loop = asyncio.get_running_loop()
+    pending = _inflight.get(loop)
+    if pending is None:
+        pending = {}
+        _inflight[loop] = pending
+    return pending
+
+
+async def aget_or_build(
+    doc_hash: str,
+    build: Callable[[Optional[DocumentArtifacts]], Awaitable[DocumentArtifacts]],
+    scoped: bool = True,
+) -> DocumentArtifacts:
+    """
+    Stored artifacts of a document, or the result of `build` (stored when usable).
+
+    `build` receives whatever partial artifacts exist (e.g. text without a
+    summary) and runs at most once at a time per hash: concurrent callers
+    wait for it and share its artifacts or its error.
+
+    Args:
+        doc_hash: SHA-256 of the document bytes
+        build: Produces the artifacts from the previous (partial) ones
+        scoped: Whether the summary and fields are needed, or only the text
+    """
+    pending = _pending()
+    coalesced = False
+    while True:
+        in_memory = _cache.get(doc_hash) is not None
+        artifacts = await load_artifacts(doc_hash)
+        if artifacts and artifacts.text and (artifacts.scoped or not scoped):
+            _lookups["coalesced" if coalesced else "memory" if in_memory else "stored"] += 1
+            print(f"[DocumentArtifacts] {doc_hash[:12]}: reusing {'scoped' if artifacts.scoped else 'text-only'} artifacts")
+            return artifacts
+        running = pending.get(doc_hash)
+        if running is None:
+            break
+        # Wait for the running build, then look again (it may have only produced text)
+        print(f"[DocumentArtifacts] {doc_hash[:12]}: waiting for the run in progress")
+        coalesced = True
+        result = await asyncio.shield(running)
+        if result is not None and (result.scoped or not scoped):
+            _lookups["coalesced"] += 1
+            return result
+
+    future = asyncio.get_running_loop().create_future()
+    # Waiters re-raise the error themselves; keep asyncio from reporting it as unretrieved
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    pending[doc_hash] = future
+    _lookups["built"] += 1
+    try:
+        artifacts = await build(artifacts)
+        # Nothing worth keeping when extraction or the LLM came back empty
+        if artifacts.text and (artifacts.scoped or not scoped):
+            await save_artifacts(doc_hash, artifacts)
+        future.set_result(artifacts)
+        return artifacts
+    except asyncio.CancelledError:
+        # Another waiter takes over the build
+        future.set_result(None)
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        pending.pop(doc_hash, None)
+
+
+async def adocument_text(file_path: str) -> Optional[str]:
+    """Extracted text of a document, shared with every other upload of the same bytes."""
+    doc_hash = await adocument_hash(file_path)
+    if doc_hash is None:
+        return await aextract_text(file_path, document_char_budget())
+
+    async def build(previous: Optional[DocumentArtifacts]) -> DocumentArtifacts:
+        return DocumentArtifacts(text=await aextract_text(file_path, document_char_budget()))
+
+    return (await aget_or_build(doc_hash, build, scoped=False)).text
+
+
+def document_artifacts_stats() -> Dict[str, object]:
+    """In-memory entries and how lookups were served (memory, stored, coalesced, built)."""
+    return {**_cache.stats(), "lookups": dict(_lookups)}
+
+
+def clear_document_artifacts_cache() -> None:
+    _cache.clear()
+
+
+__all__ = [
+    "DocumentArtifacts",
+    "FIELD_NAMES",
+    "adocument_hash",
+    "load_artifacts",
+    "save_artifacts",
+    "aget_or_build",
+    "adocument_text",
+    "document_artifacts_stats",
+    "clear_document_artifacts_cache",
+]
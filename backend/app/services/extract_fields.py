@@ -1,7 +1,7 @@
 import json
 import re
 
-from app.utils.llm import call_llm
+from app.utils.llm import call_llm, acall_llm
 
 
 from app.schemas.intermediate import IntermediateState
@@ -42,14 +42,8 @@ def _extract_json_string(s: str) -> str:
 
 
 
-def extract_fields_from_summary(summary: str):
-    """Extract structured fields from summary text.
-    
-    Returns a dict with fields: problem_statement, domain, goals (list), 
-    key_topics (list), prerequisites (list).
-    """
-    
-    prompt = f"""Extract fields from this summary as JSON. Lists must be arrays.
+def _extract_fields_prompt(summary: str) -> str:
+    return f"""Extract fields from this summary as JSON. Lists must be arrays.
 
 {{"problem_statement": "...", "domain": "...", "goals": [...], "key_topics": [...], "prerequisites": [...]}}
 
@@ -57,7 +51,8 @@ Summary: {summary[:3000]}
 
 JSON ONLY:"""
 
-    response = call_llm(prompt)
+
+def _parse_extracted_fields(response: str) -> dict:
     cleaned = _extract_json_string(response)
     
     try:
@@ -90,6 +85,20 @@ JSON ONLY:"""
         return {"problem_statement": "", "domain": "", "goals": [], "key_topics": [], "prerequisites": []}
 
 
+def extract_fields_from_summary(summary: str):
+    """Extract structured fields from summary text.
+    
+    Returns a dict with fields: problem_statement, domain, goals (list), 
+    key_topics (list), prerequisites (list).
+    """
+    return _parse_extracted_fields(call_llm(_extract_fields_prompt(summary)))
+
+
+async def aextract_fields_from_summary(summary: str):
+    """Async variant of `extract_fields_from_summary`."""
+    return _parse_extracted_fields(await acall_llm(_extract_fields_prompt(summary)))
+
+
 
 
 def detect_missing_fields(state: IntermediateState):
@@ -75,76 +75,100 @@ class FeasibilityPredictor:
         Returns:
             FeasibilityPrediction with score and confidence
         """
+        return self.predict_batch([input_data])[0]
+    
+    def predict_batch(self, inputs: List[StructuredFeasibilityInput]) -> List[FeasibilityPrediction]:
+        """
+        Predict feasibility scores for many inputs with a single model call.
+        
+        All rows go through one DataFrame, so numeric conversion, feature
+        alignment and label encoding are vectorized column operations.
+        
+        Args:
+            inputs: StructuredFeasibilityInput rows
+        
+        Returns:
+            One FeasibilityPrediction per input, in input order; heuristic
+            scores (model unavailable or failed) have `fallback` set
+        """
+        if not inputs:
+            return []
+        
         if self.model is None:
             logger.warning("Model not loaded. Returning fallback scoring.")
-            return self._fallback_scoring(input_data)
+            return [self._fallback_scoring(input_data) for input_data in inputs]
         
         try:
-            # Convert input to DataFrame
-            data_dict = input_data.dict(exclude={'project_id', 'summary', 'key_challenges', 'key_opportunities'})
-            df = pd.DataFrame([data_dict])
-            
-            # Convert all columns to numeric where possible (except categorical)
-            for col in df.columns:
-                if col not in (self.label_encoders.keys() if self.label_encoders else []):
-                    try:
-                        df[col] = pd.to_numeric(df[col])
-                    except (ValueError, TypeError):
-                        # Column is not numeric, keep as-is
-                        pass
-            
-            # Ensure features match training data
-            if self.feature_names:
-                for col in self.feature_names:
-                    if col not in df.columns:
-                        logger.warning(f"Feature {col} missing from input. Using 0.")
-                        df[col] = 0
-                
-                # Select only features used during training
-                df = df[self.feature_names]
-            
-            # Encode categorical features if needed
-            if self.label_encoders:
-                for col, encoder in self.label_encoders.items():
-                    if col in df.columns:
-                        try:
-                            # Handle unseen categories by using the first class
-                            values = df[col].astype(str)
-                            encoded_values = []
-                            for val in values:
-                                if val in encoder.classes_:
-                                    encoded_values.append(encoder.transform([val])[0])
-                                else:
-                                    # Use first class index (0) for unseen values
-                                    logger.warning(f"Unseen category '{val}' in {col}. Using default value.")
-                                    encoded_values.append(0)
-                            df[col] = encoded_values
-                        except Exception as e:
-                            logger.warning(f"Could not encode {col}: {e}")
-                            df[col] = 0
+            df = self._build_features(inputs)
             
             # Make prediction
-            prediction = self.model.predict(df)[0]
+            predictions = self.model.predict(df)
             
+        except Exception as e:
+            logger.error(f"Error during prediction: {e}")
+            return [self._fallback_scoring(input_data) for input_data in inputs]
+        
+        results = []
+        for input_data, prediction in zip(inputs, predictions):
             # Ensure prediction is in valid range
             ml_score = max(0, min(100, float(prediction)))
             
-            # Calculate confidence (simplified)
-            confidence = self._calculate_confidence(input_data)
-            
-            # Identify risk indicators
-            risk_indicators = self._identify_risks(input_data)
-            
-            return FeasibilityPrediction(
+            results.append(FeasibilityPrediction(
                 project_id=input_data.project_id,
                 ml_score=ml_score,
-                confidence=confidence,
-                risk_indicators=risk_indicators
-            )
+                confidence=self._calculate_confidence(input_data),
+                risk_indicators=self._identify_risks(input_data)
+            ))
+        return results
+    
+    def _build_features(self, inputs: List[StructuredFeasibilityInput]) -> pd.DataFrame:
+        """Build the model's feature matrix (one row per input)."""
+        # Convert inputs to DataFrame
+        rows = [
+            input_data.dict(exclude={'project_id', 'summary', 'key_challenges', 'key_opportunities'})
+            for input_data in inputs
+        ]
+        df = pd.DataFrame(rows)
+        
+        # Convert all columns to numeric where possible (except categorical)
+        categorical = set(self.label_encoders.keys()) if self.label_encoders else set()
+        for col in df.columns:
+            if col not in categorical:
+                try:
+                    df[col] = pd.to_numeric(df[col])
+                except (ValueError, TypeError):
+                    # Column is not numeric, keep as-is
+                    pass
+        
+        # Ensure features match training data
+        if self.feature_names:
+            for col in self.feature_names:
+                if col not in df.columns:
+                    logger.warning(f"Feature {col} missing from input. Using 0.")
+                    df[col] = 0
             
-        except Exception as e:
-            logger.error(f"Error during prediction: {e}")
-            return self._fallback_scoring(input_data)
+            # Select only features used during training
+            df = df[self.feature_names].copy()
+        
+        # Encode categorical features if needed
+        if self.label_encoders:
+            for col, encoder in self.label_encoders.items():
+                if col in df.columns:
+                    try:
+                        # Same indices as encoder.transform, looked up for the whole column
+                        class_index = {str(cls): i for i, cls in enumerate(encoder.classes_)}
+                        values = df[col].astype(str)
+                        encoded = values.map(class_index)
+                        
+                        # Handle unseen categories by using the first class index (0)
+                        for val in values[encoded.isna()].unique():
+                            logger.warning(f"Unseen category '{val}' in {col}. Using default value.")
+                        df[col] = encoded.fillna(0).astype(int)
+                    except Exception as e:
+                        logger.warning(f"Could not encode {col}: {e}")
+                        df[col] = 0
+        
+        return df
     
     def _fallback_scoring(self, input_data: StructuredFeasibilityInput) -> FeasibilityPrediction:
         """Calculate feasibility score using simple heuristics if model unavailable."""
@@ -173,7 +197,8 @@ class FeasibilityPredictor:
             project_id=input_data.project_id,
             ml_score=ml_score,
             confidence=0.6,  # Lower confidence for fallback
-            risk_indicators=risk_indicators
+            risk_indicators=risk_indicators,
+            fallback=True
         )
     
     def _calculate_confidence(self, input_data: StructuredFeasibilityInput) -> float:
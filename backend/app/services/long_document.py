@@ -0,0 +1,228 @@
+"""Map-reduce summarization for documents longer than one prompt.
+
+The single-call prompts only read the first few thousand characters of a
+document (`summarize_research.EXTRACT_INPUT_CHARS`). With `SUMMARY_MODE=auto`
+a longer document is condensed first:
+
+1. map: the text is split into chunks of at most `SUMMARY_CHUNK_TOKENS`
+   tokens, cut at section headings where possible, and every chunk is
+   summarized concurrently (bounded by the shared LLM limiter)
+2. reduce: while the chunk summaries do not fit the prompt window, groups of
+   `SUMMARY_REDUCE_FANIN` consecutive summaries are merged, again
+   concurrently; one level is usually enough
+3. the condensed notes go through the usual single-call prompt
+
+Map and every reduce level take one LLM round trip per `LLM_MAX_CONCURRENCY`
+calls, so the wall time grows with the document. At the defaults a
+`LONG_DOC_MAX_CHARS` document is 7-8 chunks: one map wave, at most one
+reduce level and the final prompt, two to three calls in a row instead of
+one. Longer budgets add map waves and reduce levels.
+
+Map-reduce is opt-in: the default `SUMMARY_MODE=single` keeps the
+truncating single call and the `EXTRACT_CHAR_BUDGET` early cutoff of
+extraction. In `auto` mode documents are extracted up to
+`LONG_DOC_MAX_CHARS` instead. Token counts are estimated at
+`CHARS_PER_TOKEN` characters per token.
+"""
+
+import asyncio
+import math
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.services.summarize_research import EXTRACT_INPUT_CHARS, asummarize_and_extract_fields
+from app.utils.extract import EXTRACT_CHAR_BUDGET
+from app.utils.llm import acall_llm
+
+# single: truncate to the prompt window; auto: map-reduce beyond it
+SUMMARY_MODE = os.getenv("SUMMARY_MODE", "single").lower()
+# Also the cap on text submitted to /summarize/text
+LONG_DOC_MAX_CHARS = int(os.getenv("LONG_DOC_MAX_CHARS", "48000"))
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "2000"))
+SUMMARY_REDUCE_FANIN = max(2, int(os.getenv("SUMMARY_REDUCE_FANIN", "5")))
+
+CHARS_PER_TOKEN = 4
+# Length asked of each chunk summary, and the bounds for merged summaries
+MAP_SUMMARY_WORDS = 120
+REDUCE_SUMMARY_WORDS = (100, 300)
+# Rough characters per word in summaries, used to size the reduce outputs
+CHARS_PER_WORD = 7
+
+_SECTION_NAMES = (
+    "abstract|summary|executive summary|introduction|background|motivation|problem statement|objectives?|goals|"
+    "related work|literature review|method(?:s|ology)?|approach|proposed (?:solution|system|method)|design|"
+    "architecture|implementation|evaluation|experiments?|results|discussion|limitations|risks|timeline|budget|"
+    "future work|conclusions?|references|bibliography|appendix"
+)
+_NAMED_HEADING = re.compile(rf"^(?:\d+(?:\.\d+)*\.?\s+)?(?:{_SECTION_NAMES})\b[^.!?]{{0,40}}$", re.IGNORECASE)
+_NUMBERED_HEADING = re.compile(r"^(?:\d+(?:\.\d+)*\.?|[IVXLC]+\.)\s+[A-Z][^.!?]{0,80}$")
+_MARKDOWN_HEADING = re.compile(r"^#{1,6}\s+\S")
+_CAPS_HEADING = re.compile(r"^[A-Z][A-Z0-9 &/,:\-]{3,60}$")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def is_heading(line: str) -> bool:
+    line = line.strip()
+    if not line or len(line) > 90:
+        return False
+    return bool(
+        _MARKDOWN_HEADING.match(line)
+        or _NAMED_HEADING.match(line)
+        or _NUMBERED_HEADING.match(line)
+        or _CAPS_HEADING.match(line)
+    )
+
+
+def split_sections(text: str) -> List[str]:
+    """Split text before every heading line; text before the first heading is its own section."""
+    sections: List[List[str]] = [[]]
+    for line in text.split("\n"):
+        if is_heading(line) and any(l.strip() for l in sections[-1]):
+            sections.append([])
+        sections[-1].append(line)
+    return [joined for joined in ("\n".join(lines).strip() for lines in sections) if joined]
+
+
+def _pack(pieces: Iterable[str], max_chars: int, sep: str = "\n") -> List[str]:
+    """Greedily join consecutive pieces into blocks of at most `max_chars`."""
+    blocks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for piece in pieces:
+        added = len(piece) + (len(sep) if current else 0)
+        if current and size + added > max_chars:
+            blocks.append(sep.join(current))
+            current, size, added = [], 0, len(piece)
+        current.append(piece)
+        size += added
+    if current:
+        blocks.append(sep.join(current))
+    return blocks
+
+
+def _fit(section: str, max_chars: int) -> List[str]:
+    """A section as pieces of at most `max_chars`, cut at lines, else at spaces."""
+    if len(section) <= max_chars:
+        return [section]
+    pieces = []
+    for line in section.split("\n"):
+        line = line.strip()
+        while len(line) > max_chars:
+            cut = line.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(line[:cut])
+            line = line[cut:].lstrip()
+        if line:
+            pieces.append(line)
+    return _pack(pieces, max_chars)
+
+
+def chunk_text(text: str, max_tokens: int = SUMMARY_CHUNK_TOKENS) -> List[str]:
+    """Chunks of at most `max_tokens` (estimated); consecutive short sections share a chunk."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces = [piece for section in split_sections(text) for piece in _fit(section, max_chars)]
+    return _pack(pieces, max_chars)
+
+
+def document_char_budget() -> Optional[int]:
+    """Characters to extract from an uploaded document for scoping/summarization."""
+    return EXTRACT_CHAR_BUDGET if SUMMARY_MODE == "single" else LONG_DOC_MAX_CHARS
+
+
+def is_long_document(text: Optional[str], window: int = EXTRACT_INPUT_CHARS) -> bool:
+    """Whether the text exceeds what a single prompt reads (and map-reduce is enabled)."""
+    return SUMMARY_MODE != "single" and bool(text) and len(text) > window
+
+
+def _map_prompt(chunk: str, index: int, total: int) -> str:
+    return f"""This is part {index + 1} of {total} of a project document or research paper.
+Summarize it in at most {MAP_SUMMARY_WORDS} words. Keep the problem, goals, methods, technologies,
+requirements, data, results and constraints it mentions. Plain text only.
+
+{chunk}"""
+
+
+def _reduce_prompt(summaries: List[str], words: int) -> str:
+    parts = "\n\n".join(summaries)
+    return f"""These are summaries of consecutive parts of one document.
+Merge them into a single summary of at most {words} words, in document order,
+keeping the problem, goals, methods, technologies, requirements and results. Plain text only.
+
+{parts}"""
+
+
+def _usable(response: Optional[str]) -> bool:
+    # acall_llm reports failures as "Error: ..." text
+    return bool(response) and not response.startswith("Error:")
+
+
+async def _summarize_all(prompts: List[str], fallbacks: List[str]) -> List[str]:
+    """Run the prompts concurrently; a failed call keeps the start of its input instead."""
+    responses = await asyncio.gather(*(acall_llm(prompt) for prompt in prompts))
+    fallback_chars = MAP_SUMMARY_WORDS * CHARS_PER_WORD
+    return [
+        response if _usable(response) else fallback[:fallback_chars]
+        for response, fallback in zip(responses, fallbacks)
+    ]
+
+
+async def acondense_document(text: str, window: int = EXTRACT_INPUT_CHARS) -> str:
+    """
+    Condense a long text into notes of at most `window` characters (map-reduce).
+
+    Args:
+        text: Full document text
+        window: Characters the prompt that reads the notes takes in
+
+    Returns:
+        Chunk summaries (merged as needed) in document order
+    """
+    started = time.perf_counter()
+    chunks = chunk_text(text)
+    summaries = await _summarize_all(
+        [_map_prompt(chunk, i, len(chunks)) for i, chunk in enumerate(chunks)], chunks
+    )
+    mapped = time.perf_counter()
+
+    levels = 0
+    while len(summaries) > 1 and len("\n\n".join(summaries)) > window:
+        groups = [summaries[i:i + SUMMARY_REDUCE_FANIN] for i in range(0, len(summaries), SUMMARY_REDUCE_FANIN)]
+        # Size the merged summaries so that together they fit the window
+        low, high = REDUCE_SUMMARY_WORDS
+        words = max(low, min(high, window // (CHARS_PER_WORD * len(groups))))
+        summaries = await _summarize_all(
+            [_reduce_prompt(group, words) for group in groups], ["\n\n".join(group) for group in groups]
+        )
+        levels += 1
+
+    notes = "\n\n".join(summaries)[:window]
+    print(
+        f"[LongDoc] {len(text)} chars -> {len(chunks)} chunks, {levels} reduce level(s), {len(notes)} chars of notes; "
+        f"map {mapped - started:.2f}s, reduce {time.perf_counter() - mapped:.2f}s"
+    )
+    return notes
+
+
+async def asummarize_and_extract_document(text: str) -> Tuple[str, Dict]:
+    """`asummarize_and_extract_fields` over the whole document, condensing long ones first."""
+    if is_long_document(text, EXTRACT_INPUT_CHARS):
+        text = await acondense_document(text, EXTRACT_INPUT_CHARS)
+    return await asummarize_and_extract_fields(text)
+
+
+__all__ = [
+    "SUMMARY_MODE",
+    "LONG_DOC_MAX_CHARS",
+    "estimate_tokens",
+    "split_sections",
+    "chunk_text",
+    "document_char_budget",
+    "is_long_document",
+    "acondense_document",
+    "asummarize_and_extract_document",
+]
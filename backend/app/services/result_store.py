@@ -0,0 +1,160 @@
+"""Persistence for generated feasibility reports and roadmaps.
+
+Results are stored per owner (chat session or uploaded document hash) along
+with the hash of the inputs they were generated from and the model version.
+A stored result is reused until the inputs or the model version change, or
+the client explicitly asks for a regeneration.
+"""
+
+import hashlib
+import logging
+from email.utils import format_datetime
+from datetime import timezone
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.future import select
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.result import PipelineResult
+from app.utils.cache import stable_hash
+
+logger = logging.getLogger(__name__)
+
+FEASIBILITY = "feasibility"
+ROADMAP = "roadmap"
+# Intermediate stage outputs of the last roadmap run (see roadmap_artifacts)
+ROADMAP_ARTIFACTS = "roadmap_artifacts"
+# Extracted text, summary and fields of an uploaded document (see document_artifacts)
+DOCUMENT_ARTIFACTS = "document_artifacts"
+
+# Bump when a pipeline's prompts/output format change so stored results regenerate
+PIPELINE_VERSIONS = {
+    FEASIBILITY: "2.0",
+    ROADMAP: "1.0",
+    ROADMAP_ARTIFACTS: "1.0",
+    DOCUMENT_ARTIFACTS: "1.0",
+}
+
+
+def session_key(session_id: int) -> str:
+    return f"session:{session_id}"
+
+
+def document_key(doc_hash: str) -> str:
+    return f"document:{doc_hash}"
+
+
+def project_key(project_id: str, user_id) -> str:
+    """Client-chosen project ids are only unique per user."""
+    return f"project:{user_id}:{project_id}"
+
+
+def document_hash(content: bytes) -> str:
+    """SHA-256 of the uploaded document bytes."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def current_model_version(kind: str) -> str:
+    return f"{kind}-{PIPELINE_VERSIONS[kind]}/{settings.LLM_MODEL}"
+
+
+async def load_result(kind: str, owner_key: str) -> Optional[PipelineResult]:
+    """Return the stored result for an owner, whatever inputs it was built from."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(PipelineResult).where(
+                PipelineResult.kind == kind,
+                PipelineResult.owner_key == owner_key,
+            )
+        )
+        return result.scalar_one_or_none()
+
+
+async def load_current_result(kind: str, owner_key: str, inputs_hash: str) -> Optional[Dict[str, Any]]:
+    """Return the stored payload only if it was built from these inputs with the current model."""
+    try:
+        record = await load_result(kind, owner_key)
+    except Exception as e:
+        logger.warning(f"Could not load stored {kind} result for {owner_key}: {e}")
+        return None
+    if record is None:
+        return None
+    if record.inputs_hash != inputs_hash or record.model_version != current_model_version(kind):
+        logger.info(f"Stored {kind} result for {owner_key} is stale; regenerating")
+        return None
+    return record.payload
+
+
+async def save_result(kind: str, owner_key: str, inputs_hash: str, payload: Dict[str, Any]) -> None:
+    """Insert or replace the stored result for an owner.
+
+    Failures are logged and swallowed: persistence must never break the
+    response that produced the result.
+    """
+    model_version = current_model_version(kind)
+    etag = stable_hash({"inputs_hash": inputs_hash, "model_version": model_version, "payload": payload})[:32]
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(PipelineResult).where(
+                    PipelineResult.kind == kind,
+                    PipelineResult.owner_key == owner_key,
+                )
+            )
+            record = result.scalar_one_or_none()
+            if record is None:
+                record = PipelineResult(kind=kind, owner_key=owner_key)
+                db.add(record)
+            record.inputs_hash = inputs_hash
+            record.model_version = model_version
+            record.etag = etag
+            record.payload = payload
+            await db.commit()
+        logger.info(f"Stored {kind} result for {owner_key}")
+    except Exception as e:
+        logger.error(f"Failed to store {kind} result for {owner_key}: {e}", exc_info=True)
+
+
+def result_response(record: PipelineResult, request: Request) -> Response:
+    """Serve a stored result with ETag / If-None-Match support."""
+    etag = f'"{record.etag}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    updated_at = record.updated_at or record.created_at
+    if updated_at is not None:
+        headers["Last-Modified"] = format_datetime(updated_at.replace(tzinfo=timezone.utc), usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse(
+        content={
+            "kind": record.kind,
+            "owner_key": record.owner_key,
+            "inputs_hash": record.inputs_hash,
+            "model_version": record.model_version,
+            "generated_at": updated_at.isoformat() if updated_at else None,
+            "result": record.payload,
+        },
+        headers=headers,
+    )
+
+
+__all__ = [
+    "FEASIBILITY",
+    "ROADMAP",
+    "ROADMAP_ARTIFACTS",
+    "DOCUMENT_ARTIFACTS",
+    "session_key",
+    "project_key",
+    "document_key",
+    "document_hash",
+    "current_model_version",
+    "load_result",
+    "load_current_result",
+    "save_result",
+    "result_response",
+]
@@ -0,0 +1,147 @@
+"""Intermediate artifacts of a roadmap run, kept for incremental regeneration.
+
+A roadmap is built in stages: structured fields are extracted from the
+summary (or chat), research enrichment runs on those fields, and every
+roadmap section is generated from the research. The artifacts of the last
+run for an owner (chat session or client-supplied project id) are stored
+with the pipeline results, and on the next run each stage is reused when
+its inputs did not change:
+
+- fields: same source text (summary / chat memory)
+- research: same problem statement, domain, goals, prerequisites and key
+  topics, i.e. every field enrichment reads (case, order and whitespace
+  ignored)
+- sections: same section prompt and same project summary (see
+  `roadmap_generator.agenerate_roadmap`)
+
+An edit whose extracted fields come out unchanged therefore skips research;
+any change to the fields reruns research (served largely from the research
+cache) and the sections. A regeneration whose context did not change reuses
+every valid section.
+
+Owners are chat sessions or project ids scoped to the authenticated user
+(`result_store.project_key`), so one caller never sees another's artifacts.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.research_state import ResearchState
+from app.services.result_store import (
+    ROADMAP_ARTIFACTS,
+    current_model_version,
+    load_result,
+    save_result,
+)
+from app.utils.cache import stable_hash
+
+logger = logging.getLogger(__name__)
+
+# Fields extracted from the source text that later stages read
+FIELD_NAMES = ["summary", "problem_statement", "domain", "goals", "prerequisites", "key_topics"]
+# Fields research enrichment consumes (queries and the synthesized report)
+RESEARCH_INPUTS = ["problem_statement", "domain", "goals", "prerequisites", "key_topics"]
+
+
+class RoadmapArtifacts(BaseModel):
+    """Everything a later run may reuse."""
+    source_hash: Optional[str] = None
+    fields: Dict[str, Any] = Field(default_factory=dict)
+    research_key: Optional[str] = None
+    research: Optional[Dict[str, Any]] = None
+    # heading -> {"key": section prompt hash, "text": section text}
+    sections: Dict[str, Dict[str, str]] = Field(default_factory=dict)
+
+
+def source_hash(text: Optional[str]) -> str:
+    """Hash of the text the fields are extracted from (whitespace-insensitive)."""
+    return stable_hash(" ".join((text or "").split()))
+
+
+def _norm(value: Optional[str]) -> str:
+    return " ".join((value or "").lower().split())
+
+
+def research_key(state: Any) -> str:
+    """Research is reused while every field it is built from stays the same."""
+    key: Dict[str, Any] = {}
+    for name in RESEARCH_INPUTS:
+        value = getattr(state, name, None)
+        if isinstance(value, list):
+            key[name] = sorted({_norm(str(v)) for v in value if _norm(str(v))})
+        else:
+            key[name] = _norm(value)
+    return stable_hash(key)
+
+
+def reusable_fields(previous: Optional[RoadmapArtifacts], text: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Previously extracted fields, if they came from the same source text."""
+    if previous and previous.fields and previous.source_hash == source_hash(text):
+        return previous.fields
+    return None
+
+
+def reusable_research(previous: Optional[RoadmapArtifacts], state: Any) -> Optional[ResearchState]:
+    """Previous research, if none of the fields it was built from changed (`state` carries them)."""
+    if previous and previous.research and previous.research_key == research_key(state):
+        try:
+            return ResearchState(**previous.research)
+        except Exception as e:
+            logger.warning(f"Stored research could not be loaded: {e}")
+    return None
+
+
+def build_artifacts(
+    text: Optional[str],
+    state: Any,
+    research: Optional[ResearchState],
+    sections: Dict[str, Dict[str, str]],
+) -> RoadmapArtifacts:
+    """Artifacts of a finished run (`state` carries the extracted fields)."""
+    return RoadmapArtifacts(
+        source_hash=source_hash(text),
+        fields={name: getattr(state, name, None) for name in FIELD_NAMES},
+        research_key=research_key(state),
+        research=research.model_dump() if research else None,
+        sections=sections,
+    )
+
+
+async def load_artifacts(owner_key: Optional[str]) -> Optional[RoadmapArtifacts]:
+    """Artifacts of the owner's last run with the current model, if any."""
+    if not owner_key:
+        return None
+    try:
+        record = await load_result(ROADMAP_ARTIFACTS, owner_key)
+    except Exception as e:
+        logger.warning(f"Could not load roadmap artifacts for {owner_key}: {e}")
+        return None
+    if record is None or record.model_version != current_model_version(ROADMAP_ARTIFACTS):
+        return None
+    try:
+        return RoadmapArtifacts(**record.payload)
+    except Exception as e:
+        logger.warning(f"Stored roadmap artifacts for {owner_key} are unreadable: {e}")
+        return None
+
+
+async def save_artifacts(owner_key: Optional[str], artifacts: RoadmapArtifacts) -> None:
+    """Store the artifacts of a run (failures are logged, never raised)."""
+    if not owner_key:
+        return
+    payload = artifacts.model_dump()
+    await save_result(ROADMAP_ARTIFACTS, owner_key, stable_hash(payload), payload)
+
+
+__all__ = [
+    "RoadmapArtifacts",
+    "source_hash",
+    "research_key",
+    "reusable_fields",
+    "reusable_research",
+    "build_artifacts",
+    "load_artifacts",
+    "save_artifacts",
+]
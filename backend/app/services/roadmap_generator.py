@@ -1,5 +1,31 @@
-from app.utils.llm import call_llm
+"""Roadmap generation.
+
+The roadmap has eight fixed sections (`HEADINGS`). By default
+(ROADMAP_MODE=sections) every section is generated by its own LLM call,
+all concurrently from the same research context, so wall-clock time is
+close to the slowest single section instead of one very long generation.
+Each section is checked as soon as it arrives and, if its heading or
+subsections are missing, only that section is generated again. A section
+still malformed after `ROADMAP_SECTION_RETRIES` extra attempts (e.g. every
+LLM call failed) raises `RoadmapGenerationError`, so callers never report
+or store a roadmap with empty sections.
+
+ROADMAP_MODE=single keeps the one-call roadmap and then repairs just the
+headings that came back missing or malformed.
+
+Callers can pass the previous run's sections (`sections_cache`); a section
+whose prompt is unchanged is reused instead of generated again.
+"""
+
+import asyncio
+import os
 import re
+import time
+from typing import Callable, Dict, List, Optional
+
+from app.utils.cache import stable_hash
+from app.utils.llm import acall_llm
+from app.utils.streaming import emit_event
 
 HEADINGS = [
     "1. Prototype Development",
@@ -12,44 +38,269 @@ HEADINGS = [
     "8. Scaling & Expansion",
 ]
 
+SUBSECTIONS = ["Objective:", "Key Actions:", "Metrics:", "Risks & Mitigations:"]
 
-def generate_roadmap(
+ROADMAP_MODE = os.getenv("ROADMAP_MODE", "sections")  # "sections" | "single"
+# Extra attempts for a section that comes back missing or malformed
+ROADMAP_SECTION_RETRIES = int(os.getenv("ROADMAP_SECTION_RETRIES", "1"))
+
+SECTION_FORMAT = (
+    "  Objective: one concise sentence\n"
+    "  Key Actions:\n"
+    "    - 3–6 bullets starting with strong verbs\n"
+    "  Metrics:\n"
+    "    - 2–4 measurable indicators\n"
+    "  Risks & Mitigations:\n"
+    "    - 1–3 bullets formatted \"Risk: ... | Mitigation: ...\"\n\n"
+)
+
+class RoadmapGenerationError(RuntimeError):
+    """Some roadmap sections were still missing or malformed after their retries."""
+
+    def __init__(self, headings: List[str]):
+        super().__init__(f"could not generate roadmap section(s): {', '.join(headings)}")
+        self.headings = headings
+
+
+# (heading, section text, attempt, valid) -> None; called as each section lands
+# (attempt 0 means the section was reused from a previous run)
+SectionCallback = Callable[[str, str, int, bool], None]
+
+
+def _primary_context(
     llm_report: str | None,
     consolidated: str | None,
     summary: str | None,
 ) -> str:
-    """
-    Generate a structured roadmap using highest-fidelity input only.
+    # Use only the highest-fidelity available source (llm_report already synthesized)
+    return llm_report or consolidated or summary or "(no context)"
 
-    Priority order: llm_report (already synthesized) > consolidated > summary.
-    Optimized for token efficiency by using only primary input.
-    Enforces canonical headings and structured subsections.
-    """
 
-    # Use only the highest-fidelity available source (llm_report already synthesized)
-    primary = llm_report or consolidated or summary or "(no context)"
-    
+def _roadmap_prompt(
+    llm_report: str | None,
+    consolidated: str | None,
+    summary: str | None,
+) -> str:
+    primary = _primary_context(llm_report, consolidated, summary)
+
     # Token-optimized prompt: remove redundant context layers
-    prompt = (
+    return (
         "You are an expert product strategist.\n"
         "Create a structured, actionable roadmap based on the research below.\n\n"
         "STRICT REQUIREMENTS:\n"
         "- Preserve EXACT headings (do not rename, reorder, add or remove):\n"
         f"{chr(10).join(HEADINGS)}\n\n"
         "For each heading include EXACT subsections in this order:\n"
-        "  Objective: one concise sentence\n"
-        "  Key Actions:\n"
-        "    - 3–6 bullets starting with strong verbs\n"
-        "  Metrics:\n"
-        "    - 2–4 measurable indicators\n"
-        "  Risks & Mitigations:\n"
-        "    - 1–3 bullets formatted \"Risk: ... | Mitigation: ...\"\n\n"
+        f"{SECTION_FORMAT}"
         "RESEARCH CONTENT:\n"
         f"{primary}\n\n"
         "Return ONLY the roadmap with the exact headings and subsections."
     )
 
-    # Call LLM and return as-is (no skeleton fallbacks)
-    response = call_llm(prompt) or ""
-    text = response.strip()
-    return text
+
+def _section_prompt(heading: str, primary: str) -> str:
+    others = [h for h in HEADINGS if h != heading]
+    return (
+        "You are an expert product strategist.\n"
+        "Write ONE section of a structured, actionable roadmap based on the research below.\n\n"
+        "STRICT REQUIREMENTS:\n"
+        f"- Start with the EXACT heading line: {heading}\n"
+        "- Cover only this phase; these sections are written separately:\n"
+        f"{chr(10).join(others)}\n\n"
+        "Include EXACT subsections in this order:\n"
+        f"{SECTION_FORMAT}"
+        "RESEARCH CONTENT:\n"
+        f"{primary}\n\n"
+        "Return ONLY this section with its heading and subsections."
+    )
+
+
+def _heading_pattern(heading: str) -> re.Pattern:
+    # Tolerates markdown decoration such as "## " or "**...**" around the heading
+    return re.compile(rf"^[#*_\s]*{re.escape(heading)}[*_:\s]*$", re.MULTILINE)
+
+
+_HEADING_PATTERNS = {heading: _heading_pattern(heading) for heading in HEADINGS}
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """Map each heading found in a roadmap to its body text."""
+    found = []
+    for heading, pattern in _HEADING_PATTERNS.items():
+        match = pattern.search(text or "")
+        if match:
+            found.append((match.start(), match.end(), heading))
+    found.sort()
+    sections: Dict[str, str] = {}
+    for i, (_, end, heading) in enumerate(found):
+        stop = found[i + 1][0] if i + 1 < len(found) else len(text)
+        sections[heading] = text[end:stop].strip()
+    return sections
+
+
+def is_valid_section(body: Optional[str]) -> bool:
+    """A section body is usable when it has every subsection, in order."""
+    if not body or body.startswith("Error:"):
+        return False
+    plain = body.replace("*", "").lower()
+    positions = [plain.find(sub.lower()) for sub in SUBSECTIONS]
+    return all(p >= 0 for p in positions) and positions == sorted(positions)
+
+
+def _section_text(heading: str, body: str) -> str:
+    return f"{heading}\n{body}".strip()
+
+
+def missing_sections(roadmap: str) -> List[str]:
+    """Headings that are absent from a roadmap or lack their subsections."""
+    sections = split_sections(roadmap)
+    return [h for h in HEADINGS if not is_valid_section(sections.get(h))]
+
+
+def emit_roadmap_section(heading: str, text: str, attempt: int, valid: bool) -> None:
+    """`SectionCallback` that streams each finished section as a `section` SSE event."""
+    emit_event("section", {
+        "heading": heading,
+        "index": HEADINGS.index(heading),
+        "content": text,
+        "attempt": attempt,
+        "valid": valid,
+    })
+
+
+async def agenerate_section(
+    heading: str,
+    primary: str,
+    on_section: Optional[SectionCallback] = None,
+    retries: int = ROADMAP_SECTION_RETRIES,
+) -> str:
+    """
+    Generate one roadmap section, regenerating it while it is malformed.
+
+    Raises RoadmapGenerationError when it is still malformed after `retries`.
+    """
+    text = heading
+    for attempt in range(1, retries + 2):
+        response = (await acall_llm(_section_prompt(heading, primary)) or "").strip()
+        # The model may omit the heading or add neighbours; keep just this section
+        body = split_sections(response).get(heading, response)
+        valid = is_valid_section(body)
+        if valid or not body.startswith("Error:"):
+            text = _section_text(heading, body)
+        if on_section:
+            on_section(heading, text, attempt, valid)
+        if valid:
+            return text
+        print(f"[Roadmap] section '{heading}' malformed (attempt {attempt})")
+    raise RoadmapGenerationError([heading])
+
+
+async def _repair_sections(
+    sections: Dict[str, str],
+    primary: str,
+    on_section: Optional[SectionCallback],
+) -> str:
+    """Generate the missing/malformed headings concurrently and assemble in order."""
+    todo = [h for h in HEADINGS if not is_valid_section(sections.get(h))]
+    # Let every section finish its attempts, then report all that failed at once
+    repaired = await asyncio.gather(*(agenerate_section(h, primary, on_section) for h in todo), return_exceptions=True)
+    failed = [h for h, result in zip(todo, repaired) if isinstance(result, RoadmapGenerationError)]
+    for result in repaired:
+        if isinstance(result, BaseException) and not isinstance(result, RoadmapGenerationError):
+            raise result
+    if failed:
+        raise RoadmapGenerationError(failed)
+    texts = {h: _section_text(h, sections[h]) for h in HEADINGS if h in sections}
+    texts.update(zip(todo, repaired))
+    return "\n\n".join(texts[h] for h in HEADINGS if h in texts)
+
+
+def section_key(heading: str, primary: str, summary: Optional[str] = None) -> str:
+    """Identity of a section's inputs: its prompt and the project summary it stands for."""
+    return stable_hash({"prompt": _section_prompt(heading, primary), "summary": " ".join((summary or "").split())})[:32]
+
+
+def _reusable_sections(
+    sections_cache: Optional[Dict[str, Dict[str, str]]],
+    primary: str,
+    summary: Optional[str],
+    on_section: Optional[SectionCallback],
+) -> Dict[str, str]:
+    """Bodies of cached sections whose prompt and summary did not change (and that are valid)."""
+    reused: Dict[str, str] = {}
+    for heading in HEADINGS:
+        cached = (sections_cache or {}).get(heading)
+        if not cached or cached.get("key") != section_key(heading, primary, summary):
+            continue
+        body = split_sections(cached.get("text") or "").get(heading)
+        if is_valid_section(body):
+            reused[heading] = body
+            if on_section:
+                on_section(heading, _section_text(heading, body), 0, True)
+    return reused
+
+
+async def agenerate_roadmap(
+    llm_report: str | None,
+    consolidated: str | None,
+    summary: str | None,
+    on_section: Optional[SectionCallback] = None,
+    mode: str = ROADMAP_MODE,
+    sections_cache: Optional[Dict[str, Dict[str, str]]] = None,
+) -> str:
+    """
+    Generate a structured roadmap using highest-fidelity input only.
+
+    Priority order: llm_report (already synthesized) > consolidated > summary.
+    Optimized for token efficiency by using only primary input.
+    Enforces canonical headings and structured subsections; only sections
+    that come back missing or malformed are generated again.
+
+    Args:
+        llm_report: Synthesized research report
+        consolidated: Consolidated research text
+        summary: Project summary
+        on_section: Called with every section as it completes
+        mode: "sections" (one concurrent call per heading) or "single"
+            (one call for the whole roadmap, then targeted repair)
+        sections_cache: Previous sections by heading ({"key", "text"});
+            unchanged ones are reused and the dict is updated in place
+
+    Raises:
+        RoadmapGenerationError: A section was still missing or malformed
+            after its retries
+    """
+    primary = _primary_context(llm_report, consolidated, summary)
+    started = time.perf_counter()
+    reused = _reusable_sections(sections_cache, primary, summary, on_section)
+
+    if len(reused) == len(HEADINGS):
+        roadmap = "\n\n".join(_section_text(h, reused[h]) for h in HEADINGS)
+    elif mode == "single" and not reused:
+        response = (await acall_llm(_roadmap_prompt(llm_report, consolidated, summary)) or "").strip()
+        sections = split_sections(response)
+        todo = [h for h in HEADINGS if not is_valid_section(sections.get(h))]
+        if todo:
+            print(f"[Roadmap] repairing {len(todo)} section(s): {', '.join(todo)}")
+        roadmap = await _repair_sections(sections, primary, on_section) if todo else response
+    else:
+        roadmap = await _repair_sections(reused, primary, on_section)
+
+    if sections_cache is not None:
+        for heading, body in split_sections(roadmap).items():
+            sections_cache[heading] = {"key": section_key(heading, primary, summary), "text": _section_text(heading, body)}
+
+    print(
+        f"[Roadmap] {mode} roadmap ready in {time.perf_counter() - started:.1f}s "
+        f"({len(reused)}/{len(HEADINGS)} sections reused)"
+    )
+    return roadmap
+
+
+def generate_roadmap(
+    llm_report: str | None,
+    consolidated: str | None,
+    summary: str | None,
+) -> str:
+    """Synchronous entry point for scripts; see `agenerate_roadmap`."""
+    return asyncio.run(agenerate_roadmap(llm_report, consolidated, summary))
@@ -3,16 +3,26 @@ Semantic search service using Qdrant to find relevant papers.
 """
 
 import logging
-from typing import List, Optional
+import os
+from typing import Dict, List, Optional
 
 import google.generativeai as genai
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, models
 
 from app.config import settings
 from app.schemas.feasibility_new import RelevantPaper, StructuredFeasibilityInput
 
 logger = logging.getLogger(__name__)
 
+# Texts per embedding request (the API caps batch requests at 100)
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "100"))
+# Queries per Qdrant batch request
+QDRANT_BATCH_SIZE = int(os.getenv("QDRANT_BATCH_SIZE", "64"))
+
+
+class SemanticSearchError(RuntimeError):
+    """Paper search could not run (no Qdrant client, embedding or query failure)."""
+
 
 class SemanticSearchService:
     """Search for relevant research papers using vector embeddings."""
@@ -55,6 +65,26 @@ class SemanticSearchService:
             logger.error(f"Error generating embedding: {e}")
             return None
 
+    def embed_texts(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Generate embeddings for many texts with batched Gemini requests."""
+        genai.configure(api_key=settings.GOOGLE_API_KEY)
+        embeddings: List[Optional[List[float]]] = []
+
+        for start in range(0, len(texts), EMBED_BATCH_SIZE):
+            batch = texts[start:start + EMBED_BATCH_SIZE]
+            try:
+                res = genai.embed_content(
+                    model=self.embedding_model,
+                    content=batch,
+                )
+                embeddings.extend(res["embedding"])
+
+            except Exception as e:
+                logger.error(f"Error generating embeddings for batch of {len(batch)}: {e}")
+                embeddings.extend([None] * len(batch))
+
+        return embeddings
+
     def search_papers(
         self,
         input_data: StructuredFeasibilityInput,
@@ -62,51 +92,106 @@ class SemanticSearchService:
     ) -> List[RelevantPaper]:
         """
         Search for papers relevant to the project.
+
+        Raises SemanticSearchError when the search could not run, so callers
+        can tell "no relevant papers" from a failed search.
         """
         if self.client is None:
-            logger.warning("Qdrant client not available.")
-            return []
+            raise SemanticSearchError("Qdrant client not available")
 
-        try:
-            search_query = self._create_search_query(input_data)
-            logger.info(f"Search query: {search_query[:100]}...")
+        search_query = self._create_search_query(input_data)
+        logger.info(f"Search query: {search_query[:100]}...")
 
-            query_embedding = self.embed_text(search_query)
-            if not query_embedding:
-                return []
+        query_embedding = self.embed_text(search_query)
+        if not query_embedding:
+            raise SemanticSearchError("could not embed the search query")
 
+        try:
             results = self.client.query_points(
                 collection_name=self.collection_name,
                 query=query_embedding,
                 limit=top_k,
                 score_threshold=0.5,
             )
+        except Exception as e:
+            raise SemanticSearchError(f"Qdrant query failed: {e}") from e
 
-            papers: List[RelevantPaper] = []
-
-            # ✅ Correct iteration
-            for point in results.points:
-                try:
-                    payload = point.payload or {}
-
-                    paper = RelevantPaper(
-                        title=payload.get("title", "Unknown"),
-                        summary=payload.get("summary", ""),
-                        link=payload.get("link", ""),
-                        relevance_score=point.score,
-                    )
-                    papers.append(paper)
+        papers = self._to_papers(results.points)
 
-                except Exception as e:
-                    logger.warning(f"Error processing search result: {e}")
-                    continue
+        logger.info(f"Found {len(papers)} relevant papers")
+        return papers
 
-            logger.info(f"Found {len(papers)} relevant papers")
-            return papers
+    def search_papers_batch(
+        self,
+        inputs: List[StructuredFeasibilityInput],
+        top_k: int = 5,
+    ) -> List[List[RelevantPaper]]:
+        """
+        Search papers for many projects at once.
 
-        except Exception as e:
-            logger.error(f"Error in search_papers: {e}")
-            return []
+        Identical search queries are embedded and searched only once; the
+        unique queries are embedded in batches and sent to Qdrant as batch
+        queries. Returns one paper list per input, in input order. Raises
+        SemanticSearchError if any query could not be embedded or searched.
+        """
+        if self.client is None:
+            raise SemanticSearchError("Qdrant client not available")
+
+        queries = [self._create_search_query(input_data) for input_data in inputs]
+        unique_queries = list(dict.fromkeys(queries))
+        logger.info(f"Batch search: {len(queries)} projects, {len(unique_queries)} unique queries")
+
+        embeddings = self.embed_texts(unique_queries)
+        missing = sum(1 for emb in embeddings if not emb)
+        if missing:
+            raise SemanticSearchError(f"could not embed {missing} of {len(unique_queries)} search queries")
+        embedded = list(zip(unique_queries, embeddings))
+
+        papers_by_query: Dict[str, List[RelevantPaper]] = {}
+        for start in range(0, len(embedded), QDRANT_BATCH_SIZE):
+            batch = embedded[start:start + QDRANT_BATCH_SIZE]
+            try:
+                responses = self.client.query_batch_points(
+                    collection_name=self.collection_name,
+                    requests=[
+                        models.QueryRequest(
+                            query=emb,
+                            limit=top_k,
+                            score_threshold=0.5,
+                            with_payload=True,
+                        )
+                        for _, emb in batch
+                    ],
+                )
+                for (query, _), response in zip(batch, responses):
+                    papers_by_query[query] = self._to_papers(response.points)
+
+            except Exception as e:
+                raise SemanticSearchError(f"Qdrant batch query failed: {e}") from e
+
+        return [list(papers_by_query[query]) for query in queries]
+
+    def _to_papers(self, points) -> List[RelevantPaper]:
+        """Convert Qdrant points to RelevantPaper results."""
+        papers: List[RelevantPaper] = []
+
+        for point in points:
+            try:
+                payload = point.payload or {}
+
+                paper = RelevantPaper(
+                    title=payload.get("title", "Unknown"),
+                    summary=payload.get("summary", ""),
+                    link=payload.get("link", ""),
+                    relevance_score=point.score,
+                )
+                papers.append(paper)
+
+            except Exception as e:
+                logger.warning(f"Error processing search result: {e}")
+                continue
+
+        return papers
 
     def _create_search_query(self, input_data: StructuredFeasibilityInput) -> str:
         """Create a search query from project details."""
@@ -155,26 +240,7 @@ class SemanticSearchService:
                 score_threshold=0.5,
             )
 
-            papers: List[RelevantPaper] = []
-
-            # ✅ Correct iteration
-            for point in results.points:
-                try:
-                    payload = point.payload or {}
-
-                    paper = RelevantPaper(
-                        title=payload.get("title", "Unknown"),
-                        summary=payload.get("summary", ""),
-                        link=payload.get("link", ""),
-                        relevance_score=point.score,
-                    )
-                    papers.append(paper)
-
-                except Exception as e:
-                    logger.warning(f"Error processing result: {e}")
-                    continue
-
-            return papers
+            return self._to_papers(results.points)
 
         except Exception as e:
             logger.error(f"Error in search_by_text: {e}")
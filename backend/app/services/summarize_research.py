@@ -1,23 +1,32 @@
-from app.utils.llm import call_llm
+from app.utils.llm import call_llm, acall_llm
 import json
 import re
 
+# Characters of the source text each single-call prompt reads; longer
+# documents are condensed first (see app.services.long_document)
+SUMMARY_INPUT_CHARS = 3500
+EXTRACT_INPUT_CHARS = 4000
 
-def summarize_research(text):
-    prompt = f"""Summarize concisely (200-300 words):
 
-{text[:3500]}"""
-    response = call_llm(prompt)
+def _summarize_prompt(text: str) -> str:
+    return f"""Summarize concisely (200-300 words):
+
+{text[:SUMMARY_INPUT_CHARS]}"""
+
+
+def summarize_research(text):
+    response = call_llm(_summarize_prompt(text))
     return response
 
 
-def summarize_and_extract_fields(text: str):
-    """Combined LLM call to generate summary AND extract fields in one prompt.
-    
-    Returns tuple: (summary_text, fields_dict)
-    """
+async def asummarize_research(text):
+    """Async variant of `summarize_research`."""
+    return await acall_llm(_summarize_prompt(text))
+
+
+def _summarize_and_extract_prompt(text: str) -> str:
     # Optimized prompt for token efficiency
-    prompt = f"""Analyze the text and return JSON:
+    return f"""Analyze the text and return JSON:
 {{
     "summary": "Concise summary (150-200 words)",
     "problem_statement": "Main problem or research question",
@@ -28,11 +37,13 @@ def summarize_and_extract_fields(text: str):
 }}
 
 Text:
-{text[:4000]}
+{text[:EXTRACT_INPUT_CHARS]}
 
 JSON ONLY:"""
-    
-    response = call_llm(prompt)
+
+
+def _parse_summarize_and_extract(response: str):
+    """Parse the combined summary/fields LLM response into (summary, fields)."""
     if not response:
         return "", {}
     
@@ -66,6 +77,19 @@ JSON ONLY:"""
         return "", {}
 
 
+def summarize_and_extract_fields(text: str):
+    """Combined LLM call to generate summary AND extract fields in one prompt.
+    
+    Returns tuple: (summary_text, fields_dict)
+    """
+    return _parse_summarize_and_extract(call_llm(_summarize_and_extract_prompt(text)))
+
+
+async def asummarize_and_extract_fields(text: str):
+    """Async variant of `summarize_and_extract_fields`."""
+    return _parse_summarize_and_extract(await acall_llm(_summarize_and_extract_prompt(text)))
+
+
 def refine_summary(previous_summary: str, state):
     prompt = f"""Improve summary with structured fields. Keep concise (300 words max):
 
@@ -81,12 +105,8 @@ Return plain text only."""
     return call_llm(prompt)
 
 
-def refine_summary_research_style(previous_summary: str, state):
-    """
-    Produce a refined summary in research style with clear headings.
-    Optimized for token efficiency.
-    """
-    prompt = f"""Rewrite as research-style summary with headings: Abstract, Introduction, 
+def _research_style_prompt(previous_summary: str, state) -> str:
+    return f"""Rewrite as research-style summary with headings: Abstract, Introduction, 
 Methodology, Results, Limitations, Conclusion.
 
 Summary: {previous_summary[:1500]}
@@ -97,7 +117,19 @@ Goals: {', '.join(state.goals or [])}
 Topics: {', '.join(state.key_topics or [])}
 
 Keep concise (max 400 words). Plain text with headings only."""
-    return call_llm(prompt)
+
+
+def refine_summary_research_style(previous_summary: str, state):
+    """
+    Produce a refined summary in research style with clear headings.
+    Optimized for token efficiency.
+    """
+    return call_llm(_research_style_prompt(previous_summary, state))
+
+
+async def arefine_summary_research_style(previous_summary: str, state):
+    """Async variant of `refine_summary_research_style`."""
+    return await acall_llm(_research_style_prompt(previous_summary, state))
 
 
 # if __name__ == "__main__":
@@ -1,12 +1,12 @@
-import requests
 import re
 from typing import Dict, List, Optional
 
+from app.utils.http import fetch_json, gather_partial, run_sync, ENRICHMENT_TIMEOUT
+
 DDG_API = "https://api.duckduckgo.com/"
-HEADERS = {"User-Agent": "InnoScope/1.0 (contact: you@example.com) Python-requests"}
 
 
-def ddg_search(query: str) -> Dict:
+async def addg_search(query: str) -> Dict:
     """Raw DuckDuckGo Instant Answer API call (no HTML, no redirects)."""
     params = {
         "q": query,
@@ -14,16 +14,14 @@ def ddg_search(query: str) -> Dict:
         "no_redirect": "1",
         "no_html": "1",
     }
-    try:
-        resp = requests.get(DDG_API, params=params, headers=HEADERS, timeout=20)
-        resp.raise_for_status()
-        # Handle empty response body
-        if not resp.text:
-            return {}
-        return resp.json()
-    except (requests.exceptions.RequestException, ValueError) as e:
-        # If request fails or response isn't valid JSON, return empty dict
-        return {}
+    data = await fetch_json(DDG_API, params=params, source="ddg")
+    # If request fails, times out or response isn't valid JSON, return empty dict
+    return data if isinstance(data, dict) else {}
+
+
+def ddg_search(query: str) -> Dict:
+    """Synchronous entry point for scripts; see `addg_search`."""
+    return run_sync(addg_search(query))
 
 
 def _extract_text_items(data: Dict) -> List[str]:
@@ -51,13 +49,44 @@ def _extract_text_items(data: Dict) -> List[str]:
     return deduped
 
 
-def gather_ddg_supporting_text(
+def _ddg_queries(
+    problem_statement: Optional[str],
+    domain: Optional[str],
+    goals: Optional[List[str]],
+    prerequisites: Optional[List[str]],
+    key_topics: Optional[List[str]],
+    max_topic_queries: int,
+) -> Dict[str, str]:
+    """Every query the enrichment may need, keyed by its role."""
+    queries: Dict[str, str] = {}
+    if domain:
+        queries["domain"] = domain
+    if problem_statement:
+        # Query a condensed form (take first 12 words) to avoid overly long queries
+        queries["problem"] = " ".join(problem_statement.split()[:12])
+    elif domain:
+        queries["problem"] = f"{domain} challenge"
+    for i, g in enumerate((goals or [])[:6]):
+        queries[f"goal:{i}"] = g
+    for i, p in enumerate((prerequisites or [])[:6]):
+        queries[f"prereq:{i}"] = p if len(p.split()) < 6 else " ".join(p.split()[:6])
+    if prerequisites and domain:
+        # Fallback when no prerequisite query finds anything; sent up front so
+        # it does not add a second round trip
+        queries["requirements"] = f"{domain} requirements"
+    for i, t in enumerate((key_topics or [])[:max_topic_queries]):
+        queries[f"topic:{i}"] = t
+    return queries
+
+
+async def agather_ddg_supporting_text(
     problem_statement: Optional[str],
     domain: Optional[str],
     goals: Optional[List[str]],
     prerequisites: Optional[List[str]],
     key_topics: Optional[List[str]],
     max_topic_queries: int = 5,
+    timeout: float = ENRICHMENT_TIMEOUT,
 ) -> Dict[str, List[str]]:
     """Given existing research fields, query DuckDuckGo to gather contextual snippets.
 
@@ -68,6 +97,9 @@ def gather_ddg_supporting_text(
       - Prerequisites: query domain + 'requirements' + each prerequisite term.
       - Key topics: query each topic individually (limited).
 
+    All queries are sent concurrently over the shared HTTP client (identical
+    queries once); any not answered within `timeout` count as empty.
+
     Returns dict with lists of snippets. Falls back to original field values if empty.
     """
     results: Dict[str, List[str]] = {
@@ -78,6 +110,14 @@ def gather_ddg_supporting_text(
         "key_topics_context": [],
     }
 
+    queries = _ddg_queries(problem_statement, domain, goals, prerequisites, key_topics, max_topic_queries)
+    unique_queries = list(dict.fromkeys(queries.values()))
+    responses = await gather_partial({q: addg_search(q) for q in unique_queries}, timeout=timeout)
+
+    def snippets(key: str) -> List[str]:
+        query = queries.get(key)
+        return _extract_text_items(responses.get(query) or {}) if query else []
+
     # Helper to filter sentences by a regex
     def filter_snippets(snippets: List[str], pattern: re.Pattern, limit: int) -> List[str]:
         out = []
@@ -90,30 +130,22 @@ def gather_ddg_supporting_text(
 
     # Domain context
     if domain:
-        domain_data = ddg_search(domain)
-        domain_snips = _extract_text_items(domain_data)
-        results["domain_context"] = domain_snips[:8]
+        results["domain_context"] = snippets("domain")[:8]
 
     # Problem context
     if problem_statement:
-        # Query a condensed form (take first 12 words) to avoid overly long queries
-        short_prob = " ".join(problem_statement.split()[:12])
-        prob_data = ddg_search(short_prob)
-        prob_snips = _extract_text_items(prob_data)
+        prob_snips = snippets("problem")
         challenge_re = re.compile(r"\b(challenge|problem|need|issue|barrier|gap)\b", re.IGNORECASE)
         filtered_prob = filter_snippets(prob_snips, challenge_re, 8)
         results["problem_context"] = filtered_prob or prob_snips[:5]
     elif domain:
-        prob_data = ddg_search(f"{domain} challenge")
-        prob_snips = _extract_text_items(prob_data)
-        results["problem_context"] = prob_snips[:5]
+        results["problem_context"] = snippets("problem")[:5]
 
     # Goals context
     if goals:
         improve_re = re.compile(r"\b(improve|enhance|increase|reduce|streamline|optimi[sz]e|enable|advance)\b", re.IGNORECASE)
-        for g in goals[:6]:
-            g_data = ddg_search(g)
-            g_snips = _extract_text_items(g_data)
+        for i in range(len(goals[:6])):
+            g_snips = snippets(f"goal:{i}")
             filtered = filter_snippets(g_snips, improve_re, 4)
             (results["goals_context"].extend(filtered or g_snips[:2]))
             if len(results["goals_context"]) >= 15:
@@ -122,26 +154,21 @@ def gather_ddg_supporting_text(
     # Prerequisites context
     if prerequisites:
         prereq_re = re.compile(r"\b(require|prerequisite|need|necessary|depend|necessitate)\b", re.IGNORECASE)
-        for p in prerequisites[:6]:
-            p_query = p if len(p.split()) < 6 else " ".join(p.split()[:6])
-            p_data = ddg_search(p_query)
-            p_snips = _extract_text_items(p_data)
+        for i in range(len(prerequisites[:6])):
+            p_snips = snippets(f"prereq:{i}")
             filtered = filter_snippets(p_snips, prereq_re, 4)
             results["prerequisites_context"].extend(filtered or p_snips[:2])
             if len(results["prerequisites_context"]) >= 15:
                 break
-        # If still empty but domain present try domain + requirements
+        # If still empty but domain present use domain + requirements
         if not results["prerequisites_context"] and domain:
-            req_data = ddg_search(f"{domain} requirements")
-            req_snips = _extract_text_items(req_data)
-            results["prerequisites_context"] = req_snips[:6]
+            results["prerequisites_context"] = snippets("requirements")[:6]
 
     # Key topics context
     if key_topics:
         improvement_re = re.compile(r"\b(improve|enhance|increase|reduce|streamline|advance)\b", re.IGNORECASE)
-        for t in key_topics[:max_topic_queries]:
-            t_data = ddg_search(t)
-            t_snips = _extract_text_items(t_data)
+        for i, t in enumerate(key_topics[:max_topic_queries]):
+            t_snips = snippets(f"topic:{i}")
             # pick first 2 + any improvement related
             chosen = t_snips[:2] + filter_snippets(t_snips, improvement_re, 2)
             results["key_topics_context"].extend([f"[{t}] {c}" for c in chosen])
@@ -161,6 +188,20 @@ def gather_ddg_supporting_text(
     return results
 
 
+def gather_ddg_supporting_text(
+    problem_statement: Optional[str],
+    domain: Optional[str],
+    goals: Optional[List[str]],
+    prerequisites: Optional[List[str]],
+    key_topics: Optional[List[str]],
+    max_topic_queries: int = 5,
+) -> Dict[str, List[str]]:
+    """Synchronous entry point for scripts; see `agather_ddg_supporting_text`."""
+    return run_sync(agather_ddg_supporting_text(
+        problem_statement, domain, goals, prerequisites, key_topics, max_topic_queries
+    ))
+
+
 if __name__ == "__main__":
     sample = gather_ddg_supporting_text(
         problem_statement="Need to improve diagnostic accuracy in healthcare.",
@@ -0,0 +1,163 @@
+"""Merge, de-duplicate and rank enrichment snippets from several sources.
+
+In hedged mode the research router queries Wikipedia and DuckDuckGo at the
+same time under one latency budget (`ENRICHMENT_BUDGET`) instead of guessing
+which one will be useful. Whatever the sources return is flattened into
+snippets and ranked here, so the roadmap prompt carries the most relevant
+context rather than the first N snippets:
+
+- the project text (domain, problem, goals, prerequisites, key topics) and
+  all snippets are vectorized together as TF-IDF rows in one sparse matrix
+- relevance is the cosine similarity of each snippet to the project row
+- near-duplicates (cosine >= `NEAR_DUPLICATE_SIMILARITY` to a better-ranked
+  snippet) are dropped
+- the best snippets are kept until the character budget is used up
+"""
+
+import os
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+ENRICHMENT_MODE = os.getenv("ENRICHMENT_MODE", "hedged")  # "hedged" | "routed"
+# Seconds the hedged enrichment waits for both sources before using what arrived
+ENRICHMENT_BUDGET = float(os.getenv("ENRICHMENT_BUDGET", "8"))
+# Characters of ranked snippets passed on to the roadmap prompt
+ENRICHMENT_REPORT_CHARS = int(os.getenv("ENRICHMENT_REPORT_CHARS", "2000"))
+NEAR_DUPLICATE_SIMILARITY = float(os.getenv("NEAR_DUPLICATE_SIMILARITY", "0.8"))
+
+CONTEXT_KEYS = [
+    "domain_context",
+    "problem_context",
+    "goals_context",
+    "prerequisites_context",
+    "key_topics_context",
+]
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_TOPIC_PREFIX = re.compile(r"^\[[^\]]*\]\s*")
+
+
+class Snippet(NamedTuple):
+    text: str
+    source: str
+    field: str
+    score: float = 0.0
+
+
+def query_text(*texts: Optional[str], lists: Iterable[Optional[List[str]]] = ()) -> str:
+    """The project description the snippets are ranked against."""
+    parts = [t for t in texts if t]
+    for values in lists:
+        parts.extend(t for t in values or [] if t)
+    return " ".join(parts)
+
+
+def project_query(interm) -> str:
+    """`query_text` for an IntermediateState."""
+    return query_text(
+        interm.domain, interm.problem_statement,
+        lists=(interm.goals, interm.prerequisites, interm.key_topics),
+    )
+
+
+def flatten_contexts(contexts: Optional[Dict[str, List[str]]], source: str) -> List[Snippet]:
+    """Turn a source's categorized contexts into snippets, in field order."""
+    snippets: List[Snippet] = []
+    for field in CONTEXT_KEYS:
+        for text in (contexts or {}).get(field) or []:
+            if text and text.strip():
+                snippets.append(Snippet(text.strip(), source, field))
+    return snippets
+
+
+def _line(snippet: Snippet) -> str:
+    return f"- [{snippet.source}] {snippet.text}"
+
+
+def rank_snippets(
+    snippets: Iterable[Snippet],
+    query: str,
+    max_chars: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[Snippet]:
+    """
+    Order snippets by relevance to `query`, dropping duplicates, near-duplicates
+    and (when anything matches at all) snippets unrelated to the query.
+    
+    Args:
+        snippets: Candidates; on ties (and for duplicates) earlier ones win
+        query: Project text to rank against
+        max_chars: Budget for the formatted report lines; lower-ranked
+            snippets that no longer fit are skipped
+        limit: Maximum number of snippets kept
+    
+    Returns:
+        Kept snippets, most relevant first, with `score` set
+    """
+    # Exact duplicates (ignoring case, punctuation and topic tags) first
+    unique: List[Snippet] = []
+    bodies: List[str] = []
+    seen = set()
+    for snippet in snippets:
+        body = _TOPIC_PREFIX.sub("", snippet.text)
+        key = " ".join(_TOKEN.findall(body.lower()))
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(snippet)
+            bodies.append(body)
+    if not unique:
+        return []
+
+    try:
+        # Row 0 is the query; rows are L2-normalized so dot products are cosines
+        matrix = TfidfVectorizer(stop_words="english", sublinear_tf=True).fit_transform([query] + bodies)
+    except ValueError:
+        # Nothing but stop words: keep the original order
+        matrix = None
+
+    if matrix is not None:
+        vectors = matrix[1:]
+        scores = (vectors @ matrix[0].T).toarray().ravel()
+        similarity = (vectors @ vectors.T).toarray()
+    else:
+        scores = [0.0] * len(unique)
+        similarity = None
+
+    order = sorted(range(len(unique)), key=lambda i: -scores[i])
+    if scores[order[0]] > 0:
+        # Snippets sharing no terms with the project only cost prompt tokens
+        order = [i for i in order if scores[i] > 0]
+    kept: List[int] = []
+    used = 0
+    for i in order:
+        if limit is not None and len(kept) >= limit:
+            break
+        if similarity is not None and kept and similarity[i, kept].max() >= NEAR_DUPLICATE_SIMILARITY:
+            continue
+        size = len(_line(unique[i])) + 1
+        if max_chars is not None and used + size > max_chars:
+            continue
+        kept.append(i)
+        used += size
+
+    return [unique[i]._replace(score=round(float(scores[i]), 4)) for i in kept]
+
+
+def format_report(snippets: List[Snippet]) -> str:
+    """Bullet list of snippets tagged with their source."""
+    return "\n".join(_line(snippet) for snippet in snippets)
+
+
+__all__ = [
+    "ENRICHMENT_MODE",
+    "ENRICHMENT_BUDGET",
+    "ENRICHMENT_REPORT_CHARS",
+    "Snippet",
+    "query_text",
+    "project_query",
+    "flatten_contexts",
+    "rank_snippets",
+    "format_report",
+]
@@ -1,30 +1,138 @@
-def extract_text(file_path):
-    if file_path.endswith(".docx"):
+"""PDF/DOCX text extraction, page by page and bounded by a character budget.
+
+The pipelines only read the start of a document (the summary prompt uses
+the first few thousand characters), so extraction stops at the page where
+`max_chars` is reached: a 300-page thesis costs about as much as a 3-page
+abstract. Pass `max_chars=None` for the full text.
+
+DOCX files have no rendered pages; a "page" there is the run of paragraphs
+up to an explicit or last-rendered page break.
+"""
+
+import io
+import os
+import time
+from typing import Iterator, NamedTuple, Optional, Union
+
+# Characters extracted by default; a margin over the largest prompt slice
+EXTRACT_CHAR_BUDGET = int(os.getenv("EXTRACT_CHAR_BUDGET", "8000"))
+
+
+class ExtractionResult(NamedTuple):
+    text: str
+    pages_read: int
+    page_count: Optional[int]  # None when unknown (a DOCX that was not read to the end)
+    truncated: bool  # stopped at the budget before the end of the document
+    seconds: float
+
+
+def _iter_pdf_pages(doc) -> Iterator[str]:
+    for page in doc:
+        yield page.get_text()
+
+
+def _iter_docx_pages(doc) -> Iterator[str]:
+    from docx.oxml.ns import qn
+
+    paragraphs = []
+    for para in doc.paragraphs:
+        element = para._p
+        breaks = any(br.get(qn("w:type")) == "page" for br in element.iter(qn("w:br")))
+        breaks = breaks or next(element.iter(qn("w:lastRenderedPageBreak")), None) is not None
+        if breaks and paragraphs:
+            yield "\n".join(paragraphs)
+            paragraphs = []
+        paragraphs.append(para.text)
+    if paragraphs:
+        yield "\n".join(paragraphs)
+
+
+def extract_document(
+    source: Union[str, bytes],
+    max_chars: Optional[int] = EXTRACT_CHAR_BUDGET,
+    kind: Optional[str] = None,
+) -> Optional[ExtractionResult]:
+    """
+    Extract text page by page until `max_chars` characters are collected.
+
+    Args:
+        source: Path of a PDF/DOCX file, or the document's bytes
+        max_chars: Character budget; None or 0 extracts the whole document
+        kind: "pdf" or "docx"; required for bytes, taken from the extension for paths
+
+    Returns:
+        ExtractionResult, or None for unsupported file types
+    """
+    started = time.perf_counter()
+    in_memory = isinstance(source, (bytes, bytearray))
+    if not in_memory:
+        kind = kind or os.path.splitext(source)[1].lower().lstrip(".")
+    name = f"<{kind} upload>" if in_memory else os.path.basename(source)
+
+    if kind == "docx":
         from docx import Document
-        doc = Document(file_path)
-        return "\n".join([para.text for para in doc.paragraphs])
-    elif file_path.endswith(".pdf"):
+        doc = Document(io.BytesIO(source) if in_memory else source)
+        pages = _iter_docx_pages(doc)
+        page_count = None
+        close = None
+    elif kind == "pdf":
         import fitz  # PyMuPDF
-        doc = fitz.open(file_path)
-        return "\n".join([page.get_text() for page in doc])
+        doc = fitz.open(stream=source, filetype="pdf") if in_memory else fitz.open(source)
+        pages = _iter_pdf_pages(doc)
+        page_count = doc.page_count
+        close = doc.close
     else:
         return None
 
+    parts = []
+    size = 0
+    pages_read = 0
+    truncated = False
+    try:
+        for text in pages:
+            parts.append(text)
+            pages_read += 1
+            size += len(text) + 1
+            if max_chars and size >= max_chars:
+                truncated = page_count is None or pages_read < page_count
+                break
+    finally:
+        if close:
+            close()
+
+    if page_count is None and not truncated:
+        page_count = pages_read
+    text = "\n".join(parts)
+    if max_chars:
+        text = text[:max_chars]
+    result = ExtractionResult(text, pages_read, page_count, truncated, time.perf_counter() - started)
+    print(
+        f"[Extract] {name}: {pages_read}/{page_count if page_count is not None else '?'} pages, "
+        f"{len(text)} chars in {result.seconds:.2f}s{' (budget reached)' if truncated else ''}"
+    )
+    return result
+
+
+def extract_text(file_path, max_chars: Optional[int] = EXTRACT_CHAR_BUDGET):
+    """Text of a PDF/DOCX up to `max_chars` (None for all of it); None for other types."""
+    result = extract_document(file_path, max_chars)
+    return result.text if result else None
+
 
 # if __name__ == "__main__":
 #     import os
-    
+
 #     # Test the extract_text function - file is in the same directory as this script
 #     file_path = os.path.join(os.path.dirname(__file__), "test.docx")
-    
+
 #     if not os.path.exists(file_path):
 #         print(f"Error: File '{file_path}' not found")
 #         print("Please update the file_path variable with an existing file")
 #     else:
 #         result = extract_text(file_path)
-        
+
 #         if result:
 #             print("Extracted text:")
 #             print(result)
 #         else:
-#             print("Could not extract text or unsupported file type")
\ No newline at end of file
+#             print("Could not extract text or unsupported file type")
@@ -0,0 +1,319 @@
+"""Process pool for PDF/DOCX extraction.
+
+Parsing runs in separate worker processes, so a malformed or huge document
+cannot pin the API's cores or block its event loop:
+
+- at most `EXTRACT_POOL_SIZE` documents are parsed at once; callers wait
+  for a free worker (the queue depth is reported in `stats()`)
+- a document that takes longer than `EXTRACT_TIMEOUT` seconds, or whose
+  worker grows beyond `EXTRACT_MAX_RSS_MB` resident memory, gets its
+  worker killed and fails with `ExtractionError`
+- a worker that crashes (e.g. a segfault inside the parser) only fails the
+  document it was working on; workers are restarted on demand and recycled
+  after `EXTRACT_MAX_JOBS_PER_WORKER` documents
+- queue wait and extraction latency are kept for the last
+  `EXTRACT_LATENCY_WINDOW` documents
+
+`EXTRACT_POOL_SIZE=0` parses in the shared thread pool instead (no limits).
+The RSS check reads /proc and is skipped where that is unavailable.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Dict, List, Optional, Union
+
+from app.utils.extract import EXTRACT_CHAR_BUDGET, ExtractionResult, extract_document
+from app.utils.uploads import is_upload_ref, resolve_upload
+from app.utils.workers import run_in_worker
+
+EXTRACT_POOL_SIZE = int(os.getenv("EXTRACT_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+EXTRACT_TIMEOUT = float(os.getenv("EXTRACT_TIMEOUT", "60"))
+EXTRACT_MAX_RSS_MB = int(os.getenv("EXTRACT_MAX_RSS_MB", "1024"))
+EXTRACT_MAX_JOBS_PER_WORKER = int(os.getenv("EXTRACT_MAX_JOBS_PER_WORKER", "100"))
+EXTRACT_LATENCY_WINDOW = int(os.getenv("EXTRACT_LATENCY_WINDOW", "200"))
+# Seconds between checks on a running extraction (result, deadline, memory)
+EXTRACT_POLL_INTERVAL = 0.05
+
+OUTCOMES = ("completed", "error", "timeout", "memory", "crashed", "cancelled")
+
+
+class ExtractionError(RuntimeError):
+    """A document could not be extracted; `reason` is one of OUTCOMES."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+def _worker_main(conn) -> None:
+    """Worker process: extract documents sent over `conn` until told to stop."""
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        source, max_chars, kind = request
+        try:
+            conn.send(("completed", extract_document(source, max_chars, kind)))
+        except MemoryError:
+            conn.send(("memory", "out of memory"))
+            return
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+def _rss_bytes(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _context():
+    # forkserver: cheap forks of a clean process that has the parsers imported
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(["app.utils.extract_pool", "fitz", "docx"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child,), name="extract-worker", daemon=True)
+        self.process.start()
+        child.close()
+        self.jobs = 0
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self, kill: bool = False) -> None:
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+
+class ExtractionPool:
+    """Worker processes parsing one document each, with timeout, memory cap and crash isolation."""
+
+    def __init__(
+        self,
+        size: int = EXTRACT_POOL_SIZE,
+        timeout: float = EXTRACT_TIMEOUT,
+        max_rss_mb: int = EXTRACT_MAX_RSS_MB,
+        max_jobs: int = EXTRACT_MAX_JOBS_PER_WORKER,
+    ):
+        self.size = size
+        self.timeout = timeout
+        self.max_rss = max_rss_mb * 1024 * 1024
+        self.max_jobs = max_jobs
+        self._ctx = _context()
+        self._idle: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._waiting = 0
+        self._running = 0
+        self._restarts = 0
+        self._outcomes = {outcome: 0 for outcome in OUTCOMES}
+        self._queue_wait = deque(maxlen=EXTRACT_LATENCY_WINDOW)
+        self._latency = deque(maxlen=EXTRACT_LATENCY_WINDOW)
+
+    def _limiter(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        limiter = self._limiters.get(loop)
+        if limiter is None:
+            limiter = asyncio.Semaphore(self.size)
+            self._limiters[loop] = limiter
+        return limiter
+
+    def _take(self) -> _Worker:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive():
+                    return worker
+                self._restarts += 1
+        return _Worker(self._ctx)
+
+    def _release(self, worker: _Worker, healthy: bool) -> None:
+        if healthy and worker.alive() and worker.jobs < self.max_jobs:
+            with self._lock:
+                self._idle.append(worker)
+            return
+        if not healthy:
+            self._restarts += 1
+        worker.stop(kill=not healthy)
+
+    async def _run(self, worker: _Worker, source: Union[str, bytes], max_chars: Optional[int], kind: Optional[str]) -> ExtractionResult:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        worker.jobs += 1
+        worker.conn.send((source, max_chars, kind))
+        while not worker.conn.poll():
+            if not worker.alive():
+                raise ExtractionError("crashed", f"extraction worker exited with code {worker.process.exitcode}")
+            if loop.time() > deadline:
+                raise ExtractionError("timeout", f"extraction exceeded {self.timeout:g}s")
+            rss = _rss_bytes(worker.process.pid)
+            if rss is not None and rss > self.max_rss:
+                raise ExtractionError("memory", f"extraction exceeded {self.max_rss // (1024 * 1024)} MB")
+            await asyncio.sleep(EXTRACT_POLL_INTERVAL)
+        try:
+            # The message may still be arriving; read it off the event loop
+            outcome, payload = await run_in_worker(worker.conn.recv)
+        except (EOFError, OSError):
+            raise ExtractionError("crashed", f"extraction worker exited with code {worker.process.exitcode}")
+        if outcome != "completed":
+            raise ExtractionError(outcome, payload)
+        return payload
+
+    async def extract(
+        self,
+        source: Union[str, bytes],
+        max_chars: Optional[int] = EXTRACT_CHAR_BUDGET,
+        kind: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> Optional[ExtractionResult]:
+        """Extract a document (path or bytes, see `extract_document`) in a worker process.
+
+        Raises ExtractionError on failure; `name` is only used in logs.
+        """
+        queued = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._limiter().acquire()
+        finally:
+            self._waiting -= 1
+        started = time.perf_counter()
+        self._queue_wait.append(started - queued)
+        self._running += 1
+        worker = None
+        healthy = False
+        outcome = "error"
+        try:
+            worker = await run_in_worker(self._take)
+            result = await self._run(worker, source, max_chars, kind)
+            healthy = True
+            outcome = "completed"
+            return result
+        except ExtractionError as e:
+            outcome = e.reason
+            # A failed parse leaves the worker usable; anything else is killed
+            healthy = e.reason == "error"
+            print(f"[ExtractPool] {name or os.path.basename(str(source))}: {e.reason} ({e})")
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            self._running -= 1
+            self._limiter().release()
+            self._outcomes[outcome] += 1
+            self._latency.append(time.perf_counter() - started)
+            if worker is not None:
+                # Also reached on cancellation, where the worker may still be busy
+                self._release(worker, healthy)
+
+    def stats(self) -> Dict[str, object]:
+        def percentiles(values) -> Dict[str, float]:
+            ordered = sorted(values)
+            if not ordered:
+                return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+            pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+            return {"p50": round(pick(0.5), 3), "p95": round(pick(0.95), 3), "max": round(ordered[-1], 3)}
+
+        return {
+            "size": self.size,
+            "queue_depth": self._waiting,
+            "running": self._running,
+            "idle_workers": len(self._idle),
+            "restarts": self._restarts,
+            "outcomes": dict(self._outcomes),
+            "queue_wait_s": percentiles(self._queue_wait),
+            "latency_s": percentiles(self._latency),
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+
+_pool: Optional[ExtractionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_extract_pool() -> Optional[ExtractionPool]:
+    """The shared extraction pool (None with EXTRACT_POOL_SIZE=0)."""
+    global _pool
+    if _pool is None and EXTRACT_POOL_SIZE > 0:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ExtractionPool()
+    return _pool
+
+
+async def aextract_document(file_path: str, max_chars: Optional[int] = EXTRACT_CHAR_BUDGET) -> Optional[ExtractionResult]:
+    """`extract_document` in the extraction pool, awaited without blocking the event loop.
+
+    `file_path` may be an `upload://` reference; the upload is then parsed
+    from its bytes, without touching the disk.
+    """
+    source: Union[str, bytes] = file_path
+    kind = None
+    name = None
+    if is_upload_ref(file_path):
+        upload = resolve_upload(file_path)
+        if upload is None:
+            raise ExtractionError("error", "the uploaded document was already closed")
+        source = await run_in_worker(upload.read)
+        kind = upload.kind
+        name = upload.filename
+    pool = get_extract_pool()
+    if pool is None:
+        return await run_in_worker(extract_document, source, max_chars, kind)
+    return await pool.extract(source, max_chars, kind, name)
+
+
+async def aextract_text(file_path: str, max_chars: Optional[int] = EXTRACT_CHAR_BUDGET) -> Optional[str]:
+    """Async variant of `extract_text`, run in the extraction pool."""
+    result = await aextract_document(file_path, max_chars)
+    return result.text if result else None
+
+
+def extract_pool_stats() -> Dict[str, object]:
+    pool = get_extract_pool()
+    return pool.stats() if pool else {"size": 0}
+
+
+def shutdown_extract_pool() -> None:
+    if _pool is not None:
+        _pool.shutdown()
+
+
+__all__ = [
+    "ExtractionError",
+    "ExtractionPool",
+    "get_extract_pool",
+    "aextract_document",
+    "aextract_text",
+    "extract_pool_stats",
+    "shutdown_extract_pool",
+]
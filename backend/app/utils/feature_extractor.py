@@ -0,0 +1,279 @@
+"""
+Single-pass keyword feature extraction for text-to-structured conversion.
+
+Every keyword set used to estimate StructuredFeasibilityInput fields is
+compiled into one multi-pattern automaton (a trie of all keywords rendered as
+a single regular expression) instead of running a separate `keyword in text`
+scan per keyword and per rule. The text is tokenized once into runs of
+keyword characters; a single-word keyword can only occur inside such a run,
+so the automaton only has to look at each distinct run once, and what it
+finds is memoized across texts. Multi-word phrases are counted directly.
+Overlapping occurrences (e.g. "clear" inside "unclear") are still reported,
+so results match the per-keyword scans exactly. All structured fields are
+then derived from the match counts.
+
+Usage:
+    features = extract_features(summary)
+    batch = extract_features_batch([summary_a, summary_b])
+"""
+
+import re
+import string
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Set, Tuple
+
+# Score fields (1-5): base 3 + (positive hits - negative hits) // divisor,
+# where a hit is a keyword that occurs at least once in the text.
+# field -> (positive keywords, negative keywords, divisor)
+SCORE_RULES: Dict[str, Tuple[Sequence[str], Sequence[str], int]] = {
+    "problem_clarity_score": (
+        ["clear", "defined", "specific", "objective", "goal", "well-defined"],
+        ["unclear", "vague", "ambiguous", "undefined", "uncertain"],
+        1,
+    ),
+    "technical_complexity_score": (
+        ["complex", "difficult", "sophisticated", "advanced", "challenging", "intricate"],
+        ["simple", "straightforward", "basic", "easy", "elementary"],
+        1,
+    ),
+    "technology_maturity_score": (
+        ["established", "mature", "proven", "stable", "production", "industry-standard"],
+        ["new", "emerging", "experimental", "novel", "bleeding-edge", "research"],
+        1,
+    ),
+    "data_availability_score": (
+        ["available", "existing", "dataset", "database", "accessible", "collected"],
+        ["missing", "unavailable", "scarce", "limited data", "no data"],
+        1,
+    ),
+    "infrastructure_requirement_score": (
+        ["server", "cloud", "infrastructure", "hardware", "deployment", "scalable", "distributed"],
+        ["lightweight", "minimal", "simple deployment", "low-cost", "edge"],
+        2,
+    ),
+    "experimental_validation_score": (
+        ["validated", "tested", "verified", "evaluation", "experiment", "benchmark"],
+        ["not validated", "untested", "unverified", "preliminary"],
+        1,
+    ),
+    "risk_level_score": (
+        ["risk", "challenge", "difficult", "uncertain", "unknown", "failure", "issue", "problem"],
+        ["safe", "proven", "reliable", "stable", "mature", "secure"],
+        2,
+    ),
+}
+
+# Flag fields (0/1): 1 if any keyword occurs
+FLAG_RULES: Dict[str, Sequence[str]] = {
+    "baseline_comparison_flag": ["baseline", "comparison"],
+    "real_world_testing_flag": ["test", "pilot"],
+    "limitations_discussed_flag": ["limitation", "challenge"],
+}
+
+# Fields the text does not inform yet (moderate defaults)
+DEFAULT_FIELDS: Dict[str, Any] = {
+    "rd_cost_estimate": 50000.0,  # $50k
+    "startup_cost_estimate": 100000.0,  # $100k
+    "resource_availability_score": 3,
+    "time_to_market_months": 12,  # 1 year
+    "target_market_size": 100.0,  # $100M
+    "competition_level": 3,
+    "projected_adoption_rate": 0.3,  # 30%
+    "unique_selling_proposition_score": 3,
+    "projected_roi": 1.5,  # 150% ROI
+    "regulatory_compliance_flag": 0,  # Assume not regulated unless mentioned
+    "legal_risk_flag": 0,  # Assume no legal risk unless mentioned
+}
+
+_BASE_SCORE = 3
+# Distinct tokens remembered with their keyword hits (vocabulary is shared across texts)
+_TOKEN_CACHE_SIZE = 100_000
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Render keywords as one trie-shaped regex that matches the longest keyword at a position."""
+    trie: Dict[str, Any] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict[str, Any]) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # Greedy optional suffix: prefer the longer keyword
+            return ("(?:" + body + ")?") if len(branches) > 1 or len(body) > 1 else body + "?"
+        return body
+
+    return render(trie)
+
+
+class FeatureExtractor:
+    """Compiled keyword automaton deriving structured fields from text."""
+
+    def __init__(
+        self,
+        score_rules: Dict[str, Tuple[Sequence[str], Sequence[str], int]] = SCORE_RULES,
+        flag_rules: Dict[str, Sequence[str]] = FLAG_RULES,
+        defaults: Dict[str, Any] = DEFAULT_FIELDS,
+    ):
+        self.score_rules = score_rules
+        self.flag_rules = flag_rules
+        self.defaults = defaults
+
+        keywords = set()
+        for positive, negative, _ in score_rules.values():
+            keywords.update(positive)
+            keywords.update(negative)
+        for flag_keywords in flag_rules.values():
+            keywords.update(flag_keywords)
+        self.keywords = sorted(keywords)
+
+        # Per keyword: which score fields it moves (+1 / -1) and which flags it sets
+        self._contributions: Dict[str, List[Tuple[str, int]]] = {}
+        for field, (positive, negative, _) in score_rules.items():
+            for keyword in positive:
+                self._contributions.setdefault(keyword, []).append((field, 1))
+            for keyword in negative:
+                self._contributions.setdefault(keyword, []).append((field, -1))
+        self._flags: Dict[str, List[str]] = {}
+        for field, flag_keywords in flag_rules.items():
+            for keyword in flag_keywords:
+                self._flags.setdefault(keyword, []).append(field)
+
+        # Single-word ASCII keywords go through the automaton; anything else
+        # (phrases like "limited data") is counted on the whole text.
+        token_chars = set(string.ascii_lowercase + "-")
+        words = [keyword for keyword in self.keywords if set(keyword) <= token_chars]
+        self.phrases = [keyword for keyword in self.keywords if keyword not in words]
+
+        self._pattern = re.compile(_trie_pattern(words).encode("ascii"))
+        # The regex reports the longest keyword at each position; shorter keywords
+        # that are prefixes of it occur there too.
+        self._implied = {
+            keyword.encode("ascii"): [other for other in words if keyword.startswith(other)]
+            for keyword in words
+        }
+        # Tokens are maximal runs of keyword characters: every other byte
+        # (including all UTF-8 multi-byte sequences) becomes a separator.
+        keep = token_chars.union(*words)
+        self._separators = bytes(
+            byte if chr(byte) in keep else ord(" ")
+            for byte in range(256)
+        )
+        self._token_hits: Dict[bytes, Tuple[Tuple[str, int], ...]] = {}
+
+    def _scan_token(self, token: bytes) -> Tuple[Tuple[str, int], ...]:
+        """Run the automaton over one token: (keyword, occurrences) pairs."""
+        counts: Counter = Counter()
+        search = self._pattern.search
+        pos = 0
+        while True:
+            match = search(token, pos)
+            if match is None:
+                break
+            for keyword in self._implied[match.group()]:
+                counts[keyword] += 1
+            # Resume right after the match start so overlapping keywords are found
+            pos = match.start() + 1
+        return tuple(counts.items())
+
+    def _lookup(self, token: bytes) -> Tuple[Tuple[str, int], ...]:
+        hits = self._token_hits.get(token)
+        if hits is None:
+            if len(self._token_hits) >= _TOKEN_CACHE_SIZE:
+                self._token_hits.clear()
+            hits = self._token_hits[token] = self._scan_token(token)
+        return hits
+
+    def _tokens(self, text: str) -> List[bytes]:
+        return text.encode("utf-8").translate(self._separators).split()
+
+    def match_counts(self, text: str) -> Counter:
+        """Count occurrences of every keyword in `text` (case-insensitive)."""
+        text = text.lower()
+        counts: Counter = Counter()
+        for token, n in Counter(self._tokens(text)).items():
+            for keyword, occurrences in self._lookup(token):
+                counts[keyword] += occurrences * n
+        for phrase in self.phrases:
+            occurrences = text.count(phrase)
+            if occurrences:
+                counts[phrase] = occurrences
+        return counts
+
+    def matched_keywords(self, text: str) -> Set[str]:
+        """Keywords occurring at least once in `text` (cheaper than counting)."""
+        text = text.lower()
+        matched: Set[str] = set()
+        for token in set(self._tokens(text)):
+            for keyword, _ in self._lookup(token):
+                matched.add(keyword)
+        matched.update(phrase for phrase in self.phrases if phrase in text)
+        return matched
+
+    def fields_from_counts(self, counts: Mapping[str, int]) -> Dict[str, Any]:
+        """Derive the structured fields from keyword match counts."""
+        return self._fields(keyword for keyword, occurrences in counts.items() if occurrences)
+
+    def _fields(self, matched: Iterable[str]) -> Dict[str, Any]:
+        balance = dict.fromkeys(self.score_rules, 0)
+        flags = dict.fromkeys(self.flag_rules, 0)
+        # A keyword counts once however often it occurs
+        for keyword in matched:
+            for field, delta in self._contributions.get(keyword, ()):
+                balance[field] += delta
+            for field in self._flags.get(keyword, ()):
+                flags[field] = 1
+
+        fields: Dict[str, Any] = {}
+        for field, (_, _, divisor) in self.score_rules.items():
+            fields[field] = max(1, min(5, _BASE_SCORE + balance[field] // divisor))
+        fields.update(flags)
+        fields.update(self.defaults)
+        return fields
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        """Scan `text` once and return every estimated structured field."""
+        return self._fields(self.matched_keywords(text))
+
+    def extract_batch(self, texts: Sequence[str]) -> List[Dict[str, Any]]:
+        """Extract fields for many texts; token lookups are shared across the batch."""
+        return [self.extract(text) for text in texts]
+
+
+_extractor = None
+
+
+def get_feature_extractor() -> FeatureExtractor:
+    """Get or create the global extractor (compiled once per process)."""
+    global _extractor
+    if _extractor is None:
+        _extractor = FeatureExtractor()
+    return _extractor
+
+
+def extract_features(text: str) -> Dict[str, Any]:
+    """Estimate structured feasibility fields from free text."""
+    return get_feature_extractor().extract(text)
+
+
+def extract_features_batch(texts: Sequence[str]) -> List[Dict[str, Any]]:
+    """Estimate structured feasibility fields for many texts at once."""
+    return get_feature_extractor().extract_batch(texts)
+
+
+__all__ = [
+    "SCORE_RULES",
+    "FLAG_RULES",
+    "DEFAULT_FIELDS",
+    "FeatureExtractor",
+    "get_feature_extractor",
+    "extract_features",
+    "extract_features_batch",
+]
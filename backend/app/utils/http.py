@@ -0,0 +1,206 @@
+"""Shared async HTTP client for enrichment fetchers (Wikipedia, DuckDuckGo).
+
+One pooled keep-alive `httpx.AsyncClient` per event loop (the API server
+runs a single loop, so one per process) instead of a fresh connection per
+call. Requests to each upstream host are capped by a per-host semaphore, and
+every request has its own timeout: a slow or failing query yields None so
+callers can return partial results instead of blocking the stage.
+
+Requests made with a `source` go through the disk-backed response cache
+(`app.utils.http_cache`): fresh entries skip the network entirely and stale
+ones are revalidated with a conditional request.
+"""
+
+import asyncio
+import json
+import os
+import weakref
+from typing import Any, Awaitable, Dict, Iterable, Optional, TypeVar
+
+import httpx
+
+from app.utils.http_cache import CachedResponse, get_response_cache, normalize_key
+from app.utils.workers import run_in_worker
+
+K = TypeVar("K")
+T = TypeVar("T")
+
+USER_AGENT = "InnoScope/1.0 (contact: you@example.com) Python-httpx"
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "32"))
+# Concurrent requests allowed to a single upstream host
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "8"))
+# Per-request budget (connect + response), seconds
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+# Budget for a whole enrichment fan-out; unfinished queries are dropped
+ENRICHMENT_TIMEOUT = float(os.getenv("ENRICHMENT_TIMEOUT", "15"))
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_host_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the pooled keep-alive client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=60,
+            ),
+            timeout=HTTP_TIMEOUT,
+            follow_redirects=True,
+        )
+        _clients[loop] = client
+    return client
+
+
+def get_host_limiter(host: str) -> asyncio.Semaphore:
+    """Return the concurrency cap for one upstream host on the running loop."""
+    loop = asyncio.get_running_loop()
+    limiters = _host_limiters.setdefault(loop, {})
+    limiter = limiters.get(host)
+    if limiter is None:
+        limiter = limiters[host] = asyncio.Semaphore(HTTP_MAX_PER_HOST)
+    return limiter
+
+
+def _decode(body: bytes) -> Any:
+    return json.loads(body) if body else {}
+
+
+async def fetch_json(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = HTTP_TIMEOUT,
+    retry_statuses: Iterable[int] = (),
+    source: Optional[str] = None,
+) -> Optional[Any]:
+    """
+    GET `url` and decode its JSON body.
+    
+    Args:
+        url: Endpoint URL
+        params: Query parameters
+        headers: Extra request headers
+        timeout: Total seconds allowed for the request (including one retry)
+        retry_statuses: Status codes retried once (e.g. Wikipedia's 403)
+        source: Response cache namespace ("wiki", "ddg"); None bypasses the cache
+    
+    Returns:
+        Decoded JSON ({} for an empty body), or None on timeout, HTTP error
+        or invalid JSON (a stale cached body is returned instead when there is one)
+    """
+    cache = get_response_cache() if source else None
+    key = None
+    cached: Optional[CachedResponse] = None
+    request_headers = dict(headers or {})
+    if cache is not None:
+        key = normalize_key(source, url, params)
+        cached = await run_in_worker(cache.lookup, source, key)
+        if cached is not None and cached.fresh:
+            try:
+                data = _decode(cached.body)
+                cache.record(source, "hit")
+                return data
+            except ValueError:
+                cached = None
+        request_headers.update(cache.conditional_headers(cached))
+
+    client = get_http_client()
+    host = httpx.URL(url).host
+
+    async def _get() -> httpx.Response:
+        async with get_host_limiter(host):
+            resp = await client.get(url, params=params, headers=request_headers)
+            if resp.status_code in retry_statuses:
+                # polite retry
+                resp = await client.get(url, params=params, headers=request_headers)
+            return resp
+
+    try:
+        resp = await asyncio.wait_for(_get(), timeout=timeout)
+        if resp.status_code == 304 and cached is not None:
+            await run_in_worker(cache.refresh, key)
+            cache.record(source, "revalidated")
+            return _decode(cached.body)
+        resp.raise_for_status()
+        data = _decode(resp.content)
+    except (asyncio.TimeoutError, httpx.HTTPError, ValueError) as e:
+        reason = f"timed out after {timeout:.0f}s" if isinstance(e, asyncio.TimeoutError) else f"request failed: {e}"
+        if cached is not None:
+            print(f"[HTTP] {host} {reason}; serving stale cached response")
+            cache.record(source, "stale")
+            return _decode(cached.body)
+        print(f"[HTTP] {host} {reason}")
+        if cache is not None:
+            cache.record(source, "miss")
+        return None
+
+    if cache is not None:
+        cache.record(source, "miss")
+        await run_in_worker(
+            cache.store, source, key, str(resp.url), resp.content,
+            resp.headers.get("ETag"), resp.headers.get("Last-Modified"),
+        )
+    return data
+
+
+async def gather_partial(calls: Dict[K, Awaitable[T]], timeout: float = ENRICHMENT_TIMEOUT) -> Dict[K, T]:
+    """
+    Run awaitables concurrently and return the results that finished in time.
+    
+    Calls still running after `timeout` are cancelled and calls that raised
+    are dropped, so the result may be partial.
+    """
+    tasks = {key: asyncio.ensure_future(call) for key, call in calls.items()}
+    if not tasks:
+        return {}
+
+    done, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+    if pending:
+        print(f"[HTTP] {len(pending)}/{len(tasks)} request(s) exceeded the {timeout:.0f}s budget; using partial results")
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    return {
+        key: task.result()
+        for key, task in tasks.items()
+        if task in done and not task.cancelled() and task.exception() is None
+    }
+
+
+async def close_http_client() -> None:
+    """Close the running loop's client (shutdown hook / end of a script run)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.pop(loop, None)
+    _host_limiters.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+def run_sync(call: Awaitable[T]) -> T:
+    """Run an async fetcher from synchronous code (scripts), closing its client afterwards."""
+    async def _main() -> T:
+        try:
+            return await call
+        finally:
+            await close_http_client()
+    return asyncio.run(_main())
+
+
+__all__ = [
+    "HTTP_MAX_PER_HOST",
+    "HTTP_TIMEOUT",
+    "ENRICHMENT_TIMEOUT",
+    "get_http_client",
+    "fetch_json",
+    "gather_partial",
+    "close_http_client",
+    "run_sync",
+]
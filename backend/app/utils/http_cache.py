@@ -0,0 +1,243 @@
+"""Disk-backed cache for upstream HTTP responses (Wikipedia, DuckDuckGo, arXiv).
+
+The same domain pages and search queries are requested for roadmap after
+roadmap. Responses are kept in one SQLite file (WAL mode, shared by every
+process on the host) so they survive restarts:
+
+- keys are normalized requests (sorted query parameters, collapsed
+  whitespace, per-source rules such as case-insensitive DDG queries)
+- each source has its own TTL; a fresh entry is served with no network call
+- stale entries keep their ETag / Last-Modified validators, so the next
+  fetch is a conditional request and a 304 just renews the entry
+- total body size is bounded (`HTTP_CACHE_MAX_BYTES`), least recently used
+  entries are evicted first
+- per-source hit / revalidation / miss counters feed `stats()`
+
+Set `HTTP_CACHE_PATH=""` to disable the cache. Methods are blocking; async
+callers run them through `app.utils.workers.run_in_worker`.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", "./http_cache.db")
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Seconds a response is served without revalidation, per source
+SOURCE_TTLS: Dict[str, float] = {
+    "wiki": float(os.getenv("HTTP_CACHE_TTL_WIKI", str(7 * 24 * 3600))),
+    "ddg": float(os.getenv("HTTP_CACHE_TTL_DDG", str(24 * 3600))),
+    "arxiv": float(os.getenv("HTTP_CACHE_TTL_ARXIV", str(12 * 3600))),
+}
+DEFAULT_TTL = 3600.0
+
+# Evict down to this fraction of the budget so every insert doesn't evict
+_EVICT_TARGET = 0.9
+OUTCOMES = ("hit", "revalidated", "miss", "stale")
+
+
+def _wiki_titles(value: str) -> str:
+    """MediaWiki titles: underscores are spaces and the first letter is case-insensitive."""
+    titles = []
+    for title in value.split("|"):
+        title = " ".join(title.replace("_", " ").split())
+        titles.append(title[:1].upper() + title[1:])
+    return "|".join(titles)
+
+
+# (source, parameter) -> extra normalization applied to the value
+PARAM_NORMALIZERS: Dict[tuple, Callable[[str], str]] = {
+    ("ddg", "q"): str.lower,
+    ("wiki", "titles"): _wiki_titles,
+}
+
+
+def normalize_key(source: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Canonical cache key for a GET request (URL and params may both carry the query)."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(key, value) for key, value in (params or {}).items() if value is not None]
+
+    normalized = []
+    for key, value in query:
+        if isinstance(value, bool):
+            value = int(value)
+        value = " ".join(str(value).split())
+        normalize = PARAM_NORMALIZERS.get((source, key))
+        normalized.append((key, normalize(value) if normalize else value))
+
+    base = f"{parts.scheme.lower()}://{parts.netloc.lower()}{parts.path or '/'}"
+    return f"{source} {base}?{urlencode(sorted(normalized))}"
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    fresh: bool
+
+
+class HTTPResponseCache:
+    """SQLite-backed response cache with per-source TTLs and LRU size bound."""
+
+    def __init__(self, path: str, max_bytes: int = HTTP_CACHE_MAX_BYTES, ttls: Optional[Dict[str, float]] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = dict(SOURCE_TTLS if ttls is None else ttls)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._connect().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS http_responses (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_http_responses_accessed ON http_responses (accessed_at);
+            """
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def ttl(self, source: str) -> float:
+        return self.ttls.get(source, DEFAULT_TTL)
+
+    def lookup(self, source: str, key: str) -> Optional[CachedResponse]:
+        """Return the cached response (fresh or stale) and mark it recently used."""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT body, etag, last_modified, stored_at FROM http_responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        conn.execute("UPDATE http_responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return CachedResponse(
+            body=bytes(row["body"]),
+            etag=row["etag"],
+            last_modified=row["last_modified"],
+            stored_at=row["stored_at"],
+            fresh=now - row["stored_at"] < self.ttl(source),
+        )
+
+    def store(self, source: str, key: str, url: str, body: bytes,
+              etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Insert or replace a response, then evict if over the size budget."""
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO http_responses "
+            "(key, source, url, body, etag, last_modified, size, stored_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, source, url, body, etag, last_modified, len(body), now, now),
+        )
+        self.evict()
+
+    def refresh(self, key: str) -> None:
+        """Renew an entry after the server confirmed it unchanged (304)."""
+        now = time.time()
+        self._connect().execute(
+            "UPDATE http_responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+        )
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the bodies fit the budget."""
+        conn = self._connect()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        target = int(self.max_bytes * _EVICT_TARGET)
+        evicted = 0
+        for row in conn.execute("SELECT key, size FROM http_responses ORDER BY accessed_at").fetchall():
+            if total <= target:
+                break
+            conn.execute("DELETE FROM http_responses WHERE key = ?", (row["key"],))
+            total -= row["size"]
+            evicted += 1
+        print(f"[HTTPCache] Evicted {evicted} response(s) to stay under {self.max_bytes} bytes")
+        return evicted
+
+    @staticmethod
+    def conditional_headers(cached: Optional[CachedResponse]) -> Dict[str, str]:
+        """Validators for revalidating a stale entry."""
+        headers: Dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    def record(self, source: str, outcome: str) -> None:
+        """Count a lookup outcome: hit, revalidated (304), miss or stale (served on upstream error)."""
+        with self._lock:
+            counts = self._counts.setdefault(source, dict.fromkeys(OUTCOMES, 0))
+            counts[outcome] += 1
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM http_responses")
+
+    def stats(self) -> Dict[str, Any]:
+        row = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_responses"
+        ).fetchone()
+        with self._lock:
+            sources = {source: dict(counts) for source, counts in self._counts.items()}
+        for counts in sources.values():
+            total = sum(counts.values())
+            # Served without downloading the body again
+            counts["hit_rate"] = round((counts["hit"] + counts["revalidated"]) / total, 3) if total else 0.0
+        lookups = sum(sum(c[o] for o in OUTCOMES) for c in sources.values())
+        served = sum(c["hit"] + c["revalidated"] for c in sources.values())
+        return {
+            "entries": row[0],
+            "bytes": row[1],
+            "max_bytes": self.max_bytes,
+            "ttls": self.ttls,
+            "sources": sources,
+            "hit_rate": round(served / lookups, 3) if lookups else 0.0,
+        }
+
+
+_cache: Optional[HTTPResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[HTTPResponseCache]:
+    """Return the process-wide response cache, or None when disabled."""
+    global _cache
+    if not HTTP_CACHE_PATH:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = HTTPResponseCache(HTTP_CACHE_PATH)
+    return _cache
+
+
+__all__ = [
+    "SOURCE_TTLS",
+    "normalize_key",
+    "CachedResponse",
+    "HTTPResponseCache",
+    "get_response_cache",
+]
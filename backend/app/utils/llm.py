@@ -1,3 +1,7 @@
+import asyncio
+import os
+import weakref
+
 import google.generativeai as genai
 from app.config import settings
 
@@ -5,7 +9,22 @@ from app.config import settings
 genai.configure(api_key=settings.GOOGLE_API_KEY)
 
 # Load the model once at module level
-model = genai.GenerativeModel("gemini-2.5-flash-lite")
+model = genai.GenerativeModel(settings.LLM_MODEL)
+
+# Upper bound on concurrent async LLM requests per event loop (shared limiter)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def get_llm_limiter() -> asyncio.Semaphore:
+    """Return the LLM concurrency limiter for the running event loop."""
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limiter = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        _limiters[loop] = limiter
+    return limiter
 
 
 def call_llm(prompt: str) -> str:
@@ -26,7 +45,29 @@ def call_llm(prompt: str) -> str:
         return f"Error: {str(e)}"
 
 
+async def acall_llm(prompt: str) -> str:
+    """
+    Async variant of `call_llm` that does not block the event loop.
+    
+    Requests are bounded by the shared LLM limiter so a burst of
+    concurrent streams cannot exceed the provider's rate limits.
+    
+    Args:
+        prompt (str): The question or instruction for the LLM.
+    
+    Returns:
+        str: The LLM-generated response text.
+    """
+    try:
+        async with get_llm_limiter():
+            response = await model.generate_content_async(prompt)
+        print("DEBUG: LLM response received", response.text)
+        return response.text.strip()
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
 if __name__ == "__main__":
     prompt = "Explain the theory of relativity in simple terms. Write one paragraph."
     result = call_llm(prompt)
-    print(result)
\ No newline at end of file
+    print(result)
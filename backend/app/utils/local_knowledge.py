@@ -0,0 +1,201 @@
+"""Offline knowledge store: a local, sentence-level substitute for Wikipedia.
+
+Live enrichment costs seconds per roadmap and fails when outbound network
+is restricted. With `WIKI_BACKEND=local` the wiki enrichment reads from one
+SQLite file instead, built ahead of time from an article dump subset or a
+curated corpus (`python -m app.scripts.build_knowledge_store`):
+
+- every article is split into sentences, stored in order in an FTS5 table
+  (porter-stemmed) together with the article title
+- a query resolves to an article by normalized exact title first, then by
+  the best BM25 match (title hits weighted above body hits)
+- the article's sentences go through the same keyword filters as live
+  Wikipedia extracts (`app.utils.wiki.build_wiki_contexts`)
+
+Lookups take milliseconds and need no network. Methods are blocking; async
+callers run them through `app.utils.workers.run_in_worker`.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.utils.wiki import build_wiki_contexts, split_sentences
+from app.utils.workers import run_in_worker
+
+LOCAL_KNOWLEDGE_PATH = os.getenv("LOCAL_KNOWLEDGE_PATH", "./knowledge.db")
+# Sentences of an article handed to the keyword filters (live extracts are intros)
+LOCAL_KNOWLEDGE_SENTENCES = int(os.getenv("LOCAL_KNOWLEDGE_SENTENCES", "40"))
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(title.replace("_", " ").lower().split())
+
+
+def _match_expression(query: str) -> Optional[str]:
+    """FTS5 query matching any of the query's terms (quoted, so no operators leak in)."""
+    terms = dict.fromkeys(_TOKEN.findall(query.lower()))
+    return " OR ".join(f'"{term}"' for term in terms) or None
+
+
+class LocalKnowledgeStore:
+    """Articles stored as ordered, full-text indexed sentences in one SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS articles (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    norm_title TEXT NOT NULL UNIQUE
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS sentences USING fts5(
+                    title,
+                    text,
+                    article_id UNINDEXED,
+                    position UNINDEXED,
+                    tokenize = 'porter unicode61'
+                );
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def add_articles(self, articles: Iterable[Tuple[str, str]]) -> int:
+        """Store (title, text) pairs, replacing articles with the same title; returns how many."""
+        conn = self._connect()
+        count = 0
+        conn.execute("BEGIN")
+        try:
+            for title, text in articles:
+                title = " ".join(title.replace("_", " ").split())
+                sentences = split_sentences(" ".join(text.split()))
+                if not title or not sentences:
+                    continue
+                row = conn.execute(
+                    "SELECT id FROM articles WHERE norm_title = ?", (normalize_title(title),)
+                ).fetchone()
+                if row:
+                    conn.execute("DELETE FROM sentences WHERE article_id = ?", (row[0],))
+                    conn.execute("DELETE FROM articles WHERE id = ?", (row[0],))
+                article_id = conn.execute(
+                    "INSERT INTO articles (title, norm_title) VALUES (?, ?)", (title, normalize_title(title))
+                ).lastrowid
+                conn.executemany(
+                    "INSERT INTO sentences (title, text, article_id, position) VALUES (?, ?, ?, ?)",
+                    [(title, sentence, article_id, i) for i, sentence in enumerate(sentences)],
+                )
+                count += 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return count
+
+    def optimize(self) -> None:
+        """Merge the FTS index segments (run once after a bulk build)."""
+        self._connect().execute("INSERT INTO sentences (sentences) VALUES ('optimize')")
+
+    def find_article(self, query: str) -> Optional[int]:
+        """Article id for a query: exact title, else the best full-text match."""
+        conn = self._connect()
+        row = conn.execute("SELECT id FROM articles WHERE norm_title = ?", (normalize_title(query),)).fetchone()
+        if row:
+            return row[0]
+        expression = _match_expression(query)
+        if not expression:
+            return None
+        row = conn.execute(
+            "SELECT article_id FROM sentences WHERE sentences MATCH ? "
+            "ORDER BY bm25(sentences, 10.0, 1.0) LIMIT 1",
+            (expression,),
+        ).fetchone()
+        return int(row[0]) if row else None
+
+    def article_sentences(self, article_id: int, limit: int = LOCAL_KNOWLEDGE_SENTENCES) -> List[str]:
+        rows = self._connect().execute(
+            "SELECT text FROM sentences WHERE article_id = ? ORDER BY CAST(position AS INTEGER) LIMIT ?",
+            (article_id, limit),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def search_sentences(self, query: str, limit: int = 10) -> List[str]:
+        """Best-matching sentences across all articles."""
+        expression = _match_expression(query)
+        if not expression:
+            return []
+        rows = self._connect().execute(
+            "SELECT text FROM sentences WHERE sentences MATCH ? ORDER BY bm25(sentences, 10.0, 1.0) LIMIT ?",
+            (expression, limit),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def lookup(self, queries: List[str]) -> Dict[str, List[str]]:
+        """Sentences of the article each query resolves to (unresolved queries are left out)."""
+        pages: Dict[str, List[str]] = {}
+        for query in dict.fromkeys(q for q in queries if q and q.strip()):
+            article_id = self.find_article(query)
+            if article_id is not None:
+                pages[query] = self.article_sentences(article_id)
+        return pages
+
+    def stats(self) -> Dict[str, int]:
+        conn = self._connect()
+        return {
+            "articles": conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0],
+            "sentences": conn.execute("SELECT COUNT(*) FROM sentences").fetchone()[0],
+        }
+
+
+_store: Optional[LocalKnowledgeStore] = None
+_store_lock = threading.Lock()
+
+
+def get_local_store() -> Optional[LocalKnowledgeStore]:
+    """The store at LOCAL_KNOWLEDGE_PATH, or None when it has not been built."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if not os.path.exists(LOCAL_KNOWLEDGE_PATH):
+                    print(f"[LocalKnowledge] no store at {LOCAL_KNOWLEDGE_PATH}; build one with app.scripts.build_knowledge_store")
+                    return None
+                _store = LocalKnowledgeStore(LOCAL_KNOWLEDGE_PATH)
+    return _store
+
+
+async def agather_local_supporting_text(
+    problem_statement: Optional[str],
+    domain: Optional[str],
+    goals: Optional[List[str]],
+    prerequisites: Optional[List[str]],
+    key_topics: Optional[List[str]],
+    max_topic_pages: int = 5,
+    **_,
+) -> Dict[str, List[str]]:
+    """Offline counterpart of `agather_wiki_supporting_text` (same arguments and result)."""
+    topics = (key_topics or [])[:max_topic_pages]
+    store = get_local_store()
+    pages = await run_in_worker(store.lookup, ([domain] if domain else []) + topics) if store else {}
+    return build_wiki_contexts(pages, problem_statement, domain, goals, prerequisites, topics)
+
+
+__all__ = [
+    "LocalKnowledgeStore",
+    "normalize_title",
+    "get_local_store",
+    "agather_local_supporting_text",
+]
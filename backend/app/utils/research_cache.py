@@ -0,0 +1,204 @@
+"""Research enrichment cache shared by every project in the process.
+
+Many projects land in the same domains (FinTech, Healthcare, EdTech) with
+overlapping key topics, so the Wikipedia/DuckDuckGo contexts gathered for
+one project are reused for the next one instead of being fetched again.
+Contexts are cached per source in two kinds of entries:
+
+- context: one of the domain, problem, goals and prerequisites contexts,
+  keyed by the normalized project fields it is derived from
+  (`CONTEXT_INPUTS`): on Wikipedia all four come from the domain article,
+  on DuckDuckGo the problem and prerequisites contexts also depend on the
+  problem statement and the prerequisites
+- topic: the key-topic snippets of one topic within a domain
+
+A project whose contexts and topics were all seen before is served
+without any HTTP call; otherwise only the fields behind the missing
+contexts and the missing topics are fetched. Both kinds of entries expire
+after `RESEARCH_CACHE_TTL` and the least recently used are evicted beyond
+`RESEARCH_CACHE_SIZE`.
+
+The gather functions fall back to the project's own fields when a context
+comes back empty; those fallbacks are never stored (they would leak one
+project's text into another) and are applied again for each caller.
+"""
+
+import os
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.utils.cache import TTLCache
+from app.utils.enrichment import CONTEXT_KEYS
+
+RESEARCH_CACHE_TTL = float(os.getenv("RESEARCH_CACHE_TTL", "86400"))
+# Entries (core + topic) across sources; 0 disables the cache
+RESEARCH_CACHE_SIZE = int(os.getenv("RESEARCH_CACHE_SIZE", "2048"))
+
+CORE_KEYS = [key for key in CONTEXT_KEYS if key != "key_topics_context"]
+CORE_FIELDS = ["problem_statement", "domain", "goals", "prerequisites"]
+
+# Project fields each context is derived from, per source (fallbacks aside)
+CONTEXT_INPUTS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "wiki": {key: ("domain",) for key in CORE_KEYS},
+    "ddg": {
+        "domain_context": ("domain",),
+        "problem_context": ("domain", "problem_statement"),
+        "goals_context": ("goals",),
+        "prerequisites_context": ("domain", "prerequisites"),
+    },
+}
+
+# agather_wiki_supporting_text / agather_ddg_supporting_text
+GatherFn = Callable[..., Awaitable[Dict[str, List[str]]]]
+
+_cache = TTLCache(maxsize=RESEARCH_CACHE_SIZE, ttl=RESEARCH_CACHE_TTL)
+_lookups = {"hit": 0, "partial": 0, "miss": 0}
+
+
+def _norm(value: Optional[str]) -> str:
+    return " ".join((value or "").lower().split())
+
+
+def _inputs(source: str, key: str) -> Tuple[str, ...]:
+    # Unknown sources: assume every context depends on every field
+    return CONTEXT_INPUTS.get(source, {}).get(key, tuple(CORE_FIELDS))
+
+
+def _norm_field(value) -> object:
+    if isinstance(value, list):
+        return tuple(sorted({_norm(v) for v in value if _norm(v)}))
+    return _norm(value)
+
+
+def _context_key(source: str, key: str, fields: Dict[str, object]) -> Tuple:
+    return ("context", source, key, tuple(_norm_field(fields.get(name)) for name in _inputs(source, key)))
+
+
+def _topic_key(source: str, domain: Optional[str], topic: str) -> Tuple:
+    return ("topic", source, _norm(domain), _norm(topic))
+
+
+def _unique_topics(key_topics: Optional[List[str]], max_topics: int) -> List[str]:
+    topics: Dict[str, str] = {}
+    for topic in (key_topics or [])[:max_topics]:
+        if _norm(topic):
+            topics.setdefault(_norm(topic), topic)
+    return list(topics.values())
+
+
+def _split_topics(snippets: List[str], topics: List[str]) -> Dict[str, List[str]]:
+    """Group `[topic] text` snippets by topic (untagged snippets are dropped)."""
+    grouped: Dict[str, List[str]] = {topic: [] for topic in topics}
+    for snippet in snippets:
+        for topic in topics:
+            if snippet.startswith(f"[{topic}] "):
+                grouped[topic].append(snippet)
+                break
+    return grouped
+
+
+def _without_fallbacks(contexts: Dict[str, List[str]], own: set) -> Dict[str, List[str]]:
+    return {key: [s for s in contexts.get(key) or [] if s not in own] for key in CORE_KEYS}
+
+
+def _apply_fallbacks(
+    source: str,
+    results: Dict[str, List[str]],
+    problem_statement: Optional[str],
+    goals: Optional[List[str]],
+    prerequisites: Optional[List[str]],
+    key_topics: Optional[List[str]],
+) -> Dict[str, List[str]]:
+    # Same fallbacks as the gather functions (only DDG falls back to the topics)
+    if problem_statement and not results["problem_context"]:
+        results["problem_context"] = [problem_statement]
+    if goals and not results["goals_context"]:
+        results["goals_context"] = goals[:8]
+    if prerequisites and not results["prerequisites_context"]:
+        results["prerequisites_context"] = prerequisites[:8]
+    if source == "ddg" and key_topics and not results["key_topics_context"]:
+        results["key_topics_context"] = key_topics[:8]
+    return results
+
+
+async def agather_cached(
+    source: str,
+    gather: GatherFn,
+    problem_statement: Optional[str],
+    domain: Optional[str],
+    goals: Optional[List[str]],
+    prerequisites: Optional[List[str]],
+    key_topics: Optional[List[str]],
+    max_topics: int = 5,
+    **kwargs,
+) -> Dict[str, List[str]]:
+    """
+    `gather(...)` for one source, served from the cache where possible.
+
+    Args:
+        source: "wiki" or "ddg" (entries are kept per source)
+        gather: The source's gather function, called for whatever is missing
+        problem_statement, domain, goals, prerequisites, key_topics: Project fields
+        max_topics: Topics looked up (the gather functions' own limit)
+        **kwargs: Passed on to `gather` (e.g. `timeout`)
+
+    Returns:
+        Contexts in the shape `gather` returns
+    """
+    topics = _unique_topics(key_topics, max_topics)
+    fields = {"problem_statement": problem_statement, "domain": domain, "goals": goals, "prerequisites": prerequisites}
+    core: Dict[str, Optional[List[str]]] = {}
+    for key in CORE_KEYS:
+        # Nothing to look up without any of its fields
+        has_inputs = any(_norm_field(fields[name]) for name in _inputs(source, key))
+        core[key] = _cache.get(_context_key(source, key, fields)) if has_inputs else []
+    missing_core = [key for key, cached in core.items() if cached is None]
+    topic_snippets = {topic: _cache.get(_topic_key(source, domain, topic)) for topic in topics}
+    missing = [topic for topic, cached in topic_snippets.items() if cached is None]
+
+    if not missing_core and not missing:
+        _lookups["hit"] += 1
+        print(f"[ResearchCache] {source}: hit ({len(topics)} topic(s))")
+    else:
+        partial = len(missing_core) < len(CORE_KEYS) or len(missing) < len(topics)
+        _lookups["partial" if partial else "miss"] += 1
+        print(
+            f"[ResearchCache] {source}: fetching {len(missing_core)}/{len(CORE_KEYS)} context(s), "
+            f"{len(missing)}/{len(topics)} topic(s)"
+        )
+        # Only the fields behind the missing contexts are sent
+        needed = {name for key in missing_core for name in _inputs(source, key)}
+        fetched = await gather(
+            **{name: value if name in needed else None for name, value in fields.items()},
+            key_topics=missing,
+            **kwargs,
+        ) or {}
+
+        if missing_core:
+            own = {problem_statement, *(goals or []), *(prerequisites or [])}
+            contexts = _without_fallbacks(fetched, own)
+            # All of them empty is usually a timed-out fetch; try again next time
+            keep = any(contexts[key] for key in missing_core)
+            for key in missing_core:
+                core[key] = contexts[key]
+                if keep:
+                    _cache.set(_context_key(source, key, fields), contexts[key])
+        for topic, snippets in _split_topics(fetched.get("key_topics_context") or [], missing).items():
+            topic_snippets[topic] = snippets
+            if snippets:
+                _cache.set(_topic_key(source, domain, topic), snippets)
+
+    results = {key: list(core.get(key) or []) for key in CORE_KEYS}
+    results["key_topics_context"] = [s for topic in topics for s in topic_snippets.get(topic) or []]
+    return _apply_fallbacks(source, results, problem_statement, goals, prerequisites, key_topics)
+
+
+def research_cache_stats() -> Dict[str, object]:
+    """Entry counts and hit rates (hit: no fetch, partial: some topics fetched)."""
+    return {**_cache.stats(), "lookups": dict(_lookups)}
+
+
+def clear_research_cache() -> None:
+    _cache.clear()
+
+
+__all__ = ["agather_cached", "research_cache_stats", "clear_research_cache"]
@@ -1,7 +1,10 @@
 """Utilities for Server-Sent Events (SSE) streaming."""
 
 import json
-from typing import Any, Dict
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, Optional, Tuple
+
+from langgraph.config import get_stream_writer
 
 
 def format_sse(data: Dict[str, Any], event: str = "message") -> str:
@@ -19,13 +22,14 @@ def format_sse(data: Dict[str, Any], event: str = "message") -> str:
     return msg
 
 
-def format_status(message: str, progress: int = None, stage: str = None) -> str:
+def format_status(message: str, progress: int = None, stage: str = None, extra: Dict[str, Any] = None) -> str:
     """Format a status update as SSE.
     
     Args:
         message: Status message to display
         progress: Optional progress percentage (0-100)
         stage: Optional stage identifier
+        extra: Optional additional fields (timings, partial results)
     
     Returns:
         Formatted SSE status event
@@ -35,6 +39,8 @@ def format_status(message: str, progress: int = None, stage: str = None) -> str:
         data["progress"] = progress
     if stage is not None:
         data["stage"] = stage
+    if extra:
+        data.update(extra)
     return format_sse(data, event="status")
 
 
@@ -60,3 +66,140 @@ def format_complete(result: Dict[str, Any]) -> str:
         Formatted SSE complete event
     """
     return format_sse(result, event="complete")
+
+
+def format_ndjson(data: Dict[str, Any]) -> str:
+    """Format one record as a newline-delimited JSON line.
+    
+    Args:
+        data: Dictionary to send as JSON
+    
+    Returns:
+        JSON text terminated by a newline
+    """
+    return json.dumps(data) + "\n"
+
+
+def parse_sse(message: str) -> Tuple[str, Any]:
+    """Parse one SSE message produced by `format_sse` back into (event, data).
+
+    Args:
+        message: SSE string ("event: ...\\ndata: ...\\n\\n")
+
+    Returns:
+        Tuple of event type (default "message") and decoded JSON data
+        (raw text if the data is not JSON)
+    """
+    event = "message"
+    data_lines = []
+    for line in message.strip().splitlines():
+        if line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+    raw = "\n".join(data_lines)
+    try:
+        return event, json.loads(raw)
+    except ValueError:
+        return event, raw
+
+
+def emit_event(event: str, data: Dict[str, Any]) -> None:
+    """Send an extra SSE event from inside a graph node run by `GraphProgressStream`.
+
+    Does nothing when called outside a streamed graph run.
+
+    Args:
+        event: SSE event type (e.g. "section")
+        data: JSON-serializable payload
+    """
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return
+    writer({"event": event, "data": data})
+
+
+# Node name -> (status message shown when the node starts, progress % when it finishes)
+StageMap = Dict[str, Tuple[str, int]]
+
+# (node name, node update) -> JSON-serializable partial state for the client
+PartialFn = Callable[[str, Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+class GraphProgressStream:
+    """Run a compiled LangGraph in streaming mode and emit real progress as SSE.
+
+    Every node start and finish becomes a `status` event carrying the
+    elapsed wall-clock time; finish events also carry the node duration and
+    whatever partial state `partial` extracts from the node's update (e.g. the
+    ML score as soon as `ml_prediction` lands). Events a node sends with
+    `emit_event` are forwarded as they happen. After iteration completes,
+    `final_state` holds the graph's final values.
+
+    Usage:
+        stream = GraphProgressStream(graph, initial_state, stages, partial)
+        async for event in stream:
+            yield event
+        result = MyState(**stream.final_state)
+    """
+
+    def __init__(
+        self,
+        graph,
+        initial_state: Any,
+        stages: Optional[StageMap] = None,
+        partial: Optional[PartialFn] = None,
+    ):
+        self.graph = graph
+        self.initial_state = initial_state
+        self.stages = stages or {}
+        self.partial = partial
+        self.final_state: Optional[Dict[str, Any]] = None
+        self.node_timings: Dict[str, float] = {}
+
+    async def __aiter__(self) -> AsyncGenerator[str, None]:
+        started = time.perf_counter()
+        node_started: Dict[str, float] = {}
+        progress = 0
+
+        async for mode, chunk in self.graph.astream(self.initial_state, stream_mode=["tasks", "values", "custom"]):
+            if mode == "values":
+                self.final_state = chunk
+                continue
+            if mode == "custom":
+                if isinstance(chunk, dict) and "event" in chunk:
+                    data = dict(chunk.get("data") or {})
+                    data.setdefault("elapsed", round(time.perf_counter() - started, 3))
+                    yield format_sse(data, event=chunk["event"])
+                continue
+
+            name = chunk.get("name")
+            if name not in self.stages:
+                continue
+            message, done_progress = self.stages[name]
+            elapsed = round(time.perf_counter() - started, 3)
+
+            if "result" not in chunk and "error" not in chunk:
+                # Task start
+                node_started[chunk.get("id") or name] = time.perf_counter()
+                print(f"[Stream] >> {name} (t+{elapsed:.2f}s)")
+                yield format_status(message, progress=progress, stage=name, extra={"event": "start", "elapsed": elapsed})
+                continue
+
+            # Task finish
+            t0 = node_started.pop(chunk.get("id") or name, None)
+            duration = round(time.perf_counter() - t0, 3) if t0 is not None else None
+            if duration is not None:
+                self.node_timings[name] = duration
+                print(f"[Stream] << {name} ({duration:.2f}s)")
+            progress = max(progress, done_progress)
+            extra: Dict[str, Any] = {"event": "finish", "elapsed": elapsed, "duration": duration}
+            if chunk.get("error"):
+                extra["error"] = str(chunk["error"])
+            elif self.partial:
+                update = chunk.get("result") or {}
+                partial_state = self.partial(name, update if isinstance(update, dict) else {})
+                if partial_state:
+                    extra["partial"] = partial_state
+            yield format_status(f"{message.rstrip('.')} - done", progress=progress, stage=f"{name}_complete", extra=extra)
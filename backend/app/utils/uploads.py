@@ -0,0 +1,202 @@
+"""Document uploads without temp-file round trips.
+
+- `UploadLimitMiddleware` counts request body bytes as they arrive and
+  answers 413 as soon as a multipart upload exceeds `MAX_UPLOAD_BYTES`
+  (immediately when Content-Length already says so)
+- `receive_document` takes over the spooled buffer the multipart parser
+  already filled (memory up to 1 MB, then an anonymous temporary file),
+  sniffs the type from its magic bytes and hashes it in chunks: no extra
+  copy of the content and no NamedTemporaryFile
+- the pipelines get `UploadedDocument.ref` ("upload://<id>") as their
+  file path; `app.utils.extract_pool` reads the bytes from the buffer and
+  the parsers open them from memory
+- `close()` (or the context manager) releases the buffer; callers close
+  it in a `finally` once the pipeline is done
+"""
+
+import hashlib
+import os
+import shutil
+import uuid
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+
+from app.utils.workers import run_in_worker
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+
+UPLOAD_REF_PREFIX = "upload://"
+CHUNK_SIZE = 256 * 1024
+# Enough of the head to find a DOCX part name in the first ZIP entries
+SNIFF_BYTES = 4096
+
+_open_uploads: Dict[str, "UploadedDocument"] = {}
+
+
+def sniff_document_type(head: bytes, filename: Optional[str] = None) -> Optional[str]:
+    """'pdf' or 'docx' from the leading bytes (a ZIP must look like a Word document)."""
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        # DOCX is a ZIP; other ZIPs (xlsx, plain archives) lack the word/ parts
+        if b"word/" in head or (filename or "").lower().endswith(".docx"):
+            return "docx"
+    return None
+
+
+class UploadedDocument:
+    """An uploaded document held in its spooled buffer until closed."""
+
+    def __init__(self, buffer, kind: str, filename: Optional[str], size: int, sha256: str):
+        self.buffer = buffer
+        self.kind = kind
+        self.filename = filename
+        self.size = size
+        self.sha256 = sha256
+        self.ref = f"{UPLOAD_REF_PREFIX}{uuid.uuid4().hex}.{kind}"
+        _open_uploads[self.ref] = self
+
+    def read(self) -> bytes:
+        self.buffer.seek(0)
+        return self.buffer.read()
+
+    def save(self, path: str) -> None:
+        """Copy the buffer to `path` in chunks (blocking; run it in a worker)."""
+        self.buffer.seek(0)
+        with open(path, "wb") as f:
+            shutil.copyfileobj(self.buffer, f, CHUNK_SIZE)
+
+    def close(self) -> None:
+        _open_uploads.pop(self.ref, None)
+        self.buffer.close()
+
+    def __enter__(self) -> "UploadedDocument":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def is_upload_ref(path: Optional[str]) -> bool:
+    return bool(path) and path.startswith(UPLOAD_REF_PREFIX)
+
+
+def resolve_upload(ref: str) -> Optional[UploadedDocument]:
+    """The open upload behind an `upload://` reference."""
+    return _open_uploads.get(ref)
+
+
+def _inspect(buffer, filename: Optional[str], kinds: tuple) -> Tuple[Optional[str], int, str]:
+    """(kind, size, sha256) of a buffer; stops after the head when the kind is not accepted."""
+    buffer.seek(0)
+    head = buffer.read(SNIFF_BYTES)
+    kind = sniff_document_type(head, filename)
+    if kind not in kinds:
+        return None, 0, ""
+    # Hash and measure in chunks, so the content is never copied into one bytes object
+    digest = hashlib.sha256(head)
+    size = len(head)
+    while chunk := buffer.read(CHUNK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+    buffer.seek(0)
+    return kind, size, digest.hexdigest()
+
+
+async def receive_document(file: UploadFile, kinds: Iterable[str] = ("pdf", "docx")) -> UploadedDocument:
+    """
+    Take ownership of an uploaded PDF/DOCX.
+
+    Raises HTTPException 413 above MAX_UPLOAD_BYTES and 415 when the magic
+    bytes are not one of `kinds`; nothing beyond the head is read then.
+    """
+    buffer = file.file
+    kind, size, sha256 = await run_in_worker(_inspect, buffer, file.filename, tuple(kinds))
+    if kind is None:
+        raise HTTPException(status_code=415, detail="Unsupported file type. Please upload PDF or DOCX files only.")
+    if size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"File exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+
+    # FastAPI closes the UploadFile after the request; the buffer is ours now
+    file.file = _ClosedPlaceholder()
+    return UploadedDocument(buffer, kind, file.filename, size, sha256)
+
+
+class _ClosedPlaceholder:
+    def close(self) -> None:
+        pass
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UploadLimitMiddleware:
+    """ASGI middleware rejecting multipart bodies larger than `max_bytes` while they stream in."""
+
+    def __init__(self, app, max_bytes: int = MAX_UPLOAD_BYTES):
+        self.app = app
+        # Multipart boundaries and form fields come on top of the file itself
+        self.max_bytes = max_bytes + 64 * 1024
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = dict(scope.get("headers") or [])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            return await self.app(scope, receive, send)
+
+        length = headers.get(b"content-length")
+        if length and length.isdigit() and int(length) > self.max_bytes:
+            return await self._reject(send)
+
+        received = 0
+        exceeded = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise UploadTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal rejected
+            # The body parser turns our exception into its own error response; send 413 instead
+            if exceeded:
+                if not rejected and message["type"] == "http.response.start":
+                    rejected = True
+                    await self._reject(send)
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLarge:
+            if not rejected:
+                await self._reject(send)
+
+    async def _reject(self, send) -> None:
+        body = f'{{"detail":"File exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"}}'.encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+__all__ = [
+    "MAX_UPLOAD_BYTES",
+    "UploadedDocument",
+    "UploadLimitMiddleware",
+    "sniff_document_type",
+    "receive_document",
+    "is_upload_ref",
+    "resolve_upload",
+]
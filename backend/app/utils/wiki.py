@@ -1,59 +1,140 @@
-import requests
+import asyncio
+import os
 import re
 from typing import List, Dict, Optional
 
+from app.utils.http import fetch_json, gather_partial, run_sync, ENRICHMENT_TIMEOUT
+
 API_URL = "https://en.wikipedia.org/w/api.php"
 HEADERS = {
-	"User-Agent": "InnoScope/1.0 (contact: you@example.com) Python-requests",
 	"Accept-Language": "en",
 }
 
-def _fetch_plain_page(title: str) -> Optional[str]:
-	"""Return full plain text extract for a title or None."""
-	params = {
+# Server-side extract caps: only the first few sentences of a page are used,
+# so there is no point downloading whole articles.
+WIKI_INTRO_ONLY = os.getenv("WIKI_INTRO_ONLY", "true").lower() == "true"
+WIKI_EXTRACT_SENTENCES = int(os.getenv("WIKI_EXTRACT_SENTENCES", "10"))  # API max 10, 0 = no cap
+WIKI_EXTRACT_CHARS = int(os.getenv("WIKI_EXTRACT_CHARS", "0"))  # API max 1200, overrides sentences
+# TextExtracts returns at most 20 extracts per query, and only for intros
+WIKI_TITLES_PER_REQUEST = 20 if WIKI_INTRO_ONLY else 1
+
+
+def _extract_params() -> Dict[str, object]:
+	params: Dict[str, object] = {
 		"action": "query",
 		"prop": "extracts",
-		"explaintext": True,
-		"titles": title,
-		"format": "json",
+		"explaintext": 1,
 		"redirects": 1,
+		"format": "json",
+		"formatversion": 2,
+		"exlimit": "max",
+	}
+	if WIKI_INTRO_ONLY:
+		params["exintro"] = 1
+	if WIKI_EXTRACT_CHARS:
+		params["exchars"] = WIKI_EXTRACT_CHARS
+	elif WIKI_EXTRACT_SENTENCES:
+		params["exsentences"] = WIKI_EXTRACT_SENTENCES
+	return params
+
+
+async def _fetch_extract_batch(titles: List[str]) -> Dict[str, str]:
+	"""One `titles=A|B|C` query; maps each requested title to its extract."""
+	params = {**_extract_params(), "titles": "|".join(titles)}
+	# 403 gets one polite retry
+	data = await fetch_json(API_URL, params=params, headers=HEADERS, retry_statuses=(403,), source="wiki")
+	query = (data or {}).get("query") or {}
+	# Follow the API's title normalization and redirects back to what was asked for
+	normalized = {n["from"]: n["to"] for n in query.get("normalized", [])}
+	redirects = {r["from"]: r["to"] for r in query.get("redirects", [])}
+	extracts = {
+		page["title"]: page.get("extract") or ""
+		for page in query.get("pages", [])
+		if not page.get("missing") and not page.get("invalid")
+	}
+	found: Dict[str, str] = {}
+	for title in titles:
+		canonical = normalized.get(title, title)
+		canonical = redirects.get(canonical, canonical)
+		if canonical in extracts:
+			found[title] = extracts[canonical]
+	return found
+
+
+async def fetch_extracts(titles: List[str]) -> Dict[str, str]:
+	"""Fetch capped plain-text extracts for several titles in as few requests as possible.
+
+	Titles without a page (or whose batch failed or timed out) are left out.
+	"""
+	unique = list(dict.fromkeys(t for t in titles if t and t.strip()))
+	if not unique:
+		return {}
+	batches = [unique[i:i + WIKI_TITLES_PER_REQUEST] for i in range(0, len(unique), WIKI_TITLES_PER_REQUEST)]
+	found: Dict[str, str] = {}
+	for batch in await asyncio.gather(*(_fetch_extract_batch(b) for b in batches)):
+		found.update(batch)
+	return found
+
+
+async def _search_title(query: str) -> Optional[str]:
+	"""Best-matching article title for a free-text query, or None."""
+	params = {
+		"action": "query",
+		"list": "search",
+		"srsearch": query,
+		"srlimit": 1,
+		"srprop": "",
+		"srinfo": "",
+		"format": "json",
+		"formatversion": 2,
 	}
-	resp = requests.get(API_URL, params=params, headers=HEADERS, timeout=25)
-	if resp.status_code == 403:
-		# polite retry
-		resp = requests.get(API_URL, params=params, headers=HEADERS, timeout=25)
-	try:
-		resp.raise_for_status()
-	except Exception:
-		return None
-	data = resp.json()
-	pages = data.get("query", {}).get("pages", {})
-	if not pages:
-		return None
-	page = next(iter(pages.values()))
-	if "missing" in page:
-		return None
-	return page.get("extract") or ""
-
-def _split_sentences(text: str) -> List[str]:
+	data = await fetch_json(API_URL, params=params, headers=HEADERS, retry_statuses=(403,), source="wiki")
+	hits = ((data or {}).get("query") or {}).get("search") or []
+	return hits[0]["title"] if hits else None
+
+
+async def resolve_titles(queries: List[str]) -> Dict[str, str]:
+	"""Map free-text topics to canonical article titles via (concurrent) search."""
+	unique = list(dict.fromkeys(q for q in queries if q and q.strip()))
+	titles = await asyncio.gather(*(_search_title(q) for q in unique))
+	return {q: t for q, t in zip(unique, titles) if t}
+
+
+async def fetch_topic_extracts(queries: List[str], timeout: float = ENRICHMENT_TIMEOUT) -> Dict[str, str]:
+	"""Extracts for topic strings: exact titles in one batch, search only for the misses.
+
+	Whatever has arrived when `timeout` runs out is returned.
+	"""
+	loop = asyncio.get_running_loop()
+	deadline = loop.time() + timeout
+	found = (await gather_partial({"exact": fetch_extracts(queries)}, timeout=timeout)).get("exact", {})
+
+	missing = [q for q in dict.fromkeys(queries) if q and q.strip() and q not in found]
+	if missing and deadline > loop.time():
+		async def _searched() -> Dict[str, str]:
+			resolved = await resolve_titles(missing)
+			extracts = await fetch_extracts(list(resolved.values()))
+			return {q: extracts[t] for q, t in resolved.items() if t in extracts}
+		found.update((await gather_partial({"search": _searched()}, timeout=deadline - loop.time())).get("search", {}))
+	return found
+
+
+def split_sentences(text: str) -> List[str]:
 	return [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
 
-def gather_wiki_supporting_text(
+
+def build_wiki_contexts(
+	pages: Dict[str, List[str]],
 	problem_statement: Optional[str],
 	domain: Optional[str],
 	goals: Optional[List[str]],
 	prerequisites: Optional[List[str]],
-	key_topics: Optional[List[str]],
-	max_topic_pages: int = 5,
+	topics: List[str],
 ) -> Dict[str, List[str]]:
-	"""Given existing research fields, fetch Wikipedia context snippets.
+	"""Select supporting sentences from article sentences keyed by the query that found them.
 
-	Returns dict with lists of sentences supporting each field:
-	  - domain_context
-	  - problem_context
-	  - goals_context
-	  - prerequisites_context
-	  - key_topics_context (topic -> sentences)
+	Shared by the live Wikipedia client and the local knowledge store, so
+	both apply the same keyword filters and fallbacks.
 	"""
 	results: Dict[str, List[str]] = {
 		"domain_context": [],
@@ -63,10 +144,9 @@ def gather_wiki_supporting_text(
 		"key_topics_context": [],
 	}
 
-	# Fetch domain page if domain exists
-	domain_text = _fetch_plain_page(domain) if domain else None
-	if domain_text:
-		sentences = _split_sentences(domain_text)
+	# Domain page if domain exists
+	sentences = pages.get(domain) if domain else None
+	if sentences:
 		# Domain context: first 5 sentences
 		results["domain_context"] = sentences[:5]
 		# Problem context: sentences containing challenge keywords
@@ -79,14 +159,13 @@ def gather_wiki_supporting_text(
 		prereq_kw = re.compile(r"\b(require(?:s|d)?|prerequisite|need(?:ed|s)?|necessitate|depend(s|ed)?\b)", re.IGNORECASE)
 		results["prerequisites_context"] = [s for s in sentences if prereq_kw.search(s)][:8]
 
-	# Key topics pages - fetch limited number
+	# Key topics pages - limited number, assembled in topic order
 	topic_snippets: List[str] = []
-	if key_topics:
-		for topic in key_topics[:max_topic_pages]:
-			page_text = _fetch_plain_page(topic)
-			if not page_text:
+	if topics:
+		for topic in topics:
+			t_sentences = pages.get(topic)
+			if not t_sentences:
 				continue
-			t_sentences = _split_sentences(page_text)
 			# Collect first 3 sentences + any with improvement verbs
 			improvement = re.compile(r"\b(improve|enhance|increase|reduce|streamline|optimi[sz]e|enable)\b", re.IGNORECASE)
 			chosen = t_sentences[:3] + [s for s in t_sentences if improvement.search(s)][:2]
@@ -109,6 +188,49 @@ def gather_wiki_supporting_text(
 
 	return results
 
+
+async def agather_wiki_supporting_text(
+	problem_statement: Optional[str],
+	domain: Optional[str],
+	goals: Optional[List[str]],
+	prerequisites: Optional[List[str]],
+	key_topics: Optional[List[str]],
+	max_topic_pages: int = 5,
+	timeout: float = ENRICHMENT_TIMEOUT,
+) -> Dict[str, List[str]]:
+	"""Given existing research fields, fetch Wikipedia context snippets.
+
+	The domain page and all topic pages are fetched together as capped
+	intro extracts (`titles=A|B|C`), falling back to search for topics that
+	are not article titles; whatever is not back within `timeout` is skipped.
+
+	Returns dict with lists of sentences supporting each field:
+	  - domain_context
+	  - problem_context
+	  - goals_context
+	  - prerequisites_context
+	  - key_topics_context (topic -> sentences)
+	"""
+	topics = (key_topics or [])[:max_topic_pages]
+	titles = ([domain] if domain else []) + topics
+	pages = await fetch_topic_extracts(titles, timeout=timeout)
+	sentences = {query: split_sentences(text) for query, text in pages.items() if text}
+	return build_wiki_contexts(sentences, problem_statement, domain, goals, prerequisites, topics)
+
+
+def gather_wiki_supporting_text(
+	problem_statement: Optional[str],
+	domain: Optional[str],
+	goals: Optional[List[str]],
+	prerequisites: Optional[List[str]],
+	key_topics: Optional[List[str]],
+	max_topic_pages: int = 5,
+) -> Dict[str, List[str]]:
+	"""Synchronous entry point for scripts; see `agather_wiki_supporting_text`."""
+	return run_sync(agather_wiki_supporting_text(
+		problem_statement, domain, goals, prerequisites, key_topics, max_topic_pages
+	))
+
 # if __name__ == "__main__":
 # 	# Simple manual test
 # 	sample = gather_wiki_supporting_text(
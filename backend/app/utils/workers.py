@@ -0,0 +1,29 @@
+"""Shared worker pool for blocking work called from async pipelines.
+
+CPU-bound steps (ML prediction, document parsing) and libraries that only
+offer blocking I/O are pushed here so the event loop stays free to serve
+other SSE streams.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+WORKER_POOL_SIZE = int(os.getenv("WORKER_POOL_SIZE", str(min(32, (os.cpu_count() or 1) + 4))))
+
+_executor = ThreadPoolExecutor(max_workers=WORKER_POOL_SIZE, thread_name_prefix="pipeline-worker")
+
+
+async def run_in_worker(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable in the shared worker pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
+
+def get_worker_pool() -> ThreadPoolExecutor:
+    """Expose the shared executor (e.g. for shutdown hooks)."""
+    return _executor